@@ -0,0 +1,73 @@
+#!/bin/bash
+
+# Commit and push one text extraction checkpoint.
+# Usage: checkpoint_commit.sh <state>
+#
+# Run by text_extraction/main.py (--checkpoint-command) between bills, from the
+# data repo root, while extraction is paused. Only the paths listed in
+# $CHECKPOINT_PATHS_FILE are staged, so nothing half-written is committed.
+# A non-zero exit leaves those paths pending for the next checkpoint.
+
+STATE="$1"
+
+if [ -z "$CHECKPOINT_PATHS_FILE" ] || [ ! -s "$CHECKPOINT_PATHS_FILE" ]; then
+  echo "No checkpoint paths to commit"
+  exit 0
+fi
+
+# Resolve merge conflicts the same way as the final commit step:
+# scraper's metadata.json with our _processing, our files/ and .windycivi/
+resolve_conflicts() {
+  CONFLICTED_FILES=$(git diff --name-only --diff-filter=U | grep metadata.json || true)
+  for file in $CONFLICTED_FILES; do
+    echo "  Resolving conflict in: $file"
+    OUR_PROCESSING=$(git show :2:"$file" | jq -c '.metadata._processing // empty' 2>/dev/null || echo "")
+    git checkout --theirs "$file" || return 1
+    if [ -n "$OUR_PROCESSING" ] && [ "$OUR_PROCESSING" != "null" ] && [ "$OUR_PROCESSING" != "empty" ]; then
+      jq --argjson proc "$OUR_PROCESSING" '.metadata._processing = $proc' "$file" > "$file.tmp" && mv "$file.tmp" "$file"
+      echo "  ✓ Preserved extraction metadata in $file"
+    fi
+  done
+  git checkout --ours "**/files/" 2>/dev/null || true
+  git checkout --ours .windycivi/ 2>/dev/null || true
+  git add -A
+  git commit --no-edit -m "🔄 Auto-merge: kept scraper data + extraction metadata + files"
+}
+
+echo "⏰ [$(date)] Checkpointing text extraction progress ($CHECKPOINT_REASON)..."
+
+if ! git add --pathspec-from-file="$CHECKPOINT_PATHS_FILE"; then
+  echo "::warning::Failed to stage checkpoint paths"
+  exit 1
+fi
+
+if ! git diff --staged --quiet; then
+  # Commit first (before pulling) to avoid "uncommitted changes" errors
+  git commit -m "🔄 Auto-save text extraction progress for $STATE - $(date -u +%Y-%m-%dT%H:%M:%SZ)" || exit 1
+elif [ "$(git rev-list --count origin/main..HEAD 2>/dev/null || echo 0)" = "0" ]; then
+  # Nothing new, and earlier checkpoints were all pushed
+  echo "No changes to save"
+  exit 0
+fi
+
+# Merge (not rebase): concurrent auto-commits from other jobs rebase badly
+if ! git pull --no-rebase origin main 2>&1; then
+  echo "⚠️ Merge conflict detected, resolving intelligently..."
+  resolve_conflicts || exit 1
+  echo "✅ Conflicts resolved intelligently"
+fi
+
+for i in 1 2 3; do
+  if git push origin main 2>&1; then
+    echo "✅ Progress saved (attempt $i)"
+    exit 0
+  fi
+  echo "⚠️ Push failed (attempt $i), pulling and retrying..."
+  if ! git pull --no-rebase origin main 2>&1; then
+    resolve_conflicts || true
+  fi
+  sleep 5
+done
+
+echo "::warning::Failed to push checkpoint after 3 attempts; will retry at the next checkpoint"
+exit 1
@@ -16,6 +16,7 @@ from utils.processing_tracker import (
     get_current_timestamp,
 )
 from utils.path_utils import build_bill_path
+from utils.extraction_queue import enqueue_bill_for_extraction, versions_changed
 
 
 def handle_bill(
@@ -33,6 +34,8 @@ def handle_bill(
     2. One separate JSON file per action in logs/, each timestamped and slugified
     3. A files/ directory, ready for bill text files
 
+    Bills whose versions are new or changed are added to the extraction queue.
+
     Skips and logs errors if required fields (e.g. identifier) are missing.
 
     Returns:
@@ -108,4 +111,12 @@ def handle_bill(
     with open(metadata_file, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
 
+    # Queue the bill for text extraction if its versions changed
+    if versions_changed(existing_metadata, data):
+        enqueue_bill_for_extraction(
+            DATA_PROCESSED_FOLDER,
+            save_path,
+            "versions_changed" if existing_metadata else "new_bill",
+        )
+
     return True
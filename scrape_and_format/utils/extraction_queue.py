@@ -0,0 +1,67 @@
+"""
+Extraction Queue Utilities
+
+This module records which bills need text extraction so the extract stage can
+work from a queue instead of walking every metadata.json in the repo.
+
+Each format run appends to its own file in .windycivi/extraction_queue/, one
+JSON object per line. Files are never modified after the run that wrote them;
+the extract stage deletes them once consumed, so the two stages never edit
+the same file and git merges between them stay conflict-free.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Queue file for this process, created on first use
+_run_queue_file: Path | None = None
+
+
+def get_extraction_queue_dir(repo_root: Path) -> Path:
+    """Get the extraction queue folder in the calling repo."""
+    return repo_root / ".windycivi" / "extraction_queue"
+
+
+def versions_changed(existing_metadata: dict | None, data: dict) -> bool:
+    """
+    Check whether a bill's versions differ from what was saved before.
+
+    Args:
+        existing_metadata: Previously saved metadata, or None for a new bill
+        data: Incoming bill data
+
+    Returns:
+        True if the bill has versions that are new or changed
+    """
+    versions = data.get("versions") or []
+    if existing_metadata is None:
+        return bool(versions)
+    return versions != (existing_metadata.get("versions") or [])
+
+
+def enqueue_bill_for_extraction(repo_root: Path, bill_folder: Path, reason: str) -> None:
+    """
+    Add a bill to this run's extraction queue file.
+
+    Args:
+        repo_root: Root of the git repository (caller repo)
+        bill_folder: Folder holding the bill's metadata.json
+        reason: Why the bill needs extraction ('new_bill', 'versions_changed')
+    """
+    global _run_queue_file
+
+    if _run_queue_file is None:
+        queue_dir = get_extraction_queue_dir(repo_root)
+        queue_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        _run_queue_file = queue_dir / f"{timestamp}_{os.getpid()}.ndjson"
+
+    entry = {
+        "bill": bill_folder.relative_to(repo_root).as_posix(),
+        "reason": reason,
+        "queued_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    with open(_run_queue_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
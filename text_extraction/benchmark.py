@@ -0,0 +1,355 @@
+import click
+import json
+import shutil
+import tempfile
+from pathlib import Path
+import sys
+
+# Add the current directory to the path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.benchmark import (
+    HostProfile,
+    build_synthetic_corpus,
+    load_fixture_corpus,
+    measure_parse_times,
+    parse_mix,
+    run_benchmark,
+)
+
+
+def parse_mix_option(ctx, param, value):
+    """Click callback turning a mix like xml:1,html:1,pdf:2 into weights."""
+    try:
+        return parse_mix(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def print_run(label: str, result: dict):
+    print(f"\n🏁 {label}")
+    print(
+        f"   {result['documents_extracted']}/{result['documents']} documents from "
+        f"{result['bills']} bills in {result['seconds']:.2f}s"
+    )
+    print(
+        f"   {result['documents_per_second']:.2f} documents/sec, "
+        f"{result['bytes_per_second'] / 1_000_000:.2f} MB/sec downloaded"
+    )
+    requests = result["requests"]
+    print(
+        f"   Requests: {requests['requests']} ({requests['throttled']} answered 429, "
+        f"{result['extra_requests']} beyond one per document)"
+    )
+    connections = result["connections"]
+    print(
+        f"   Connections: {connections['new_connections']} new, "
+        f"{connections['reused']} requests on kept-alive connections"
+    )
+    for media_type, summary in result.get("by_media_type", {}).items():
+        download, parse = summary["download_seconds"], summary["parse_seconds"]
+        print(
+            f"   {media_type}: download p50/p95/p99 {download['p50']:.3f}/{download['p95']:.3f}/"
+            f"{download['p99']:.3f}s, parse {parse['p50']:.3f}/{parse['p95']:.3f}/{parse['p99']:.3f}s, "
+            f"{summary['retries']} retries"
+        )
+    if result["bills_failed"]:
+        print(f"   ⚠️ {result['bills_failed']} bills failed")
+
+
+@click.command()
+@click.option(
+    "--documents",
+    type=click.IntRange(min=1),
+    default=60,
+    show_default=True,
+    help="Number of synthetic documents to generate.",
+)
+@click.option(
+    "--mix",
+    default="xml:1,html:1,pdf:1",
+    show_default=True,
+    callback=parse_mix_option,
+    help="Synthetic document kinds and their weights.",
+)
+@click.option(
+    "--corpus",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help="Folder of fixture .xml/.html/.pdf files to serve instead of synthetic documents.",
+)
+@click.option(
+    "--sections",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Sections per synthetic XML/HTML document.",
+)
+@click.option(
+    "--pdf-pages",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="Pages per synthetic PDF.",
+)
+@click.option(
+    "--versions-per-bill",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Documents per synthetic bill.",
+)
+@click.option(
+    "--hosts",
+    type=click.IntRange(min=1),
+    default=2,
+    show_default=True,
+    help="Simulated hosts (local servers); documents are spread over them.",
+)
+@click.option(
+    "--latency",
+    type=float,
+    default=0.0,
+    show_default=True,
+    help="Seconds each host waits before answering.",
+)
+@click.option(
+    "--slow-hosts",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="How many of the hosts are slow.",
+)
+@click.option(
+    "--slow-latency",
+    type=float,
+    default=0.5,
+    show_default=True,
+    help="Seconds a slow host waits before answering.",
+)
+@click.option(
+    "--slow-bandwidth-kb",
+    type=float,
+    default=None,
+    help="Bandwidth of slow hosts in KB/sec (unlimited if not set).",
+)
+@click.option(
+    "--burst-every",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="After this many requests, a host answers the next --burst-length requests with 429.",
+)
+@click.option(
+    "--burst-length",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Length of each 429 burst.",
+)
+@click.option(
+    "--retry-after",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Retry-After seconds sent with 429 responses.",
+)
+@click.option(
+    "--baseline/--no-baseline",
+    default=True,
+    show_default=True,
+    help="With 429 bursts, also run without them to show what the retries cost.",
+)
+@click.option(
+    "--request-delay-scale",
+    type=float,
+    default=0.0,
+    show_default=True,
+    help="Scale of the pause before each request (1 is production pacing, 0 measures the pipeline alone).",
+)
+@click.option(
+    "--http-pool-size",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Connections kept alive per host.",
+)
+@click.option(
+    "--parse-timeout",
+    type=float,
+    default=300.0,
+    show_default=True,
+    help="Seconds a document may spend parsing (0 parses in-process).",
+)
+@click.option(
+    "--pdf-engine",
+    type=click.Choice(["quality", "fast", "auto"]),
+    default="quality",
+    show_default=True,
+    help="PDF engine strategy.",
+)
+@click.option(
+    "--stream-pdf",
+    is_flag=True,
+    help="Extract PDFs page by page.",
+)
+@click.option(
+    "--output-format",
+    type=click.Choice(["full", "compact"]),
+    default="full",
+    show_default=True,
+    help="Format of the _extracted.txt files.",
+)
+@click.option(
+    "--report",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Also write the results to this JSON file.",
+)
+@click.option(
+    "--keep",
+    is_flag=True,
+    help="Keep the synthetic data trees (their location is printed).",
+)
+@click.option(
+    "--verbose",
+    is_flag=True,
+    help="Show the extractor's output.",
+)
+def main(
+    documents: int,
+    mix: dict,
+    corpus: Path,
+    sections: int,
+    pdf_pages: int,
+    versions_per_bill: int,
+    hosts: int,
+    latency: float,
+    slow_hosts: int,
+    slow_latency: float,
+    slow_bandwidth_kb: float,
+    burst_every: int,
+    burst_length: int,
+    retry_after: int,
+    baseline: bool,
+    request_delay_scale: float,
+    http_pool_size: int,
+    parse_timeout: float,
+    pdf_engine: str,
+    stream_pdf: bool,
+    output_format: str,
+    report: Path,
+    keep: bool,
+    verbose: bool,
+):
+    """
+    Benchmark text extraction offline, against local document servers.
+
+    Serves a corpus of XML, HTML and PDF documents from simulated hosts
+    (with optional latency, slow hosts and 429 bursts), runs the extractor
+    over a synthetic bill tree pointing at them, and reports throughput,
+    parse time per media type and what retries cost.
+    """
+    if corpus:
+        documents_list = load_fixture_corpus(corpus)
+        if not documents_list:
+            print(f"❌ No .xml, .html or .pdf files in {corpus}")
+            return 1
+        print(f"📁 Serving {len(documents_list)} fixture documents from {corpus}")
+    else:
+        documents_list = build_synthetic_corpus(documents, mix, sections, pdf_pages)
+        mix_label = ", ".join(f"{kind}:{weight}" for kind, weight in mix.items())
+        print(f"🧪 Generated {len(documents_list)} synthetic documents ({mix_label})")
+
+    def host_profiles(with_bursts: bool):
+        profiles = []
+        for index in range(hosts):
+            slow = index >= hosts - slow_hosts
+            profiles.append(
+                HostProfile(
+                    latency=slow_latency if slow else latency,
+                    bandwidth=slow_bandwidth_kb * 1000 if slow and slow_bandwidth_kb else None,
+                    burst_every=burst_every if with_bursts else 0,
+                    burst_length=burst_length if with_bursts else 0,
+                    retry_after=retry_after,
+                )
+            )
+        return profiles
+
+    extraction_options = {
+        "parse_timeout": parse_timeout,
+        "pdf_engine": pdf_engine,
+        "stream_pdf": stream_pdf,
+        "output_format": output_format,
+    }
+    faulty = burst_every > 0 and burst_length > 0
+    runs = [("with 429 bursts" if faulty else "run", True)]
+    if faulty and baseline:
+        runs.insert(0, ("baseline (no 429s)", False))
+
+    results = {}
+    for label, with_bursts in runs:
+        work_dir = Path(tempfile.mkdtemp(prefix="bill_text_benchmark_"))
+        try:
+            results[label] = run_benchmark(
+                documents_list,
+                host_profiles(with_bursts),
+                work_dir,
+                versions_per_bill=versions_per_bill,
+                request_delay_scale=request_delay_scale,
+                http_pool_size=http_pool_size,
+                verbose=verbose,
+                **extraction_options,
+            )
+        finally:
+            if keep:
+                print(f"📂 Kept {label} tree: {work_dir}")
+            else:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        print_run(label, results[label])
+
+    if len(results) == 2:
+        clean, faulted = results[runs[0][0]], results[runs[1][0]]
+        print(
+            f"\n🔁 Retries cost {faulted['seconds'] - clean['seconds']:+.2f}s "
+            f"({faulted['extra_requests']} extra requests, "
+            f"{faulted['documents_extracted'] - clean['documents_extracted']:+d} documents extracted)"
+        )
+
+    print("\n⏱️ Parse time per media type (in-process)")
+    parse_times = measure_parse_times(documents_list, pdf_engine, verbose)
+    for kind, times in parse_times.items():
+        print(
+            f"   {kind}: {times['documents']} documents, mean {times['mean_ms']:.1f} ms, "
+            f"p50 {times['p50_ms']:.1f} ms, p95 {times['p95_ms']:.1f} ms, max {times['max_ms']:.1f} ms"
+        )
+
+    if report:
+        report.parent.mkdir(parents=True, exist_ok=True)
+        with open(report, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "documents": len(documents_list),
+                    "runs": results,
+                    "parse_times": parse_times,
+                    "options": {
+                        "hosts": hosts,
+                        "latency": latency,
+                        "slow_hosts": slow_hosts,
+                        "burst_every": burst_every,
+                        "burst_length": burst_length,
+                        "request_delay_scale": request_delay_scale,
+                        "http_pool_size": http_pool_size,
+                        **extraction_options,
+                    },
+                },
+                f,
+                indent=2,
+            )
+        print(f"\n📊 Benchmark report saved: {report}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
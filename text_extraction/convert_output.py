@@ -0,0 +1,77 @@
+import click
+from pathlib import Path
+import sys
+
+# Add the current directory to the path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.output_writer import convert_to_compact, get_sidecar_path
+
+
+@click.command()
+@click.option(
+    "--data-folder",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    required=True,
+    help="Path to the repo root containing bill data (with country:us/ structure).",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Only count the files that would be converted.",
+)
+def main(data_folder: Path, dry_run: bool = False):
+    """
+    Convert existing _extracted.txt files to the compact output format.
+
+    Each full-format file (header, sections, raw text) is rewritten as the
+    normalized text, with the title, media info and section offsets in an
+    _extracted.json sidecar. Files that already have a sidecar are skipped.
+    """
+    print(f"📁 Converting extracted text in: {data_folder}")
+
+    converted = 0
+    already_compact = 0
+    failed = 0
+    bytes_before = 0
+    bytes_after = 0
+
+    for text_file in data_folder.glob("country:us/state:*/sessions/*/bills/*/files/**/*_extracted.txt"):
+        if get_sidecar_path(text_file).exists():
+            already_compact += 1
+            continue
+        if dry_run:
+            converted += 1
+            bytes_before += text_file.stat().st_size
+            continue
+
+        size = text_file.stat().st_size
+        try:
+            if convert_to_compact(text_file):
+                converted += 1
+                bytes_before += size
+                bytes_after += text_file.stat().st_size
+                bytes_after += get_sidecar_path(text_file).stat().st_size
+                if converted % 500 == 0:
+                    print(f"   Converted {converted} files...")
+        except Exception as e:
+            print(f"❌ Could not convert {text_file}: {e}")
+            failed += 1
+
+    print(f"\n📊 Conversion {'(dry run) ' if dry_run else ''}Complete!")
+    print(f"Converted: {converted}")
+    print(f"Already compact: {already_compact}")
+    print(f"Failed: {failed}")
+    if dry_run:
+        print(f"Size of files to convert: {bytes_before / 1_000_000:.1f} MB")
+    elif converted:
+        print(
+            f"Size: {bytes_before / 1_000_000:.1f} MB -> {bytes_after / 1_000_000:.1f} MB"
+        )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,34 @@ import sys
 sys.path.append(str(Path(__file__).parent))
 
 from utils.text_extraction import process_bills_in_batch
+from utils.scheduler import parse_duration
+from utils.sharding import merge_shard_fragments, parse_shard
+
+
+def parse_duration_option(ctx, param, value):
+    """Click callback turning a duration like 330m or 5.5h into seconds."""
+    try:
+        return parse_duration(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def parse_shard_option(ctx, param, value):
+    """Click callback turning a shard spec like 0/4 into (index, count)."""
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def parse_host_pool_sizes_option(ctx, param, value):
+    """Click callback turning host=size values into a dictionary."""
+    from utils.http_client import parse_host_pool_sizes
+
+    try:
+        return parse_host_pool_sizes(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
 
 
 @click.command()
@@ -31,8 +59,162 @@ from utils.text_extraction import process_bills_in_batch
     is_flag=True,
     help="Enable incremental processing - only extract text for bills that haven't been processed or have been updated.",
 )
+@click.option(
+    "--parse-timeout",
+    type=float,
+    default=300.0,
+    show_default=True,
+    help="Seconds a single document may spend parsing before its worker is killed (0 parses in-process).",
+)
+@click.option(
+    "--parse-max-memory-mb",
+    type=float,
+    default=2048.0,
+    show_default=True,
+    help="Resident memory ceiling in MB for the parse worker; documents over it are retried on a long backoff.",
+)
+@click.option(
+    "--stream-pdf",
+    is_flag=True,
+    help="Extract PDFs page by page, writing text to disk as it goes to bound memory.",
+)
+@click.option(
+    "--pdf-max-pages",
+    type=int,
+    default=None,
+    help="With --stream-pdf, stop extracting a PDF after this many pages.",
+)
+@click.option(
+    "--pdf-max-bytes",
+    type=int,
+    default=None,
+    help="With --stream-pdf, stop extracting a PDF after this many bytes of text.",
+)
+@click.option(
+    "--pdf-engine",
+    type=click.Choice(["quality", "fast", "auto"]),
+    default="quality",
+    show_default=True,
+    help="PDF engine strategy: quality (pdfplumber first), fast (PyMuPDF only) or auto (learned per host/document class).",
+)
+@click.option(
+    "--full-scan",
+    is_flag=True,
+    help="With --incremental, check every bill instead of only those in the extraction queue.",
+)
+@click.option(
+    "--time-budget",
+    callback=parse_duration_option,
+    default=None,
+    help="Wall-clock budget for the run (seconds, or e.g. 330m, 5.5h). Stops before the deadline and defers the remaining bills.",
+)
+@click.option(
+    "--checkpoint-interval",
+    callback=parse_duration_option,
+    default=None,
+    help="Save progress between bills at this interval (seconds, or e.g. 30m).",
+)
+@click.option(
+    "--checkpoint-command",
+    default=None,
+    help="Shell command run in the data folder at each checkpoint to commit the paths listed in $CHECKPOINT_PATHS_FILE.",
+)
+@click.option(
+    "--shard",
+    default=None,
+    callback=parse_shard_option,
+    help="Only extract shard i of N (e.g. 0/4) for parallel jobs; run --merge-shards once all shards finish.",
+)
+@click.option(
+    "--error-log-mode",
+    type=click.Choice(["ndjson", "files"]),
+    default="ndjson",
+    show_default=True,
+    help="Log failures to one NDJSON file per run, or one JSON file per failure.",
+)
+@click.option(
+    "--output-format",
+    type=click.Choice(["full", "compact"]),
+    default="full",
+    show_default=True,
+    help="full: sections then raw text in each _extracted.txt; compact: normalized text plus an _extracted.json sidecar with section offsets.",
+)
+@click.option(
+    "--compress-originals",
+    type=click.Choice(["none", "gzip", "zstd"]),
+    default="none",
+    show_default=True,
+    help="Store original XML/HTML/PDF files compressed, with a content hash in the name (zstd needs the zstandard package).",
+)
+@click.option(
+    "--max-download-mb",
+    type=float,
+    default=100.0,
+    show_default=True,
+    help="Skip PDFs larger than this many MB (0 disables the cap).",
+)
+@click.option(
+    "--http-pool-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Connections kept alive per host by the download client (default 10).",
+)
+@click.option(
+    "--http-host-pool-size",
+    "http_host_pool_sizes",
+    multiple=True,
+    callback=parse_host_pool_sizes_option,
+    help="Pool size for one host, as host=size (e.g. www.congress.gov=4). Repeatable.",
+)
+@click.option(
+    "--document-metrics-format",
+    type=click.Choice(["ndjson", "csv"]),
+    default="ndjson",
+    show_default=True,
+    help="Format of the per-document metrics report (download/parse time, bytes, retries).",
+)
+@click.option(
+    "--version-deltas",
+    is_flag=True,
+    help="Store each later bill version's _extracted.txt as a line delta against the previous version (read back with read_text.py).",
+)
+@click.option(
+    "--search-index",
+    is_flag=True,
+    help="Keep a full-text search index of the extracted text in .windycivi/text_search.sqlite (query it with search.py).",
+)
+@click.option(
+    "--merge-shards",
+    is_flag=True,
+    default=False,
+    help="Merge the fragments written by --shard runs into the shared state and reports, then exit.",
+)
 def main(
-    state: str, data_folder: Path, output_folder: Path = None, incremental: bool = False
+    state: str,
+    data_folder: Path,
+    output_folder: Path = None,
+    incremental: bool = False,
+    parse_timeout: float = 300.0,
+    parse_max_memory_mb: float = 2048.0,
+    stream_pdf: bool = False,
+    pdf_max_pages: int = None,
+    pdf_max_bytes: int = None,
+    pdf_engine: str = "quality",
+    full_scan: bool = False,
+    time_budget: float = None,
+    checkpoint_interval: float = None,
+    checkpoint_command: str = None,
+    shard: tuple = None,
+    error_log_mode: str = "ndjson",
+    output_format: str = "full",
+    compress_originals: str = "none",
+    max_download_mb: float = 100.0,
+    http_pool_size: int = None,
+    http_host_pool_sizes: dict = None,
+    document_metrics_format: str = "ndjson",
+    version_deltas: bool = False,
+    search_index: bool = False,
+    merge_shards: bool = False,
 ):
     """
     Extract text from PDFs and XMLs in processed bill data.
@@ -48,15 +230,20 @@ def main(
         print(f"❌ Data folder does not exist: {data_folder}")
         return 1
 
-    # Check if we have any bill data
-    bill_folders = list(data_folder.glob("country:us/state:*/sessions/*/bills/*"))
-    if not bill_folders:
+    if merge_shards:
+        try:
+            merge_shard_fragments(data_folder, output_folder, state, search_index)
+            return 0
+        except Exception as e:
+            print(f"❌ Error merging shard fragments: {e}")
+            return 1
+
+    # Check if we have any bill data (without walking every bill folder)
+    if not any(data_folder.glob("country:us/state:*/sessions/*/bills")):
         print(f"❌ No bill folders found in: {data_folder}")
         print("Expected structure: country:us/state:*/sessions/*/bills/*")
         return 1
 
-    print(f"📄 Found {len(bill_folders)} bill folders to process")
-
     # Run text extraction
     try:
         stats = process_bills_in_batch(
@@ -64,6 +251,28 @@ def main(
             output_folder=output_folder,
             state=state,
             incremental=incremental,
+            parse_timeout=parse_timeout,
+            parse_max_memory_mb=parse_max_memory_mb,
+            stream_pdf=stream_pdf,
+            pdf_max_pages=pdf_max_pages,
+            pdf_max_bytes=pdf_max_bytes,
+            pdf_engine=pdf_engine,
+            full_scan=full_scan,
+            time_budget=time_budget,
+            checkpoint_interval=checkpoint_interval,
+            checkpoint_command=checkpoint_command,
+            shard=shard,
+            error_log_mode=error_log_mode,
+            output_format=output_format,
+            compress_originals=compress_originals,
+            max_download_bytes=(
+                int(max_download_mb * 1024 * 1024) if max_download_mb else None
+            ),
+            http_pool_size=http_pool_size,
+            http_host_pool_sizes=http_host_pool_sizes,
+            document_metrics_format=document_metrics_format,
+            version_deltas=version_deltas,
+            search_index=search_index,
         )
 
         print(f"\n📊 Text Extraction Complete!")
@@ -73,6 +282,12 @@ def main(
         print(f"Errors: {stats['errors']}")
         if stats.get("skipped", 0) > 0:
             print(f"Skipped (already processed): {stats['skipped']}")
+        if stats.get("deferred", 0) > 0:
+            print(f"Deferred (time budget): {stats['deferred']}")
+        if stats.get("backoff", 0) > 0:
+            print(f"Waiting on failed documents (backoff): {stats['backoff']}")
+        if stats.get("duplicates_avoided", 0) > 0:
+            print(f"Duplicate fetches avoided: {stats['duplicates_avoided']}")
 
         if stats["errors"] > 0:
             print(f"⚠️ {stats['errors']} bills had errors during processing")
@@ -0,0 +1,46 @@
+import click
+from pathlib import Path
+import sys
+
+# Add the current directory to the path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.version_deltas import read_stored_text
+
+
+@click.command()
+@click.argument(
+    "text_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the text to this file instead of printing it.",
+)
+def main(text_file: Path, output: Path = None):
+    """
+    Print the extracted text of one bill version.
+
+    TEXT_FILE is the version's _extracted.txt path (or its .delta file).
+    Versions stored with --version-deltas are rebuilt from the version
+    before them; full files are printed as they are.
+    """
+    try:
+        text = read_stored_text(text_file)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read {text_file}: {e}", file=sys.stderr)
+        return 1
+
+    if output:
+        with open(output, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        print(f"✅ Wrote {len(text)} characters to {output}")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    main()
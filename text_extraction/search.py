@@ -0,0 +1,104 @@
+import click
+import json
+from pathlib import Path
+import sqlite3
+import sys
+
+# Add the current directory to the path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.extraction_manifest import ExtractionManifest
+from utils.search_index import SearchIndex, get_search_index_path
+
+
+@click.command()
+@click.argument("query")
+@click.option(
+    "--data-folder",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    required=True,
+    help="Path to the repo root containing bill data (with country:us/ structure).",
+)
+@click.option(
+    "--state",
+    default=None,
+    help="Only return bills of this state (e.g. il).",
+)
+@click.option(
+    "--session",
+    default=None,
+    help="Only return bills of this session.",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Maximum number of results.",
+)
+@click.option(
+    "--rebuild",
+    is_flag=True,
+    help="Index every bill (manifest versions, or the text files on disk) before searching (e.g. for a repo extracted without --search-index).",
+)
+@click.option(
+    "--as-json",
+    is_flag=True,
+    help="Print the results as JSON lines.",
+)
+def main(
+    query: str,
+    data_folder: Path,
+    state: str = None,
+    session: str = None,
+    limit: int = 20,
+    rebuild: bool = False,
+    as_json: bool = False,
+):
+    """
+    Search the extracted bill text.
+
+    QUERY is an SQLite FTS5 query: words, "exact phrases", AND/OR/NOT and
+    prefix* terms. Prints the bill identifier, session, version note and a
+    snippet for each matching document, best matches first.
+    """
+    index_path = get_search_index_path(data_folder)
+    if not index_path.exists() and not rebuild:
+        print(f"❌ No search index at {index_path} (extract with --search-index, or pass --rebuild)")
+        return 1
+
+    index = SearchIndex(index_path)
+    if not index.open():
+        return 1
+    try:
+        if rebuild:
+            manifest = ExtractionManifest()
+            manifest.load(data_folder)
+            totals = index.update_all(data_folder, manifest.bills)
+            print(
+                f"🔎 Indexed {totals['indexed']} documents, removed {totals['removed']}, "
+                f"{totals['unchanged']} unchanged"
+            )
+
+        try:
+            results = index.search(query, state=state, session=session, limit=limit)
+        except sqlite3.OperationalError as e:
+            print(f"❌ Invalid query '{query}': {e}")
+            return 1
+
+        for result in results:
+            if as_json:
+                print(json.dumps(result, ensure_ascii=False))
+                continue
+            print(f"📄 {result['bill_id']} | {result['state']} {result['session']} | {result['note']}")
+            print(f"   {' '.join(result['snippet'].split())}")
+            print(f"   {result['text_file']}")
+        if not as_json:
+            print(f"\n🔎 {len(results)} results for '{query}'")
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    main()
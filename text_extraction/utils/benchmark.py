@@ -0,0 +1,515 @@
+"""
+Offline extraction benchmark - run the extractor against a local document server.
+
+Measuring throughput against live legislature sites is slow, noisy and
+hard on their servers. The benchmark instead:
+
+1. Builds a corpus of XML, HTML and PDF documents (synthetic, or the
+   fixture files in a folder)
+2. Serves it from one local HTTP server per simulated host, each with its
+   own latency, bandwidth and bursts of 429 responses
+3. Writes a synthetic country:us/state:<state>/sessions/<session>/bills/*/metadata.json
+   tree whose versions link to those servers
+4. Runs process_bills_in_batch() over the tree and reports documents/sec,
+   bytes/sec, requests spent on retries, HTTP connection reuse and the
+   run's per-document download/parse percentiles by media type
+
+Parse time per media type is measured separately, by running the parsers
+in-process over the same corpus, so it is not blurred by download time.
+
+text_extraction/benchmark.py is the command line entry point.
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .common import configure_http_client, set_request_delay_scale
+from .document_metrics import percentile
+from .html_extractor import extract_text_from_html
+from .http_client import DEFAULT_POOL_MAXSIZE
+from .pdf_engines import PdfEngineSelector
+from .pdf_extractor import parse_pdf_document
+from .text_extraction import process_bills_in_batch
+from .xml_extractor import extract_text_from_xml
+
+# Corpus document kind -> media type written to metadata.json
+MEDIA_TYPES = {
+    "xml": "text/xml",
+    "html": "text/html",
+    "pdf": "application/pdf",
+}
+CONTENT_TYPES = {
+    "xml": "text/xml; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "pdf": "application/pdf",
+}
+FIXTURE_SUFFIXES = {".xml": "xml", ".html": "html", ".htm": "html", ".pdf": "pdf"}
+
+WORDS = (
+    "the state shall provide that any person department board section act "
+    "amended fund public county agency within days following under this "
+    "subsection which may not more than pursuant regulation license tax "
+    "program report annual commission member services health education"
+).split()
+
+SEND_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class CorpusDocument:
+    """One document served by the benchmark servers."""
+
+    name: str
+    kind: str
+    content: bytes
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.kind]
+
+
+@dataclass
+class HostProfile:
+    """How one simulated host behaves."""
+
+    latency: float = 0.0
+    # Bytes per second for response bodies (None for no limit)
+    bandwidth: Optional[float] = None
+    # After every burst_every requests, the next burst_length get a 429
+    burst_every: int = 0
+    burst_length: int = 0
+    # Whole seconds: urllib3 ignores fractional Retry-After values
+    retry_after: int = 1
+
+    @property
+    def faulty(self) -> bool:
+        return self.burst_every > 0 and self.burst_length > 0
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def make_xml_document(index: int, sections: int) -> bytes:
+    """Synthetic bill XML in the structure the XML extractor expects."""
+    rng = random.Random(index)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        "<bill>",
+        f"<title>Benchmark Bill {index}</title>",
+        f"<official-title>{_sentence(rng, 14)}</official-title>",
+    ]
+    for number in range(1, sections + 1):
+        parts.append(
+            f"<section><header>Section {number}.</header>"
+            f"<text>{' '.join(_sentence(rng, 18) for _ in range(4))}</text></section>"
+        )
+    parts.append("</bill>")
+    return "\n".join(parts).encode("utf-8")
+
+
+def make_html_document(index: int, sections: int) -> bytes:
+    """Synthetic bill text page."""
+    rng = random.Random(index)
+    parts = [
+        "<html><head>",
+        f"<title>Benchmark Bill {index}</title>",
+        "<script>var tracking = true;</script>",
+        "</head><body>",
+        f"<h1>Benchmark Bill {index}</h1>",
+    ]
+    for number in range(1, sections + 1):
+        parts.append(
+            f"<p>Section {number}. {' '.join(_sentence(rng, 18) for _ in range(4))}</p>"
+        )
+    parts.append("</body></html>")
+    return "\n".join(parts).encode("utf-8")
+
+
+def make_pdf_document(index: int, pages: int, lines_per_page: int = 40) -> bytes:
+    """Synthetic multi-page text PDF (Helvetica, one column)."""
+    rng = random.Random(index)
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content per page
+    page_ids = [4 + 2 * page for page in range(pages)]
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>",
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page, page_id in enumerate(page_ids):
+        lines = [f"Benchmark Bill {index} - page {page + 1}"]
+        lines += [_sentence(rng, 10) for _ in range(lines_per_page - 1)]
+        stream = "BT /F1 10 Tf 54 750 Td 16 TL\n"
+        stream += "".join(f"({line}) Tj T*\n" for line in lines)
+        stream += "ET\n"
+        objects[page_id] = (
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Contents {page_id + 1} 0 R /Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        objects[page_id + 1] = f"<< /Length {len(stream)} >>\nstream\n{stream}endstream"
+
+    out = "%PDF-1.4\n"
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(out)
+        out += f"{object_id} 0 obj\n{objects[object_id]}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offsets[i]:010d} 00000 n \n" for i in sorted(objects))
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def build_synthetic_corpus(
+    documents: int,
+    mix: Dict[str, int],
+    sections: int = 20,
+    pdf_pages: int = 5,
+) -> List[CorpusDocument]:
+    """
+    Generate a corpus of synthetic documents.
+
+    Args:
+        documents: Number of documents
+        mix: Kind -> weight, e.g. {"xml": 1, "html": 1, "pdf": 2}
+        sections: Sections per XML/HTML document
+        pdf_pages: Pages per PDF
+
+    Returns:
+        Documents, with kinds interleaved according to the mix
+    """
+    pattern = [kind for kind, weight in mix.items() for _ in range(weight)]
+    if not pattern:
+        raise ValueError("The document mix needs at least one kind with a weight above 0")
+
+    corpus = []
+    for index in range(documents):
+        kind = pattern[index % len(pattern)]
+        if kind == "xml":
+            content = make_xml_document(index, sections)
+        elif kind == "html":
+            content = make_html_document(index, sections)
+        else:
+            content = make_pdf_document(index, pdf_pages)
+        corpus.append(CorpusDocument(f"doc-{index:05d}.{kind}", kind, content))
+    return corpus
+
+
+def load_fixture_corpus(folder: Path) -> List[CorpusDocument]:
+    """Use the XML, HTML and PDF files in a folder as the corpus."""
+    corpus = []
+    for path in sorted(Path(folder).rglob("*")):
+        kind = FIXTURE_SUFFIXES.get(path.suffix.lower())
+        if kind and path.is_file():
+            name = f"doc-{len(corpus):05d}.{kind}"
+            corpus.append(CorpusDocument(name, kind, path.read_bytes()))
+    return corpus
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse a document mix like "xml:1,html:1,pdf:2"."""
+    mix = {}
+    for part in str(value).split(","):
+        kind, _, weight = part.strip().partition(":")
+        if kind not in MEDIA_TYPES or (weight and not weight.isdigit()):
+            raise ValueError(
+                f"Invalid mix entry '{part}' (expected kind:weight with kind one of {', '.join(MEDIA_TYPES)})"
+            )
+        mix[kind] = int(weight) if weight else 1
+    return mix
+
+
+class DocumentServer:
+    """
+    Local HTTP server for one simulated host.
+
+    Speaks HTTP/1.1 with keep-alive, so connection reuse can be measured.
+    Counts requests, documents and bytes served and 429s sent.
+    """
+
+    def __init__(self, documents: Dict[str, CorpusDocument], profile: HostProfile):
+        self.documents = documents
+        self.profile = profile
+        self.stats = {
+            "requests": 0,
+            "documents": 0,
+            "bytes": 0,
+            "throttled": 0,
+            "not_found": 0,
+        }
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _throttle_next(self) -> bool:
+        """Count a request; True if it falls in a 429 burst."""
+        profile = self.profile
+        with self._lock:
+            self.stats["requests"] += 1
+            if not profile.faulty:
+                return False
+            position = (self.stats["requests"] - 1) % (
+                profile.burst_every + profile.burst_length
+            )
+            throttled = position >= profile.burst_every
+            if throttled:
+                self.stats["throttled"] += 1
+            return throttled
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                profile = server.profile
+                if profile.latency:
+                    time.sleep(profile.latency)
+
+                if server._throttle_next():
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(profile.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                document = server.documents.get(self.path.lstrip("/"))
+                if document is None:
+                    with server._lock:
+                        server.stats["not_found"] += 1
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPES[document.kind])
+                self.send_header("Content-Length", str(len(document.content)))
+                self.end_headers()
+                for start in range(0, len(document.content), SEND_CHUNK_SIZE):
+                    chunk = document.content[start : start + SEND_CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    if profile.bandwidth:
+                        time.sleep(len(chunk) / profile.bandwidth)
+                with server._lock:
+                    server.stats["documents"] += 1
+                    server.stats["bytes"] += len(document.content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def build_metadata_tree(
+    repo_root: Path,
+    links: List[Dict[str, str]],
+    state: str = "bm",
+    session: str = "2025",
+    versions_per_bill: int = 1,
+) -> int:
+    """
+    Write synthetic bills whose versions link to the served documents.
+
+    Args:
+        repo_root: Root of the synthetic data repo
+        links: {"url", "media_type"} per document, in order
+        state: State folder name
+        session: Session folder name
+        versions_per_bill: Documents per bill (one version each)
+
+    Returns:
+        Number of bills written
+    """
+    bills_dir = repo_root / "country:us" / f"state:{state}" / "sessions" / session / "bills"
+    bills = 0
+    for start in range(0, len(links), versions_per_bill):
+        bill_id = f"BM{bills + 1:05d}"
+        bill_dir = bills_dir / bill_id
+        (bill_dir / "files").mkdir(parents=True, exist_ok=True)
+        metadata = {
+            "identifier": f"BM {bills + 1}",
+            "legislative_session": session,
+            "versions": [
+                {"note": f"Version {number + 1}", "links": [link]}
+                for number, link in enumerate(links[start : start + versions_per_bill])
+            ],
+        }
+        with open(bill_dir / "metadata.json", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        bills += 1
+    return bills
+
+
+@contextmanager
+def quiet_output(verbose: bool):
+    """Silence the extractor's progress output unless verbose."""
+    if verbose:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        yield
+
+
+def measure_parse_times(
+    corpus: List[CorpusDocument], pdf_engine: str = "quality", verbose: bool = False
+) -> Dict[str, Dict]:
+    """
+    Time the parsers in-process over the corpus, by media type.
+
+    Returns:
+        Kind -> documents, bytes, total/mean/p50/p95/max seconds
+    """
+    selector = PdfEngineSelector(pdf_engine)
+    times: Dict[str, List[float]] = {}
+    sizes: Dict[str, int] = {}
+    work_dir = Path(tempfile.mkdtemp(prefix="bill_text_benchmark_"))
+    try:
+        with quiet_output(verbose):
+            for document in corpus:
+                started = time.perf_counter()
+                if document.kind == "xml":
+                    extract_text_from_xml(document.content.decode("utf-8"))
+                elif document.kind == "html":
+                    extract_text_from_html(document.content.decode("utf-8"))
+                else:
+                    pdf_path = work_dir / document.name
+                    pdf_path.write_bytes(document.content)
+                    started = time.perf_counter()
+                    engines, fallback_engines = selector.engine_order(
+                        document.name, len(document.content)
+                    )
+                    parse_pdf_document(str(pdf_path), document.name, engines, fallback_engines)
+                times.setdefault(document.kind, []).append(time.perf_counter() - started)
+                sizes[document.kind] = sizes.get(document.kind, 0) + len(document.content)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        kind: {
+            "documents": len(values),
+            "bytes": sizes[kind],
+            "total_seconds": round(sum(values), 4),
+            "mean_ms": round(1000 * sum(values) / len(values), 2),
+            "p50_ms": round(1000 * percentile(values, 50), 2),
+            "p95_ms": round(1000 * percentile(values, 95), 2),
+            "max_ms": round(1000 * max(values), 2),
+        }
+        for kind, values in sorted(times.items())
+    }
+
+
+def run_benchmark(
+    corpus: List[CorpusDocument],
+    hosts: List[HostProfile],
+    work_dir: Path,
+    versions_per_bill: int = 1,
+    request_delay_scale: float = 0.0,
+    http_pool_size: int = DEFAULT_POOL_MAXSIZE,
+    verbose: bool = False,
+    **extraction_options,
+) -> Dict:
+    """
+    Serve the corpus, run process_bills_in_batch over a synthetic tree and measure it.
+
+    Args:
+        corpus: Documents to serve (assigned to hosts round-robin)
+        hosts: One profile per simulated host
+        work_dir: Empty folder for the synthetic tree and reports
+        versions_per_bill: Documents per synthetic bill
+        request_delay_scale: Scale of the pause before each request (1 is
+            production pacing, 0 measures the pipeline alone)
+        http_pool_size: Connections kept alive per host
+        verbose: Show the extractor's output
+        **extraction_options: Passed on to process_bills_in_batch (e.g.
+            parse_timeout, pdf_engine, stream_pdf, output_format)
+
+    Returns:
+        Dictionary with the run's throughput, retry and connection figures
+    """
+    servers = [DocumentServer({}, profile) for profile in hosts]
+    links = []
+    for index, document in enumerate(corpus):
+        server = servers[index % len(servers)]
+        server.documents[document.name] = document
+        links.append(
+            {"url": f"{server.base_url}/{document.name}", "media_type": document.media_type}
+        )
+
+    data_root = work_dir / "data"
+    output_folder = work_dir / "reports"
+    bills = build_metadata_tree(data_root, links, versions_per_bill=versions_per_bill)
+
+    # A fresh client per run, so its connection metrics only cover this run
+    client = configure_http_client(http_pool_size)
+    set_request_delay_scale(request_delay_scale)
+    for server in servers:
+        server.start()
+    try:
+        started = time.perf_counter()
+        with quiet_output(verbose):
+            stats = process_bills_in_batch(
+                data_root, output_folder=output_folder, state="bm", **extraction_options
+            )
+        elapsed = time.perf_counter() - started
+    finally:
+        for server in servers:
+            server.stop()
+        set_request_delay_scale(1.0)
+
+    extracted = list(data_root.rglob("*_extracted.txt"))
+    summaries = sorted(output_folder.rglob("document_metrics_summary_*.json"))
+    document_summary = {}
+    if summaries:
+        with open(summaries[-1], "r", encoding="utf-8") as f:
+            document_summary = json.load(f).get("by_media_type", {})
+    served = {
+        key: sum(server.stats[key] for server in servers)
+        for key in ("requests", "documents", "bytes", "throttled", "not_found")
+    }
+    return {
+        "bills": bills,
+        "documents": len(corpus),
+        "documents_extracted": len(extracted),
+        "bills_failed": stats["errors"],
+        "seconds": round(elapsed, 3),
+        "documents_per_second": round(len(extracted) / elapsed, 3) if elapsed else 0.0,
+        "bytes_per_second": round(served["bytes"] / elapsed, 1) if elapsed else 0.0,
+        "text_bytes": sum(path.stat().st_size for path in extracted),
+        "requests": served,
+        # Requests beyond one per document: 429s and retried downloads
+        "extra_requests": max(served["requests"] - len(corpus), 0),
+        "connections": client.metrics.to_report()["totals"],
+        # Per-document download/parse percentiles from the run itself
+        "by_media_type": document_summary,
+        "hosts": [
+            {"url": server.base_url, **vars(server.profile), **server.stats}
+            for server in servers
+        ],
+    }
@@ -0,0 +1,190 @@
+"""
+Checkpoints - save extraction progress at safe points during a long run.
+
+The orchestrator calls Checkpointer.maybe_checkpoint() between bills, when no
+output file is half-written. A checkpoint:
+
+1. Flushes pipeline state (manifest, failure ledger, engine stats) to .windycivi/
+2. Writes the list of paths changed since the last successful checkpoint,
+   relative to the repo root, one per line (written atomically)
+3. Optionally runs a commit callback or shell command that commits exactly
+   those paths; if it fails, the paths stay pending for the next checkpoint
+
+Output writers report what they write or remove with record_written_path().
+"""
+
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Set
+
+# Absolute paths written since the last successful checkpoint
+written_paths: Set[str] = set()
+
+
+def record_written_path(path: Path) -> None:
+    """Note a file written or removed by the extraction run."""
+    written_paths.add(str(Path(path).resolve()))
+
+
+def reset_written_paths() -> None:
+    written_paths.clear()
+
+
+class Checkpointer:
+    """
+    Periodic checkpoints with an optional commit step.
+
+    Args:
+        repo_root: Root of the calling repo (changed paths are relative to it)
+        interval: Seconds between checkpoints (None only checkpoints on demand)
+        flush: Saves pipeline state and returns the paths it wrote
+        commit_callback: Called with the changed paths; returns True on success
+        commit_command: Shell command run in repo_root instead of a callback;
+            gets CHECKPOINT_PATHS_FILE and CHECKPOINT_REASON in its environment
+        paths_file: Where to write the changed-paths list (temp dir by default)
+    """
+
+    def __init__(
+        self,
+        repo_root: Path,
+        interval: Optional[float] = None,
+        flush: Optional[Callable[[], List[Path]]] = None,
+        commit_callback: Optional[Callable[[List[str]], bool]] = None,
+        commit_command: Optional[str] = None,
+        paths_file: Optional[Path] = None,
+    ):
+        self.repo_root = repo_root.resolve()
+        self.interval = interval
+        self.flush = flush
+        self.commit_callback = commit_callback
+        self.commit_command = commit_command
+        self.paths_file = paths_file or (
+            Path(tempfile.gettempdir()) / "text_extraction_checkpoint_paths.txt"
+        )
+        self.last_checkpoint = time.monotonic()
+        self.checkpoints = 0
+        self.failures = 0
+
+    def due(self) -> bool:
+        return bool(self.interval) and (
+            time.monotonic() - self.last_checkpoint >= self.interval
+        )
+
+    def maybe_checkpoint(self) -> None:
+        """Checkpoint if the interval has passed. Call only at safe points."""
+        if self.due():
+            self.checkpoint("interval")
+
+    def changed_paths(self, extra: List[Path]) -> List[str]:
+        """
+        Pending paths relative to the repo root.
+
+        Removed paths are kept if git tracks them, so staging them commits the
+        removal; the rest (e.g. a temp file written and removed again) are dropped.
+        """
+        paths = set(written_paths)
+        paths.update(str(Path(p).resolve()) for p in extra)
+
+        relative = set()
+        removed = []
+        for path in paths:
+            try:
+                relative_path = Path(path).relative_to(self.repo_root).as_posix()
+            except ValueError:
+                continue  # Outside the repo (e.g. a separate output folder)
+            if os.path.exists(path):
+                relative.add(relative_path)
+            else:
+                removed.append(relative_path)
+        relative.update(self.tracked_paths(removed))
+        return sorted(relative)
+
+    def tracked_paths(self, paths: List[str]) -> List[str]:
+        """The given repo-relative paths that git tracks."""
+        tracked = []
+        # Batched to stay under the command line length limit
+        for start in range(0, len(paths), 500):
+            try:
+                result = subprocess.run(
+                    ["git", "--literal-pathspecs", "ls-files", "-z", "--"]
+                    + paths[start : start + 500],
+                    cwd=self.repo_root,
+                    capture_output=True,
+                    text=True,
+                )
+            except OSError:
+                return []
+            if result.returncode != 0:
+                return []  # Not a git repo: nothing to stage
+            tracked.extend(path for path in result.stdout.split("\0") if path)
+        return tracked
+
+    def write_paths_file(self, paths: List[str]) -> None:
+        tmp_path = self.paths_file.with_name(self.paths_file.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for path in paths:
+                f.write(path + "\n")
+        os.replace(tmp_path, self.paths_file)
+
+    def run_commit(self, paths: List[str], reason: str) -> bool:
+        if self.commit_callback is not None:
+            return bool(self.commit_callback(paths))
+
+        env = dict(
+            os.environ,
+            CHECKPOINT_PATHS_FILE=str(self.paths_file),
+            CHECKPOINT_REASON=reason,
+        )
+        result = subprocess.run(
+            self.commit_command, shell=True, cwd=self.repo_root, env=env
+        )
+        return result.returncode == 0
+
+    def checkpoint(self, reason: str = "manual") -> bool:
+        """
+        Flush state, write the changed-paths list and run the commit step.
+
+        Returns:
+            True if the checkpoint (including any commit) succeeded
+        """
+        self.last_checkpoint = time.monotonic()
+        print(f"💾 Checkpoint ({reason})...")
+
+        try:
+            flushed = self.flush() if self.flush else []
+            paths = self.changed_paths(flushed)
+            self.write_paths_file(paths)
+        except Exception as e:
+            print(f"❌ Checkpoint failed while saving state: {e}")
+            self.failures += 1
+            return False
+
+        if not paths:
+            print("   No changes since the last checkpoint")
+            return True
+
+        if self.commit_callback is None and not self.commit_command:
+            print(f"   📝 {len(paths)} changed paths listed in {self.paths_file}")
+            reset_written_paths()
+            self.checkpoints += 1
+            return True
+
+        try:
+            committed = self.run_commit(paths, reason)
+        except Exception as e:
+            print(f"   ❌ Checkpoint commit failed: {e}")
+            committed = False
+
+        if not committed:
+            # Keep the paths pending so the next checkpoint includes them
+            print("   ⚠️ Checkpoint commit failed - changes stay pending")
+            self.failures += 1
+            return False
+
+        print(f"   ✅ Checkpoint committed {len(paths)} paths")
+        reset_written_paths()
+        self.checkpoints += 1
+        return True
@@ -0,0 +1,179 @@
+"""
+Run-wide URL coalescing - download and parse each document once per run.
+
+Companion bills, republished versions and repeated link entries often point
+at the same document. Before extraction starts, the run counts how many
+times each document URL will be visited. The first visit downloads and
+parses the document as usual; if more visits are due, the result (original
+document plus parse result) is kept until the last visit has used it. Later
+bills then write their files from the kept result instead of fetching and
+parsing again.
+
+Only URLs referenced more than once are kept, and each is dropped after its
+last visit, so memory and temp disk use stay bounded by the documents that
+are actually shared.
+"""
+
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+@dataclass
+class CoalescedDocument:
+    """A downloaded and parsed document, kept for the later visits to its URL."""
+
+    media_kind: str
+    bill_id: str
+    size: Optional[int] = None
+    parser: Optional[str] = None
+    # Downloaded XML/HTML, or the text extracted from a PDF
+    content: Optional[str] = None
+    # Copy of the downloaded PDF (None for XML/HTML)
+    pdf_path: Optional[Path] = None
+    # Parse result: extracted_data for in-memory parses, streamed for
+    # page-streamed PDFs (its part files are copies kept by the coalescer)
+    extracted_data: Optional[Dict] = None
+    streamed: Optional[Dict] = None
+    strikethrough_info: Optional[Dict] = None
+
+
+class DocumentCoalescer:
+    """Single-flight map from document URL to its download and parse result."""
+
+    def __init__(self):
+        # (url, media kind) -> visits not yet made
+        self.pending: Dict[tuple, int] = {}
+        self.documents: Dict[tuple, CoalescedDocument] = {}
+        self.duplicates_avoided = 0
+        self.bytes_avoided = 0
+        self._work_dir: Optional[Path] = None
+        self._stored = 0
+        # Results handed out for their last visit; their files go on the next claim
+        self._finished: List[CoalescedDocument] = []
+
+    @staticmethod
+    def key(url: str, media_kind: str) -> tuple:
+        return url, media_kind
+
+    def add_references(self, references: Iterable[tuple]) -> None:
+        """Count the (url, media kind) pairs a bill will visit."""
+        for url, media_kind in references:
+            key = self.key(url, media_kind)
+            self.pending[key] = self.pending.get(key, 0) + 1
+
+    @property
+    def shared_urls(self) -> int:
+        """URLs referenced more than once in this run."""
+        return sum(1 for visits in self.pending.values() if visits > 1)
+
+    def claim(self, url: str, media_kind: str) -> Optional[CoalescedDocument]:
+        """
+        Start one visit to a URL.
+
+        Returns:
+            The kept result if an earlier visit fetched the document, else None.
+            After the last visit the result is dropped from the map.
+        """
+        for finished in self._finished:
+            self._discard_files(finished)
+        self._finished.clear()
+
+        key = self.key(url, media_kind)
+        remaining = self.pending.get(key, 0) - 1
+        if remaining > 0:
+            self.pending[key] = remaining
+            return self.documents.get(key)
+
+        self.pending.pop(key, None)
+        document = self.documents.pop(key, None)
+        if document is not None:
+            self._finished.append(document)
+        return document
+
+    def wanted(self, url: str, media_kind: str) -> bool:
+        """True if later visits to this URL are still due."""
+        return self.pending.get(self.key(url, media_kind), 0) > 0
+
+    def record_reuse(self, document: CoalescedDocument) -> None:
+        """Count a visit served from a kept result."""
+        self.duplicates_avoided += 1
+        self.bytes_avoided += document.size or 0
+
+    def _new_dir(self) -> Path:
+        if self._work_dir is None:
+            self._work_dir = Path(tempfile.mkdtemp(prefix="bill_text_shared_"))
+        self._stored += 1
+        path = self._work_dir / str(self._stored)
+        path.mkdir()
+        return path
+
+    def store(
+        self,
+        url: str,
+        media_kind: str,
+        bill_id: str,
+        size: Optional[int] = None,
+        parser: Optional[str] = None,
+        content: Optional[str] = None,
+        pdf_path: Optional[Path] = None,
+        extracted_data: Optional[Dict] = None,
+        streamed: Optional[Dict] = None,
+        strikethrough_info: Optional[Dict] = None,
+    ) -> None:
+        """
+        Keep a fetched document for the later visits to its URL.
+
+        Does nothing if no later visit is due. Files (the downloaded PDF and
+        streamed part files) live in per-bill temp folders, so they are
+        copied into the coalescer's own temp folder.
+        """
+        if not self.wanted(url, media_kind):
+            return
+
+        if pdf_path is not None or streamed is not None:
+            keep_dir = self._new_dir()
+            if pdf_path is not None:
+                pdf_path = Path(shutil.copy2(pdf_path, keep_dir / "original.pdf"))
+            if streamed is not None:
+                streamed = dict(streamed)
+                for part in ("raw_path", "sections_path"):
+                    streamed[part] = str(
+                        shutil.copy2(streamed[part], keep_dir / Path(streamed[part]).name)
+                    )
+
+        self.documents[self.key(url, media_kind)] = CoalescedDocument(
+            media_kind=media_kind,
+            bill_id=bill_id,
+            size=size,
+            parser=parser,
+            content=content,
+            pdf_path=pdf_path,
+            extracted_data=extracted_data,
+            streamed=streamed,
+            strikethrough_info=strikethrough_info,
+        )
+
+    def _discard_files(self, document: CoalescedDocument) -> None:
+        paths = [document.pdf_path] if document.pdf_path else []
+        if document.streamed:
+            paths += [Path(document.streamed["raw_path"]), Path(document.streamed["sections_path"])]
+        for path in paths:
+            Path(path).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Drop every kept result and remove the temp folder."""
+        self.documents.clear()
+        self.pending.clear()
+        self._finished.clear()
+        if self._work_dir is not None:
+            shutil.rmtree(self._work_dir, ignore_errors=True)
+            self._work_dir = None
+
+    def to_report(self) -> Dict:
+        return {
+            "duplicates_avoided": self.duplicates_avoided,
+            "bytes_avoided": self.bytes_avoided,
+        }
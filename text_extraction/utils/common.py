@@ -5,39 +5,61 @@ This module provides basic download, retry, and error tracking functionality
 without aggressive anti-blocking techniques.
 """
 
-import requests
 import time
 import random
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
 import json
-from datetime import datetime
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import urllib3
-
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-# Create a single session with retry strategy
-session = requests.Session()
-retry_strategy = Retry(
-    total=3,
-    backoff_factor=1,
-    status_forcelist=[429, 500, 502, 503, 504],
-)
-adapter = HTTPAdapter(max_retries=retry_strategy)
-session.mount("http://", adapter)
-session.mount("https://", adapter)
+from datetime import datetime, timedelta, timezone
+
+if TYPE_CHECKING:
+    import requests
+
+    from .http_client import HttpClient
+
+# Shared HTTP client (connection pools, headers, metrics), created on first use.
+# requests and urllib3 are only imported then, which keeps startup fast.
+http_client: Optional["HttpClient"] = None
+
+# Multiplier for the pause before each request (1 keeps the production pacing;
+# the benchmark harness can set 0 to measure the pipeline itself)
+request_delay_scale = 1.0
 
 # Global error tracking
 failed_bills_tracker = {
     "failed_downloads": [],
     "failed_parsing": [],
     "failed_saves": [],
+    "failed_parse_limits": [],
     "total_failed": 0,
 }
 
+# Per-run error log: every failure is appended as one NDJSON line to a single
+# file (opened on the first failure). "files" mode writes one JSON file per
+# failure instead, as earlier versions did.
+ERROR_LOG_MODES = ("ndjson", "files")
+error_log = {"mode": "ndjson", "label": "unknown", "path": None, "file": None}
+
+# Failure ledger: URLs whose download or parse failed (or whose parse hit
+# the timeout or memory ceiling), with when they may be tried again. Loaded
+# from .windycivi/ at the start of a run; URLs still in backoff are skipped,
+# and the wait doubles with every failed attempt.
+failed_urls: Dict[str, Dict] = {}
+# URLs added to or cleared from the ledger by this run
+failed_urls_changed: Set[str] = set()
+# URLs skipped by this run because they were still in backoff
+backoff_skips: List[str] = []
+
+# Wait after the first failure, by error type (doubles per attempt). Parse
+# limits get a long wait: a slow runner can cause one, but most are documents
+# that will hit the limit again.
+BACKOFF_BASE_SECONDS = {
+    "download": 12 * 3600,
+    "parsing": 24 * 3600,
+    "parse_limit": 7 * 24 * 3600,
+}
+BACKOFF_MAX_SECONDS = 30 * 24 * 3600
+
 
 def get_realistic_headers() -> dict:
     """Get realistic browser headers."""
@@ -56,6 +78,91 @@ def get_realistic_headers() -> dict:
     }
 
 
+def get_http_client() -> "HttpClient":
+    """Get the shared HTTP client, creating it with default settings if needed."""
+    global http_client
+    if http_client is None:
+        from .http_client import HttpClient
+
+        http_client = HttpClient(headers=get_realistic_headers())
+    return http_client
+
+
+def set_http_client(client: "HttpClient") -> Optional["HttpClient"]:
+    """
+    Replace the shared HTTP client (e.g. with one pointed at a stub server).
+
+    Returns:
+        The previous client, if any
+    """
+    global http_client
+    previous, http_client = http_client, client
+    return previous
+
+
+def configure_http_client(
+    pool_maxsize: Optional[int] = None,
+    host_pool_sizes: Optional[Dict[str, int]] = None,
+) -> "HttpClient":
+    """
+    Create the shared HTTP client with the given pool sizes.
+
+    Args:
+        pool_maxsize: Connections kept alive per host (None for the default)
+        host_pool_sizes: Host -> pool size for hosts that need their own size
+
+    Returns:
+        The new client
+    """
+    from .http_client import DEFAULT_POOL_MAXSIZE, HttpClient
+
+    client = HttpClient(
+        pool_maxsize=pool_maxsize or DEFAULT_POOL_MAXSIZE,
+        host_pool_sizes=host_pool_sizes,
+        headers=get_realistic_headers(),
+    )
+    previous = set_http_client(client)
+    if previous is not None:
+        previous.close()
+    return client
+
+
+def set_request_delay_scale(scale: float) -> None:
+    """Scale the pause before each request (0 disables it)."""
+    global request_delay_scale
+    request_delay_scale = max(scale, 0.0)
+
+
+def save_http_metrics_report(output_folder: Path, label: str) -> None:
+    """Save the shared client's connection metrics for this run."""
+    if http_client is None or not http_client.metrics.hosts:
+        return
+
+    summary_reports = (
+        output_folder / "data_not_processed" / "text_extraction_errors" / "summary_reports"
+    )
+    summary_reports.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file = summary_reports / f"http_connections_{label}_{timestamp}.json"
+
+    try:
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "label": label,
+                    "timestamp": datetime.now().isoformat(),
+                    "pool_maxsize": http_client.pool_maxsize,
+                    "host_pool_sizes": http_client.host_pool_sizes,
+                    **http_client.metrics.to_report(),
+                },
+                f,
+                indent=2,
+            )
+        print(f"🔌 HTTP connection report saved: {report_file}")
+    except Exception as e:
+        print(f"❌ Error saving HTTP connection report: {e}")
+
+
 def record_failed_bill(
     bill_id: str,
     error_type: str,
@@ -85,12 +192,111 @@ def record_failed_bill(
         failed_bills_tracker["failed_parsing"].append(error_record)
     elif error_type == "save":
         failed_bills_tracker["failed_saves"].append(error_record)
+    elif error_type == "parse_limit":
+        failed_bills_tracker["failed_parse_limits"].append(error_record)
+
+    if url and error_type in BACKOFF_BASE_SECONDS:
+        record_url_failure(url, error_type, error_message, bill_id)
 
     failed_bills_tracker["total_failed"] += 1
 
-    # Save individual error file to data_not_processed if output folder provided
+    # Log the failure under data_not_processed if output folder provided
     if output_folder:
-        save_individual_error_file(error_record, output_folder)
+        if error_log["mode"] == "files":
+            save_individual_error_file(error_record, output_folder)
+        else:
+            append_error_log(error_record, output_folder)
+
+
+def configure_error_log(label: str, mode: str = "ndjson"):
+    """
+    Set up error logging for a run.
+
+    Args:
+        label: Log file label (state, plus the shard for sharded runs)
+        mode: "ndjson" for one append-only log per run, "files" for one
+            JSON file per failure
+    """
+    if mode not in ERROR_LOG_MODES:
+        raise ValueError(f"Unknown error log mode '{mode}' (expected one of {ERROR_LOG_MODES})")
+    close_error_log()
+    error_log.update(mode=mode, label=label, path=None)
+
+
+def append_error_log(error_record: Dict, output_folder: Path):
+    """Append one failure to this run's NDJSON error log."""
+    try:
+        if error_log["file"] is None:
+            log_folder = output_folder / "data_not_processed" / "text_extraction_errors" / "error_logs"
+            log_folder.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            error_log["path"] = log_folder / f"errors_{error_log['label']}_{timestamp}.ndjson"
+            error_log["file"] = open(error_log["path"], "a", encoding="utf-8")
+            print(f"   📋 Logging errors to: {error_log['path']}")
+
+        error_log["file"].write(json.dumps(error_record, ensure_ascii=False) + "\n")
+        # Flushed per line so a killed run keeps everything logged so far
+        error_log["file"].flush()
+
+    except Exception as e:
+        print(f"   ❌ Error writing to error log: {e}")
+
+
+def close_error_log():
+    """Close this run's error log (the path is kept for the summary)."""
+    if error_log["file"] is not None:
+        error_log["file"].close()
+        error_log["file"] = None
+
+
+def read_error_log(log_path: Path) -> Dict[str, List[Dict]]:
+    """
+    Read an NDJSON error log back into failures by category.
+
+    Returns:
+        Dictionary mapping report category (e.g. failed_downloads) to records
+    """
+    categories = {
+        "download": "failed_downloads",
+        "parsing": "failed_parsing",
+        "save": "failed_saves",
+        "parse_limit": "failed_parse_limits",
+    }
+    failures = {category: [] for category in categories.values()}
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partial last line from a killed run
+            category = categories.get(record.get("error_type"))
+            if category:
+                failures[category].append(record)
+    return failures
+
+
+def get_failed_bills() -> Dict[str, List[Dict]]:
+    """
+    This run's failures by report category (e.g. failed_downloads).
+
+    Read back from the run's error log when there is one (it is flushed per
+    line), otherwise taken from the in-memory tracker.
+    """
+    failures = {
+        "failed_downloads": failed_bills_tracker["failed_downloads"],
+        "failed_parsing": failed_bills_tracker["failed_parsing"],
+        "failed_saves": failed_bills_tracker["failed_saves"],
+        "failed_parse_limits": failed_bills_tracker["failed_parse_limits"],
+    }
+    if error_log["path"] is not None:
+        try:
+            failures = read_error_log(error_log["path"])
+        except Exception as e:
+            print(f"⚠️ Could not read error log {error_log['path']}, using in-memory errors: {e}")
+    return failures
 
 
 def save_individual_error_file(error_record: Dict, output_folder: Path):
@@ -117,38 +323,61 @@ def save_individual_error_file(error_record: Dict, output_folder: Path):
         print(f"   ❌ Error saving individual error file: {e}")
 
 
-def save_failed_bills_report(output_folder: Path, state: str):
-    """Save a comprehensive report of failed bills."""
-    global failed_bills_tracker
+def save_failed_bills_report(output_folder: Path, state: str, shard: str = None):
+    """
+    Save a comprehensive report of failed bills.
 
-    if failed_bills_tracker["total_failed"] == 0:
-        print("✅ No failed bills to report")
-        return
+    Args:
+        output_folder: Calling repo root (reports go under data_not_processed/)
+        state: State identifier
+        shard: Shard label (e.g. "shard-0-of-4"); shard reports are written
+            without a timestamp. The failures also go into the shard's
+            fragment, which is what merge_failed_bills_reports combines in CI
+    """
+    global failed_bills_tracker
 
     # Create data_not_processed folder structure
     data_not_processed = output_folder / "data_not_processed"
     text_extraction_errors = data_not_processed / "text_extraction_errors"
     summary_reports = text_extraction_errors / "summary_reports"
+
+    if failed_bills_tracker["total_failed"] == 0:
+        if shard:
+            # Don't let an earlier run's report for this shard be merged
+            (summary_reports / f"failed_text_extraction_{state}_{shard}.json").unlink(
+                missing_ok=True
+            )
+        print("✅ No failed bills to report")
+        return
+
     summary_reports.mkdir(parents=True, exist_ok=True)
 
     # Generate timestamp for the report
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+    # Build the report from the run's error log when there is one
+    close_error_log()
+    failures = get_failed_bills()
+
     # Save detailed error report
-    report_file = summary_reports / f"failed_text_extraction_{state}_{timestamp}.json"
+    if shard:
+        report_file = summary_reports / f"failed_text_extraction_{state}_{shard}.json"
+    else:
+        report_file = summary_reports / f"failed_text_extraction_{state}_{timestamp}.json"
 
     report_data = {
         "state": state,
         "timestamp": datetime.now().isoformat(),
+        "error_log": (
+            error_log["path"].relative_to(output_folder).as_posix()
+            if error_log["path"] is not None
+            else None
+        ),
         "summary": {
-            "total_failed": failed_bills_tracker["total_failed"],
-            "failed_downloads": len(failed_bills_tracker["failed_downloads"]),
-            "failed_parsing": len(failed_bills_tracker["failed_parsing"]),
-            "failed_saves": len(failed_bills_tracker["failed_saves"]),
+            "total_failed": sum(len(records) for records in failures.values()),
+            **{category: len(records) for category, records in failures.items()},
         },
-        "failed_downloads": failed_bills_tracker["failed_downloads"],
-        "failed_parsing": failed_bills_tracker["failed_parsing"],
-        "failed_saves": failed_bills_tracker["failed_saves"],
+        **failures,
     }
 
     try:
@@ -156,48 +385,233 @@ def save_failed_bills_report(output_folder: Path, state: str):
             json.dump(report_data, f, indent=2, ensure_ascii=False)
 
         print(f"📋 Failed bills report saved: {report_file}")
-        print(f"   Total failed: {failed_bills_tracker['total_failed']}")
-        print(f"   Download failures: {len(failed_bills_tracker['failed_downloads'])}")
-        print(f"   Parsing failures: {len(failed_bills_tracker['failed_parsing'])}")
-        print(f"   Save failures: {len(failed_bills_tracker['failed_saves'])}")
+        print(f"   Total failed: {report_data['summary']['total_failed']}")
+        print(f"   Download failures: {len(failures['failed_downloads'])}")
+        print(f"   Parsing failures: {len(failures['failed_parsing'])}")
+        print(f"   Save failures: {len(failures['failed_saves'])}")
+        print(f"   Parse limit failures: {len(failures['failed_parse_limits'])}")
 
     except Exception as e:
         print(f"❌ Error saving failed bills report: {e}")
 
 
+def merge_failed_bills_reports(
+    output_folder: Path,
+    state: str,
+    shard_failures: Optional[Dict[str, Dict[str, List[Dict]]]] = None,
+) -> Optional[Path]:
+    """
+    Combine the per-shard failures into one timestamped report.
+
+    Args:
+        output_folder: Calling repo root (reports go under data_not_processed/)
+        state: State identifier
+        shard_failures: Shard label -> failures by category, as carried in
+            the shard fragments. Shard reports on disk (from shards that ran
+            on this machine) are used for shards not listed here.
+
+    The shard reports on disk are deleted once the combined report is written.
+
+    Returns:
+        Path of the combined report, or None if no shard had failures
+    """
+    summary_reports = (
+        output_folder / "data_not_processed" / "text_extraction_errors" / "summary_reports"
+    )
+    shard_reports = sorted(
+        summary_reports.glob(f"failed_text_extraction_{state}_shard-*.json")
+    )
+
+    categories = ["failed_downloads", "failed_parsing", "failed_saves", "failed_parse_limits"]
+    combined = {category: [] for category in categories}
+    shards = []
+    for shard, failures in sorted((shard_failures or {}).items()):
+        if not any(failures.get(category) for category in categories):
+            continue
+        shards.append(shard)
+        for category in categories:
+            combined[category].extend(failures.get(category, []))
+    for shard_report in shard_reports:
+        shard = shard_report.stem[len(f"failed_text_extraction_{state}_") :]
+        if shard in (shard_failures or {}):
+            continue
+        try:
+            with open(shard_report, "r", encoding="utf-8") as f:
+                report = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read shard report {shard_report}: {e}")
+            continue
+        shards.append(shard)
+        for category in categories:
+            combined[category].extend(report.get(category, []))
+
+    if not shards:
+        for shard_report in shard_reports:
+            shard_report.unlink(missing_ok=True)
+        print("✅ No failed bills to report")
+        return None
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file = summary_reports / f"failed_text_extraction_{state}_{timestamp}.json"
+    report_data = {
+        "state": state,
+        "timestamp": datetime.now().isoformat(),
+        "shards": shards,
+        "summary": {
+            "total_failed": sum(len(combined[c]) for c in categories),
+            **{category: len(combined[category]) for category in categories},
+        },
+        **combined,
+    }
+
+    try:
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        for shard_report in shard_reports:
+            shard_report.unlink(missing_ok=True)
+        print(f"📋 Merged {len(shards)} shard reports: {report_file}")
+        print(f"   Total failed: {report_data['summary']['total_failed']}")
+        return report_file
+    except Exception as e:
+        print(f"❌ Error saving merged failed bills report: {e}")
+        return None
+
+
 def reset_error_tracking():
     """Reset the global error tracking for a new run."""
     global failed_bills_tracker
+    close_error_log()
+    error_log["path"] = None
     failed_bills_tracker = {
         "failed_downloads": [],
         "failed_parsing": [],
         "failed_saves": [],
+        "failed_parse_limits": [],
         "total_failed": 0,
     }
 
 
+def get_total_failed() -> int:
+    """Number of failures recorded so far in this run."""
+    return failed_bills_tracker["total_failed"]
+
+
+def get_failure_ledger_path(repo_root: Path) -> Path:
+    """Get the path to the failed URL ledger in the calling repo."""
+    return repo_root / ".windycivi" / "text_extraction_failures.json"
+
+
+def load_failure_ledger(repo_root: Path) -> Dict[str, Dict]:
+    """
+    Load URLs that failed in previous runs.
+
+    Returns:
+        Dictionary mapping URL to failure details (empty if none)
+    """
+    failed_urls.clear()
+    failed_urls_changed.clear()
+    backoff_skips.clear()
+
+    ledger_path = get_failure_ledger_path(repo_root)
+    try:
+        with open(ledger_path, "r", encoding="utf-8") as f:
+            failed_urls.update(json.load(f))
+        waiting = sum(1 for url in failed_urls if get_url_backoff(url))
+        print(f"⏳ Loaded {len(failed_urls)} failed document URLs ({waiting} in backoff)")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️ Could not read failure ledger {ledger_path}: {e}")
+
+    return failed_urls
+
+
+def save_failure_ledger(repo_root: Path):
+    """Persist the failure ledger so the next run skips URLs in backoff."""
+    if not failed_urls_changed:
+        return
+
+    ledger_path = get_failure_ledger_path(repo_root)
+    try:
+        ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(ledger_path, "w", encoding="utf-8") as f:
+            json.dump(failed_urls, f, indent=2, sort_keys=True)
+        print(f"⏳ Saved {len(failed_urls)} failed URLs: {ledger_path}")
+    except Exception as e:
+        print(f"❌ Error saving failure ledger: {e}")
+
+
+def get_backoff_seconds(error_type: str, attempts: int) -> float:
+    """Wait before the next attempt after `attempts` consecutive failures."""
+    base = BACKOFF_BASE_SECONDS.get(error_type, BACKOFF_BASE_SECONDS["download"])
+    return min(base * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+
+
+def record_url_failure(url: str, error_type: str, error_message: str, bill_id: str = ""):
+    """Add a failed attempt to the ledger and push back its next attempt."""
+    now = datetime.now(timezone.utc)
+    entry = failed_urls.get(url, {})
+    attempts = entry.get("attempts", 0) + 1
+    failed_urls[url] = {
+        "bill_id": bill_id or entry.get("bill_id", ""),
+        "error_type": error_type,
+        "error_message": error_message,
+        "attempts": attempts,
+        "first_failed": entry.get("first_failed", now.isoformat()),
+        "last_failed": now.isoformat(),
+        "next_attempt": (
+            now + timedelta(seconds=get_backoff_seconds(error_type, attempts))
+        ).isoformat(),
+    }
+    failed_urls_changed.add(url)
+
+
+def clear_url_failure(url: str):
+    """Forget a URL's failures once it has been extracted."""
+    if failed_urls.pop(url, None) is not None:
+        failed_urls_changed.add(url)
+
+
+def get_url_backoff(url: str) -> Optional[Dict]:
+    """
+    Check if a URL is still waiting out its backoff.
+
+    Returns:
+        The ledger entry if the URL should not be tried yet, None otherwise
+    """
+    entry = failed_urls.get(url)
+    if not entry:
+        return None
+    try:
+        next_attempt = datetime.fromisoformat(entry["next_attempt"])
+    except (KeyError, ValueError):
+        return None
+    return entry if datetime.now(timezone.utc) < next_attempt else None
+
+
+def record_backoff_skip(url: str):
+    """Note a URL skipped because it is in backoff."""
+    backoff_skips.append(url)
+
+
 def download_with_retry(
     url: str,
     max_retries: int = 3,
     delay: float = 1.0,
     use_aggressive_mode: bool = False,
-) -> Optional[requests.Response]:
+) -> Optional["requests.Response"]:
     """Download with basic retry logic and exponential backoff."""
+    import requests
 
     for attempt in range(max_retries):
         try:
             # Add a small random delay to be respectful
-            time.sleep(delay + random.uniform(0.5, 1.5))
-
-            # Get headers
-            headers = get_realistic_headers()
+            time.sleep((delay + random.uniform(0.5, 1.5)) * request_delay_scale)
 
-            # Make the request
-            response = session.get(
+            # Make the request (the client sends its headers)
+            response = get_http_client().get(
                 url,
-                headers=headers,
                 timeout=30,
-                verify=False,
                 allow_redirects=True,
             )
 
@@ -218,6 +632,88 @@ def download_with_retry(
     return None
 
 
+# Largest document download_to_file will store (bytes)
+DEFAULT_MAX_DOWNLOAD_BYTES = 100 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def download_to_file(
+    url: str,
+    destination: Path,
+    max_bytes: Optional[int] = DEFAULT_MAX_DOWNLOAD_BYTES,
+    max_retries: int = 3,
+    delay: float = 1.0,
+) -> Optional[int]:
+    """
+    Download a document straight to a file, without holding it in memory.
+
+    The response is streamed to disk in chunks. Documents over max_bytes
+    (by Content-Length, or once that many bytes have arrived) are abandoned
+    without retrying, and the partial file is removed.
+
+    Args:
+        url: Document URL
+        destination: File to write (overwritten)
+        max_bytes: Size cap in bytes (None for no cap)
+        max_retries: Attempts for network errors and error statuses
+        delay: Base delay between attempts in seconds
+
+    Returns:
+        Number of bytes written, or None if the download failed
+    """
+    import requests
+
+    for attempt in range(max_retries):
+        try:
+            # Add a small random delay to be respectful
+            time.sleep((delay + random.uniform(0.5, 1.5)) * request_delay_scale)
+
+            with get_http_client().get(
+                url,
+                timeout=30,
+                allow_redirects=True,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+
+                declared = response.headers.get("Content-Length", "")
+                if max_bytes and declared.isdigit() and int(declared) > max_bytes:
+                    print(
+                        f"   ❌ Document is {int(declared) / 1_000_000:.1f} MB, over the "
+                        f"{max_bytes / 1_000_000:.0f} MB download cap: {url}"
+                    )
+                    return None
+
+                size = 0
+                with open(destination, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if max_bytes and size > max_bytes:
+                            break
+                        f.write(chunk)
+
+            if max_bytes and size > max_bytes:
+                Path(destination).unlink(missing_ok=True)
+                print(
+                    f"   ❌ Document passed the {max_bytes / 1_000_000:.0f} MB download cap: {url}"
+                )
+                return None
+            return size
+
+        except requests.exceptions.RequestException as e:
+            print(f"   ⚠️ Attempt {attempt + 1} failed: {e}")
+            if attempt < max_retries - 1:
+                # Exponential backoff with jitter
+                wait_time = delay * (2**attempt) + random.uniform(1, 3)
+                print(f"   ⏳ Waiting {wait_time:.1f}s before retry...")
+                time.sleep(wait_time)
+            else:
+                print(f"   ❌ All {max_retries} attempts failed for {url}")
+
+    Path(destination).unlink(missing_ok=True)
+    return None
+
+
 def download_bill_text(url: str, delay: float = 1.0) -> Optional[str]:
     """
     Download bill text from a URL.
@@ -255,8 +751,8 @@ def download_bill_text(url: str, delay: float = 1.0) -> Optional[str]:
 
 # Compatibility functions for congress.gov (kept for backward compatibility but simplified)
 def rotate_session():
-    """Return the session (kept for compatibility)."""
-    return session
+    """Return the calling thread's session of the shared client (kept for compatibility)."""
+    return get_http_client().session
 
 
 def get_congress_gov_headers() -> dict:
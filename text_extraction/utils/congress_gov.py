@@ -0,0 +1,167 @@
+"""
+Downloads from congress.gov, which blocks plain requests.
+
+download_congress_gov_content() tries a chain of strategies - the /text
+endpoint of amendments, aggressive retries, session warming and curl-like
+headers - starting with the one that last worked for the same host and URL
+pattern in this run (see download_strategies).
+"""
+
+import random
+import time
+from typing import Optional
+
+from .common import (
+    download_with_retry,
+    fetch_working_proxies,
+    get_congress_gov_headers,
+    rotate_session,
+)
+from .download_strategies import get_strategy_memory
+
+
+def get_congress_gov_text_url(url: str) -> Optional[str]:
+    """The /text endpoint of an amendment URL (None for other URLs)."""
+    if "/amendment/" in url and not url.endswith("/text"):
+        return url + "/text"
+    return None
+
+
+def congress_gov_text_endpoint(url: str) -> Optional[str]:
+    """Strategy: the /text endpoint of an amendment, with aggressive retries."""
+    text_url = get_congress_gov_text_url(url)
+    print(f"   🔄 Trying /text endpoint: {text_url}")
+    response = download_with_retry(
+        text_url, max_retries=5, delay=2.0, use_aggressive_mode=True
+    )
+    return response.text if response else None
+
+
+def congress_gov_aggressive_retry(url: str) -> Optional[str]:
+    """Strategy: the original URL with aggressive retries."""
+    response = download_with_retry(
+        url, max_retries=5, delay=2.0, use_aggressive_mode=True
+    )
+    return response.text if response else None
+
+
+def congress_gov_session_warming(url: str) -> Optional[str]:
+    """Strategy: visit the congress.gov home page first, then the document."""
+    print(f"   🔄 Trying session warming approach for {url}")
+
+    # Warm up the session by visiting the main page first
+    session = rotate_session()
+    warmup_headers = get_congress_gov_headers()
+
+    try:
+        # Visit main page to establish session
+        session.get(
+            "https://www.congress.gov/",
+            headers=warmup_headers,
+            timeout=30,
+            verify=False,
+        )
+        time.sleep(random.uniform(2, 4))
+
+        # For amendment URLs, try /text endpoint first
+        target_url = get_congress_gov_text_url(url) or url
+        if target_url != url:
+            print(f"   🔄 Session warming: trying /text endpoint: {target_url}")
+
+        # Now try the target URL
+        response = session.get(
+            target_url, headers=warmup_headers, timeout=45, verify=False
+        )
+        if response.status_code == 200:
+            return response.text
+
+        # If /text failed, try original URL
+        if target_url != url:
+            print(f"   🔄 Session warming: trying original URL: {url}")
+            response = session.get(
+                url, headers=warmup_headers, timeout=45, verify=False
+            )
+            if response.status_code == 200:
+                return response.text
+    except:
+        pass
+    return None
+
+
+def congress_gov_curl_headers(url: str) -> Optional[str]:
+    """Strategy: plain curl-like headers."""
+    print(f"   🔄 Trying curl-like approach for {url}")
+    curl_headers = {
+        "User-Agent": "curl/7.68.0",
+        "Accept": "*/*",
+        "Connection": "keep-alive",
+    }
+
+    session = rotate_session()
+
+    # For amendment URLs, try /text endpoint first
+    target_url = get_congress_gov_text_url(url) or url
+    if target_url != url:
+        print(f"   🔄 Curl fallback: trying /text endpoint: {target_url}")
+
+    response = session.get(target_url, headers=curl_headers, timeout=45, verify=False)
+    if response.status_code == 200:
+        return response.text
+
+    # If /text failed, try original URL
+    if target_url != url:
+        print(f"   🔄 Curl fallback: trying original URL: {url}")
+        response = session.get(url, headers=curl_headers, timeout=45, verify=False)
+        if response.status_code == 200:
+            return response.text
+    return None
+
+
+# Fallback chain for congress.gov, in the order tried when nothing is known yet
+CONGRESS_GOV_STRATEGIES = {
+    "text_endpoint": congress_gov_text_endpoint,
+    "aggressive_retry": congress_gov_aggressive_retry,
+    "session_warming": congress_gov_session_warming,
+    "curl_headers": congress_gov_curl_headers,
+}
+
+
+def download_congress_gov_content(url: str) -> str:
+    """
+    Download content from congress.gov with specialized anti-blocking techniques.
+
+    The strategies in CONGRESS_GOV_STRATEGIES are tried in turn, starting
+    with the one that last worked for the same host and URL pattern in this
+    run; strategies that keep failing are skipped (see download_strategies).
+    """
+    # Fetch working proxies for aggressive mode
+    fetch_working_proxies()
+
+    memory = get_strategy_memory()
+    names = [
+        name
+        for name in CONGRESS_GOV_STRATEGIES
+        # The /text endpoint only exists for amendments
+        if name != "text_endpoint" or get_congress_gov_text_url(url)
+    ]
+    ordered = memory.order(url, names)
+    if len(ordered) < len(names):
+        skipped = ", ".join(name for name in names if name not in ordered)
+        print(f"   ⏭️ Skipping strategies that keep failing: {skipped}")
+
+    for position, name in enumerate(ordered):
+        if position and name == "aggressive_retry" and ordered[position - 1] == "text_endpoint":
+            print(f"   ⚠️ /text endpoint failed, trying original URL: {url}")
+        try:
+            content = CONGRESS_GOV_STRATEGIES[name](url)
+        except Exception as e:
+            print(f"   ⚠️ Strategy {name} failed: {e}")
+            content = None
+        memory.record(url, name, bool(content))
+        if content:
+            if position:
+                print(f"   🧭 {name} worked; trying it first for similar URLs")
+            return content
+
+    print(f"   ❌ Failed to download congress.gov content: {url}")
+    return None
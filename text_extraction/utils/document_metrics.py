@@ -0,0 +1,212 @@
+"""
+Per-document extraction metrics.
+
+Every document an extraction run attempts gets one record:
+
+    {"url": ..., "host": "www.ilga.gov", "media_type": "pdf", "bill_id": "HB 1",
+     "status": "ok", "download_seconds": 0.412, "bytes": 183204, "retries": 0,
+     "parser": "pdfplumber", "parse_seconds": 1.934, "pages": 12, "chars": 40211,
+     "reused": false}
+
+status is where the document got to: download_failed, parse_failed,
+parse_limit, save_failed or ok. retries counts the HTTP requests beyond the
+first (retried attempts and redirects). reused marks documents served from
+an earlier bill's fetch of the same URL in this run; they are counted but
+left out of the time and size percentiles.
+
+At the end of the run the records are written next to the failed bills
+report, as NDJSON (default) or CSV, with a summary of p50/p95/p99 download
+time, parse time and size per host and media type.
+"""
+
+import csv
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+METRICS_FORMATS = ("ndjson", "csv")
+
+# Record fields, in CSV column order
+FIELDS = [
+    "url",
+    "host",
+    "media_type",
+    "bill_id",
+    "status",
+    "download_seconds",
+    "bytes",
+    "retries",
+    "parser",
+    "parse_seconds",
+    "pages",
+    "chars",
+    "reused",
+]
+
+# Fields summarized with percentiles
+SUMMARY_FIELDS = ("download_seconds", "parse_seconds", "bytes")
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q from 0 to 100) of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(max(math.ceil(q / 100 * len(ordered)), 1), len(ordered))
+    return ordered[rank - 1]
+
+
+def media_kind(media_type: str) -> str:
+    """Short media type: xml, html, pdf or the type itself."""
+    media_type = media_type.lower()
+    for kind in ("xml", "html", "pdf"):
+        if kind in media_type:
+            return kind
+    return media_type or "unknown"
+
+
+def summarize_values(values: List[float]) -> Dict:
+    """Count, total, mean and p50/p95/p99/max of a list of values."""
+    summary = {"count": len(values), "total": round(sum(values), 3)}
+    summary["mean"] = round(summary["total"] / len(values), 3) if values else 0.0
+    for q in PERCENTILES:
+        summary[f"p{q}"] = round(percentile(values, q), 3)
+    summary["max"] = round(max(values), 3) if values else 0.0
+    return summary
+
+
+def summarize_documents(documents: List[Dict]) -> Dict:
+    """
+    Summarize document records per host and media type.
+
+    Returns:
+        Dictionary with "by_host" and "by_media_type" summaries, each keyed
+        by host or media type, plus "by_host_and_media_type" keyed "host|type"
+    """
+
+    def group(key_func) -> Dict:
+        groups: Dict[str, List[Dict]] = {}
+        for document in documents:
+            groups.setdefault(key_func(document), []).append(document)
+
+        summaries = {}
+        for key, records in sorted(groups.items()):
+            statuses: Dict[str, int] = {}
+            for record in records:
+                statuses[record["status"]] = statuses.get(record["status"], 0) + 1
+            summary = {"documents": len(records), "statuses": statuses}
+            summary["retries"] = sum(record.get("retries") or 0 for record in records)
+            summary["reused"] = sum(1 for record in records if record.get("reused"))
+            fetched = [record for record in records if not record.get("reused")]
+            for field in SUMMARY_FIELDS:
+                values = [r[field] for r in fetched if r.get(field) is not None]
+                summary[field] = summarize_values(values)
+            summaries[key] = summary
+        return summaries
+
+    return {
+        "by_host": group(lambda d: d["host"]),
+        "by_media_type": group(lambda d: d["media_type"]),
+        "by_host_and_media_type": group(lambda d: f"{d['host']}|{d['media_type']}"),
+    }
+
+
+class DocumentMetrics:
+    """Collects one record per attempted document during a run."""
+
+    def __init__(self, format: str = "ndjson"):
+        if format not in METRICS_FORMATS:
+            raise ValueError(
+                f"Unknown document metrics format '{format}' (expected one of {', '.join(METRICS_FORMATS)})"
+            )
+        self.format = format
+        self.documents: List[Dict] = []
+
+    def start(self, url: str, media_type: str, bill_id: str) -> Dict:
+        """
+        Start the record for a document about to be downloaded.
+
+        The record is kept by reference; the caller fills in the rest as the
+        document moves through download, parse and save.
+        """
+        record = {field: None for field in FIELDS}
+        record.update(
+            {
+                "url": url,
+                "host": urlparse(url).netloc or "unknown",
+                "media_type": media_kind(media_type),
+                "bill_id": bill_id,
+                "status": "download_failed",
+                "retries": 0,
+                "reused": False,
+            }
+        )
+        self.documents.append(record)
+        return record
+
+    def save_report(self, output_folder: Path, label: str) -> Optional[Path]:
+        """
+        Write the records and their summary to summary_reports/.
+
+        Returns:
+            Path of the records file, or None if there was nothing to write
+        """
+        if not self.documents:
+            return None
+
+        summary_reports = (
+            output_folder
+            / "data_not_processed"
+            / "text_extraction_errors"
+            / "summary_reports"
+        )
+        summary_reports.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        records_file = summary_reports / f"document_metrics_{label}_{timestamp}.{self.format}"
+        summary_file = summary_reports / f"document_metrics_summary_{label}_{timestamp}.json"
+
+        try:
+            with open(records_file, "w", encoding="utf-8", newline="") as f:
+                if self.format == "csv":
+                    writer = csv.DictWriter(f, fieldnames=FIELDS)
+                    writer.writeheader()
+                    writer.writerows(self.documents)
+                else:
+                    for record in self.documents:
+                        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+            with open(summary_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "label": label,
+                        "timestamp": datetime.now().isoformat(),
+                        "documents": len(self.documents),
+                        "reused": sum(1 for d in self.documents if d.get("reused")),
+                        "records": records_file.name,
+                        **summarize_documents(self.documents),
+                    },
+                    f,
+                    indent=2,
+                )
+            print(f"📏 Document metrics saved: {records_file}")
+        except Exception as e:
+            print(f"❌ Error saving document metrics: {e}")
+            return None
+        return records_file
+
+    def print_summary(self) -> None:
+        """Print p50/p95/p99 download and parse time per media type."""
+        if not self.documents:
+            return
+        for media_type, summary in summarize_documents(self.documents)["by_media_type"].items():
+            download = summary["download_seconds"]
+            parse = summary["parse_seconds"]
+            print(
+                f"📏 {media_type}: {summary['documents']} documents, download "
+                f"p50/p95/p99 {download['p50']:.2f}/{download['p95']:.2f}/{download['p99']:.2f}s, "
+                f"parse {parse['p50']:.2f}/{parse['p95']:.2f}/{parse['p99']:.2f}s"
+            )
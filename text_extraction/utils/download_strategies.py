@@ -0,0 +1,120 @@
+"""
+Run-wide memory of which download strategy works for a host.
+
+Some hosts (congress.gov) block plain requests, so documents from them go
+through a chain of fallback strategies. Trying the whole chain for every
+document is slow: each strategy retries several times before the next one
+gets a turn. Documents of the same host and URL pattern tend to need the same
+strategy, so the memory keeps, per (host, pattern):
+
+- the strategy that last succeeded, which is tried first next time
+- consecutive failures per strategy; a strategy that fails
+  MAX_CONSECUTIVE_FAILURES times in a row without a success is skipped for the
+  rest of the run
+
+The memory lives for one run (reset by process_bills_in_batch), since what a
+host blocks changes from day to day.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Failures in a row after which a strategy is skipped for the pattern
+MAX_CONSECUTIVE_FAILURES = 3
+
+
+def get_url_pattern(url: str) -> Tuple[str, str]:
+    """
+    (host, pattern) a URL is remembered under.
+
+    The pattern is the first path segment (e.g. "bill" or "amendment" on
+    congress.gov), which separates the kinds of pages a host serves.
+    """
+    parsed = urlparse(url)
+    segments = [segment for segment in parsed.path.split("/") if segment]
+    return parsed.netloc.lower(), segments[0] if segments else ""
+
+
+class StrategyMemory:
+    """Which download strategies succeed and fail per host and URL pattern."""
+
+    def __init__(self, max_failures: int = MAX_CONSECUTIVE_FAILURES):
+        self.max_failures = max_failures
+        # (host, pattern) -> {"last_success", "failures", "successes", "skipped"}
+        self.patterns: Dict[Tuple[str, str], Dict] = {}
+
+    def _pattern(self, url: str) -> Dict:
+        return self.patterns.setdefault(
+            get_url_pattern(url),
+            {"last_success": None, "failures": {}, "successes": {}, "skipped": {}},
+        )
+
+    def order(self, url: str, strategies: List[str]) -> List[str]:
+        """
+        Strategies to try for a URL, best first.
+
+        The last strategy to succeed for the URL's pattern goes first;
+        strategies that keep failing are left out. If every strategy is left
+        out, the one most likely to work is still tried, so a pattern never
+        stops being downloaded altogether.
+        """
+        entry = self._pattern(url)
+        ordered = list(strategies)
+        if entry["last_success"] in ordered:
+            ordered.remove(entry["last_success"])
+            ordered.insert(0, entry["last_success"])
+
+        usable = [
+            name
+            for name in ordered
+            if entry["failures"].get(name, 0) < self.max_failures
+        ]
+        usable = usable or ordered[:1]
+        for name in ordered:
+            if name not in usable:
+                entry["skipped"][name] = entry["skipped"].get(name, 0) + 1
+        return usable
+
+    def record(self, url: str, strategy: str, ok: bool) -> None:
+        """Record the outcome of one strategy for a URL."""
+        entry = self._pattern(url)
+        if ok:
+            entry["last_success"] = strategy
+            entry["failures"][strategy] = 0
+            entry["successes"][strategy] = entry["successes"].get(strategy, 0) + 1
+        else:
+            entry["failures"][strategy] = entry["failures"].get(strategy, 0) + 1
+
+    def last_success(self, url: str) -> Optional[str]:
+        """Strategy that last succeeded for the URL's pattern (None if none has)."""
+        return self._pattern(url)["last_success"]
+
+    def to_report(self) -> Dict:
+        """Per "host/pattern" summary of successes, failures and skips."""
+        return {
+            f"{host}/{pattern}": {
+                "last_success": entry["last_success"],
+                "successes": dict(entry["successes"]),
+                "consecutive_failures": {
+                    name: count for name, count in entry["failures"].items() if count
+                },
+                "skipped": dict(entry["skipped"]),
+            }
+            for (host, pattern), entry in sorted(self.patterns.items())
+        }
+
+
+# Memory for the current run
+strategy_memory = StrategyMemory()
+
+
+def get_strategy_memory() -> StrategyMemory:
+    """The strategy memory of the current run."""
+    return strategy_memory
+
+
+def reset_strategy_memory() -> StrategyMemory:
+    """Start a new run with an empty strategy memory."""
+    global strategy_memory
+    strategy_memory = StrategyMemory()
+    return strategy_memory
@@ -0,0 +1,178 @@
+"""
+Extraction manifest - what has been extracted for each bill, and when.
+
+Kept in .windycivi/text_extraction_manifest.json of the calling repo so
+incremental runs can decide whether a bill needs work from the manifest and
+the already-loaded metadata, without scanning the bill's files/ directory.
+
+Layout:
+
+    {
+      "version": 1,
+      "bills": {
+        "country:us/state:il/sessions/104/bills/HB1": {
+          "bill_id": "HB1",
+          "extracted_at": "2025-01-02T03:04:05Z",
+          "logs_latest_update": "2025-01-01T00:00:00Z",
+          "versions": {
+            "Introduced|text/xml|<url>": {
+              "url": "<url>",
+              "note": "Introduced",
+              "media_type": "text/xml",
+              "text_file": "files/HB1_Introduced_extracted.txt",
+              "extracted_at": "2025-01-02T03:04:05Z"
+            }
+          }
+        }
+      }
+    }
+
+Versions are keyed on note + media type + URL, so a version whose link or
+format changes is treated as new and extracted again.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+MANIFEST_VERSION = 1
+
+
+def get_manifest_path(repo_root: Path) -> Path:
+    """Get the path to the extraction manifest in the calling repo."""
+    return repo_root / ".windycivi" / "text_extraction_manifest.json"
+
+
+def version_key(url: str, note: str, media_type: str) -> str:
+    """Key identifying one version document of a bill."""
+    return f"{note}|{media_type}|{url}"
+
+
+def get_utc_timestamp() -> str:
+    """Current UTC time in the format used by _processing timestamps."""
+    return datetime.utcnow().isoformat() + "Z"
+
+
+class ExtractionManifest:
+    """Per-bill and per-version record of extracted text, keyed by bill path."""
+
+    def __init__(self):
+        self.bills: Dict[str, Dict] = {}
+        self.repo_root: Optional[Path] = None
+        self.dirty = False
+        # Bills changed by this run (what a shard's manifest fragment holds)
+        self.touched: Set[str] = set()
+
+    def bill_key(self, bill_dir: Path) -> str:
+        """Key for a bill: its directory relative to the repo root."""
+        if self.repo_root is not None:
+            try:
+                return bill_dir.relative_to(self.repo_root).as_posix()
+            except ValueError:
+                pass
+        return bill_dir.as_posix()
+
+    def get_bill(self, key: str) -> Optional[Dict]:
+        return self.bills.get(key)
+
+    def record_version(
+        self,
+        key: str,
+        url: str,
+        note: str,
+        media_type: str,
+        text_file: str,
+    ) -> None:
+        """Record one successfully extracted version document."""
+        entry = self.bills.setdefault(key, {"versions": {}})
+        entry.setdefault("versions", {})[version_key(url, note, media_type)] = {
+            "url": url,
+            "note": note,
+            "media_type": media_type,
+            "text_file": text_file,
+            "extracted_at": get_utc_timestamp(),
+        }
+        self.dirty = True
+        self.touched.add(key)
+
+    def get_version(
+        self, key: str, url: str, note: str, media_type: str
+    ) -> Optional[Dict]:
+        """Get the record of a previously extracted version, if any."""
+        entry = self.bills.get(key) or {}
+        return entry.get("versions", {}).get(version_key(url, note, media_type))
+
+    def prune_versions(self, key: str, current_keys: Iterable[str]) -> None:
+        """Drop version records that are no longer listed in the bill's metadata."""
+        versions = (self.bills.get(key) or {}).get("versions", {})
+        current_keys = set(current_keys)
+        for stale in [k for k in versions if k not in current_keys]:
+            del versions[stale]
+            self.dirty = True
+            self.touched.add(key)
+
+    def mark_extracted(
+        self,
+        key: str,
+        bill_id: str,
+        logs_latest_update: Optional[str],
+        extracted_at: Optional[str] = None,
+    ) -> None:
+        """Mark a bill as fully extracted as of its current logs timestamp."""
+        entry = self.bills.setdefault(key, {"versions": {}})
+        entry["bill_id"] = bill_id
+        entry["extracted_at"] = extracted_at or get_utc_timestamp()
+        entry["logs_latest_update"] = logs_latest_update
+        entry.setdefault("versions", {})
+        self.dirty = True
+        self.touched.add(key)
+
+    def touched_bills(self) -> Dict[str, Dict]:
+        """Entries of the bills changed by this run."""
+        return {key: self.bills[key] for key in self.touched if key in self.bills}
+
+    def merge(self, bills: Dict[str, Dict]) -> None:
+        """Take entries from a shard's manifest fragment."""
+        if bills:
+            self.bills.update(bills)
+            self.dirty = True
+
+    def load(self, repo_root: Path) -> None:
+        """Load the manifest written by previous runs."""
+        self.repo_root = repo_root
+        manifest_path = get_manifest_path(repo_root)
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.bills = data.get("bills", {})
+            print(f"📒 Loaded extraction manifest ({len(self.bills)} bills)")
+        except FileNotFoundError:
+            self.bills = {}
+        except Exception as e:
+            print(f"⚠️ Could not read extraction manifest {manifest_path}: {e}")
+            self.bills = {}
+        self.dirty = False
+        self.touched = set()
+
+    def save(self, repo_root: Path) -> None:
+        """Write the manifest atomically if anything changed."""
+        if not self.dirty:
+            return
+
+        manifest_path = get_manifest_path(repo_root)
+        tmp_path = manifest_path.with_suffix(".json.tmp")
+        try:
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": MANIFEST_VERSION, "bills": self.bills},
+                    f,
+                    indent=1,
+                    sort_keys=True,
+                )
+            os.replace(tmp_path, manifest_path)
+            self.dirty = False
+        except Exception as e:
+            print(f"❌ Error saving extraction manifest: {e}")
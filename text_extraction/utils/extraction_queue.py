@@ -0,0 +1,129 @@
+"""
+Extraction queue - bills the format stage marked as needing text extraction.
+
+The format stage writes one NDJSON file per run to .windycivi/extraction_queue/
+(see scrape_and_format/utils/extraction_queue.py). The extractor reads every
+queue file, processes the queued bills, then deletes the files it consumed and
+writes the bills that still need work (failed or deferred) to a new file.
+
+The queue is only trusted once a full scan has completed (recorded in
+state.json), so bills that changed before the format stage started queueing
+are not missed.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from .extraction_manifest import get_utc_timestamp
+
+
+def get_extraction_queue_dir(repo_root: Path) -> Path:
+    """Get the extraction queue folder in the calling repo."""
+    return repo_root / ".windycivi" / "extraction_queue"
+
+
+class ExtractionQueue:
+    """Queued bills (by path relative to the repo root) and the files they came from."""
+
+    def __init__(self):
+        self.files: List[Path] = []
+        self.bills: Dict[str, Dict] = {}
+        self.state: Dict = {}
+
+    @property
+    def ready(self) -> bool:
+        """True once a full scan has run, so the queue covers every change since."""
+        return bool(self.state.get("last_full_scan"))
+
+    def load(self, repo_root: Path) -> None:
+        """Read every queue file, keeping the first entry for each bill."""
+        queue_dir = get_extraction_queue_dir(repo_root)
+        self.files = []
+        self.bills = {}
+        self.state = {}
+        if not queue_dir.is_dir():
+            return
+
+        try:
+            with open(queue_dir / "state.json", "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Could not read extraction queue state: {e}")
+
+        for queue_file in sorted(queue_dir.glob("*.ndjson")):
+            try:
+                with open(queue_file, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            print(f"⚠️ Skipping bad line in {queue_file.name}")
+                            continue
+                        if entry.get("bill"):
+                            self.bills.setdefault(entry["bill"], entry)
+                self.files.append(queue_file)
+            except Exception as e:
+                print(f"⚠️ Could not read extraction queue file {queue_file}: {e}")
+
+    def metadata_files(self, repo_root: Path) -> List[Path]:
+        """metadata.json paths of queued bills that still exist."""
+        metadata_files = []
+        for bill in self.bills:
+            metadata_file = repo_root / bill / "metadata.json"
+            if metadata_file.exists():
+                metadata_files.append(metadata_file)
+        return metadata_files
+
+    def complete(self, repo_root: Path, remaining: Dict[str, str]) -> None:
+        """
+        Consume the loaded queue files.
+
+        Args:
+            repo_root: Root of the calling repo
+            remaining: Bill key -> reason ('retry', 'deferred') for bills that
+                still need extraction; they are written to a new queue file
+                before the consumed files are deleted
+        """
+        queue_dir = get_extraction_queue_dir(repo_root)
+
+        try:
+            if remaining:
+                queue_dir.mkdir(parents=True, exist_ok=True)
+                timestamp = get_utc_timestamp()
+                retry_file = (
+                    queue_dir
+                    / f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}_{os.getpid()}_retry.ndjson"
+                )
+                with open(retry_file, "w", encoding="utf-8") as f:
+                    for bill in sorted(remaining):
+                        entry = {
+                            "bill": bill,
+                            "reason": remaining[bill],
+                            "queued_at": timestamp,
+                        }
+                        f.write(json.dumps(entry) + "\n")
+
+            for queue_file in self.files:
+                queue_file.unlink(missing_ok=True)
+            self.files = []
+        except Exception as e:
+            print(f"❌ Error updating extraction queue: {e}")
+
+    def mark_full_scan(self, repo_root: Path) -> None:
+        """Record that a full scan completed, enabling queue-driven runs."""
+        queue_dir = get_extraction_queue_dir(repo_root)
+        self.state["last_full_scan"] = get_utc_timestamp()
+        try:
+            queue_dir.mkdir(parents=True, exist_ok=True)
+            with open(queue_dir / "state.json", "w", encoding="utf-8") as f:
+                json.dump(self.state, f, indent=2)
+        except Exception as e:
+            print(f"❌ Error saving extraction queue state: {e}")
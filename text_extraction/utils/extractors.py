@@ -0,0 +1,148 @@
+"""
+Extractor plugins, keyed by media type.
+
+Each plugin names the module that downloads and parses one media type. The
+module is only imported when a document of that type is first handled, so
+starting a run does not load every extractor (or its parsing libraries).
+
+A plugin provides two functions in its module:
+
+- download(url) -> Optional[str]: fetch the document as text
+- parse(content) -> Dict: title, official_title, sections and raw_text (or
+  "error"); runs in the isolated parse worker, so it must be a module-level
+  function
+
+Plugins with downloads_to_file (PDF) download with
+download(url, destination, max_bytes) -> Optional[int] straight to a temp
+file instead; the orchestrator turns the file into text with the PDF engines
+(see pdf_engines) before parse() structures that text.
+
+The registry order is the preference order when a version has links in
+several formats. A new format (DOCX, RTF, ...) is added with
+register_extractor(), e.g. before PDF:
+
+    register_extractor(
+        ExtractorPlugin("docx", "application/vnd.openxmlformats-officedocument"
+                        ".wordprocessingml.document", "docx", "docx_extractor",
+                        "download_docx_text", "extract_text_from_docx"),
+        before="pdf",
+    )
+"""
+
+import importlib
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class ExtractorPlugin:
+    """Download and parse functions for one media type."""
+
+    name: str
+    # Matched against a link's media type (case-insensitive substring)
+    media_type: str
+    # Extension of the stored original
+    extension: str
+    # Module under text_extraction/utils holding the functions
+    module: str
+    download: str
+    parse: str
+    downloads_to_file: bool = False
+
+    def load(self) -> ModuleType:
+        """Import the plugin's module (only the first call does any work)."""
+        return importlib.import_module(f"{__package__}.{self.module}")
+
+    def download_function(self) -> Callable:
+        return getattr(self.load(), self.download)
+
+    def parse_function(self) -> Callable:
+        return getattr(self.load(), self.parse)
+
+    def matches(self, media_type: str) -> bool:
+        return self.media_type in media_type.lower()
+
+
+# In preference order (best to worst)
+EXTRACTORS: List[ExtractorPlugin] = [
+    # Best: Structured XML data
+    ExtractorPlugin(
+        "xml",
+        "text/xml",
+        "xml",
+        "xml_extractor",
+        "download_xml_document",
+        "extract_text_from_xml",
+    ),
+    # Good: HTML content
+    ExtractorPlugin(
+        "html",
+        "text/html",
+        "html",
+        "html_extractor",
+        "download_html_document",
+        "extract_text_from_html",
+    ),
+    # Acceptable: PDF files
+    ExtractorPlugin(
+        "pdf",
+        "application/pdf",
+        "pdf",
+        "pdf_extractor",
+        "download_pdf_file",
+        "extract_text_from_pdf",
+        downloads_to_file=True,
+    ),
+    # Basic: Plain text
+    ExtractorPlugin(
+        "text",
+        "text/plain",
+        "txt",
+        "plain_text_extractor",
+        "download_plain_text",
+        "extract_text_from_plain",
+    ),
+]
+
+
+def register_extractor(plugin: ExtractorPlugin, before: Optional[str] = None) -> None:
+    """
+    Add (or replace) the plugin for a media type.
+
+    Args:
+        plugin: The plugin
+        before: Name of the plugin it is preferred over (appended last if None)
+    """
+    EXTRACTORS[:] = [p for p in EXTRACTORS if p.name != plugin.name]
+    names = [p.name for p in EXTRACTORS]
+    position = names.index(before) if before in names else len(EXTRACTORS)
+    EXTRACTORS.insert(position, plugin)
+
+
+def get_extractor(media_type: str) -> Optional[ExtractorPlugin]:
+    """The plugin for a media type, or None if no plugin handles it."""
+    for plugin in EXTRACTORS:
+        if plugin.matches(media_type):
+            return plugin
+    return None
+
+
+def select_best_link(links: List[Dict]) -> Optional[Dict]:
+    """Pick the link whose media type has the most preferred plugin (None if none is usable)."""
+    best_link = None
+    best_rank = None
+
+    for link in links:
+        if not link.get("url"):
+            continue
+
+        media_type = link.get("media_type", "")
+        for rank, plugin in enumerate(EXTRACTORS):
+            if plugin.matches(media_type):
+                if best_rank is None or rank < best_rank:
+                    best_link = link
+                    best_rank = rank
+                break
+
+    return best_link
@@ -18,33 +18,130 @@ def download_html_content(url: str, download_with_retry_func, download_congress_
         return None
 
 
-def extract_text_from_html(html_content: str) -> dict:
-    """Extract text from HTML content."""
-    try:
-        from bs4 import BeautifulSoup
-
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-
-        # Get text
-        text = soup.get_text()
-
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = " ".join(chunk for chunk in chunks if chunk)
-
-        return {
-            "title": soup.title.string if soup.title else "",
-            "official_title": "",
-            "sections": [text],
-            "raw_text": text,
-        }
-    except ImportError:
-        return {"error": "BeautifulSoup not available for HTML parsing"}
-    except Exception as e:
-        return {"error": f"Failed to parse HTML: {e}"}
+def download_html_document(url: str) -> Optional[str]:
+    """Extractor plugin download: HTML, with the congress.gov fallback chain."""
+    from .common import download_with_retry
+    from .congress_gov import download_congress_gov_content
+
+    return download_html_content(url, download_with_retry, download_congress_gov_content)
+
+
+def clean_html_text(text: str) -> str:
+    """Collapse extracted page text into single-spaced phrases."""
+    return " ".join(
+        phrase
+        for line in text.splitlines()
+        for phrase in (part.strip() for part in line.strip().split("  "))
+        if phrase
+    )
+
+
+def _lxml_string(element) -> Optional[str]:
+    """
+    lxml equivalent of BeautifulSoup's Tag.string.
+
+    Returns the element's only piece of content (recursing into a single child
+    element), or None when it has no content or more than one piece.
+    """
+    contents = []
+    if element.text:
+        contents.append(element.text)
+    for child in element:
+        contents.append(child)
+        if child.tail:
+            contents.append(child.tail)
+
+    if len(contents) != 1:
+        return None
+    if isinstance(contents[0], str):
+        return contents[0]
+    if not isinstance(contents[0].tag, str):
+        # Comment or processing instruction
+        return contents[0].text
+    return _lxml_string(contents[0])
+
+
+def extract_html_with_lxml(html_content: str) -> dict:
+    """Extract text from HTML content with lxml (libxml2, C-accelerated)."""
+    import lxml.html
+    from lxml import etree
+
+    root = lxml.html.document_fromstring(html_content)
+
+    # Remove script and style elements (drop_tree keeps the text that follows)
+    for element in root.xpath("//script | //style"):
+        element.drop_tree()
+
+    title_elem = root.find(".//title")
+    text = "".join(root.itertext(tag=etree.Element, with_tail=True))
+    text = clean_html_text(text)
+
+    return {
+        "title": _lxml_string(title_elem) if title_elem is not None else "",
+        "official_title": "",
+        "sections": [text],
+        "raw_text": text,
+    }
+
+
+def extract_html_with_bs4(html_content: str) -> dict:
+    """Extract text from HTML content with BeautifulSoup's html.parser."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+
+    text = clean_html_text(soup.get_text())
+
+    return {
+        "title": soup.title.string if soup.title else "",
+        "official_title": "",
+        "sections": [text],
+        "raw_text": text,
+    }
+
+
+# Backend name -> extractor, in order of preference
+HTML_BACKENDS = {
+    "lxml": extract_html_with_lxml,
+    "bs4": extract_html_with_bs4,
+}
+
+
+def extract_text_from_html(html_content: str, backend: Optional[str] = None) -> dict:
+    """
+    Extract text from HTML content.
+
+    Uses the fastest installed backend (lxml, then BeautifulSoup). If lxml
+    is installed but cannot parse a page (e.g. a Unicode string with an XML
+    encoding declaration), the page is retried with BeautifulSoup. Output is
+    the same for well-formed pages; broken markup (tags inside <title>, text
+    after </html>) may be repaired differently by the two parsers.
+
+    Args:
+        html_content: HTML content as string
+        backend: Force a backend from HTML_BACKENDS instead of choosing one
+
+    Returns:
+        Dictionary with extracted text components
+    """
+    backends = [backend] if backend else list(HTML_BACKENDS)
+    error = None
+
+    for name in backends:
+        try:
+            result = HTML_BACKENDS[name](html_content)
+            result["backend"] = name
+            return result
+        except ImportError:
+            continue
+        except Exception as e:
+            error = e
+            continue
 
+    if error is not None:
+        return {"error": f"Failed to parse HTML: {error}"}
+    return {"error": "BeautifulSoup not available for HTML parsing"}
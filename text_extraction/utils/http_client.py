@@ -0,0 +1,321 @@
+"""
+HTTP client used for every document download.
+
+One HttpClient holds the connection pools, so keep-alive connections are
+reused by every request and every worker thread. Each thread gets its own
+requests.Session (sessions are not thread-safe), but all of them share the
+client's adapters and therefore its pools.
+
+Pool sizes are configurable per host: hosts without an entry use
+pool_maxsize connections. The client also counts, per host, how many
+requests went out on a new connection versus a reused one and how long the
+TCP connect and TLS handshake took.
+
+common.get_http_client() returns the client for the run; set_http_client()
+swaps in another one (e.g. pointed at a local stub server).
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+import urllib3
+from requests.adapters import DEFAULT_POOLBLOCK, HTTPAdapter
+from urllib3 import PoolManager
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# Hosts whose connection pools are kept open at once
+DEFAULT_POOL_CONNECTIONS = 10
+# Connections kept alive per host
+DEFAULT_POOL_MAXSIZE = 10
+
+
+def default_retry() -> Retry:
+    """Retries for connection errors and throttling / server error statuses."""
+    return Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+
+
+class ConnectionMetrics:
+    """Per-host connection counters, safe to update from several threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hosts: Dict[str, Dict] = {}
+
+    def _host(self, host: str) -> Dict:
+        return self.hosts.setdefault(
+            host,
+            {
+                "requests": 0,
+                "reused": 0,
+                "new_connections": 0,
+                "connect_seconds": 0.0,
+                "tls_handshakes": 0,
+                "tls_seconds": 0.0,
+            },
+        )
+
+    def record_connection(
+        self, host: str, connect_seconds: float, tls_seconds: Optional[float]
+    ) -> None:
+        """Record a new connection (TLS time is None for plain HTTP)."""
+        with self._lock:
+            stats = self._host(host)
+            stats["new_connections"] += 1
+            stats["connect_seconds"] += connect_seconds
+            if tls_seconds is not None:
+                stats["tls_handshakes"] += 1
+                stats["tls_seconds"] += tls_seconds
+
+    def record_request(self, host: str, reused: bool) -> None:
+        """Record one request sent on a pooled connection."""
+        self._local.requests = getattr(self._local, "requests", 0) + 1
+        with self._lock:
+            stats = self._host(host)
+            stats["requests"] += 1
+            stats["reused"] += 1 if reused else 0
+
+    def thread_requests(self) -> int:
+        """Requests sent so far by the calling thread (to count one download's retries)."""
+        return getattr(self._local, "requests", 0)
+
+    def totals(self) -> Dict:
+        """Counters summed over all hosts."""
+        with self._lock:
+            totals = {
+                "requests": 0,
+                "reused": 0,
+                "new_connections": 0,
+                "connect_seconds": 0.0,
+                "tls_handshakes": 0,
+                "tls_seconds": 0.0,
+            }
+            for stats in self.hosts.values():
+                for key in totals:
+                    totals[key] += stats[key]
+            return totals
+
+    def to_report(self) -> Dict:
+        """Totals and per-host counters, with times rounded and averaged."""
+
+        def summarize(stats: Dict) -> Dict:
+            summary = dict(stats)
+            summary["connect_seconds"] = round(stats["connect_seconds"], 3)
+            summary["tls_seconds"] = round(stats["tls_seconds"], 3)
+            summary["reuse_rate"] = (
+                round(stats["reused"] / stats["requests"], 3) if stats["requests"] else 0.0
+            )
+            summary["mean_tls_seconds"] = (
+                round(stats["tls_seconds"] / stats["tls_handshakes"], 3)
+                if stats["tls_handshakes"]
+                else 0.0
+            )
+            return summary
+
+        totals = summarize(self.totals())
+        with self._lock:
+            hosts = {host: summarize(stats) for host, stats in sorted(self.hosts.items())}
+        return {"totals": totals, "hosts": hosts}
+
+
+class MeteredHTTPConnection(HTTPConnection):
+    """HTTP connection that reports its connect time."""
+
+    metrics: Optional[ConnectionMetrics] = None
+    tls = False
+
+    def _new_conn(self):
+        started = time.monotonic()
+        sock = super()._new_conn()
+        self._tcp_seconds = time.monotonic() - started
+        return sock
+
+    def connect(self):
+        self._tcp_seconds = 0.0
+        started = time.monotonic()
+        super().connect()
+        if self.metrics is not None:
+            total = time.monotonic() - started
+            # For HTTPS everything after the TCP connect is the TLS handshake
+            self.metrics.record_connection(
+                self.host,
+                self._tcp_seconds,
+                max(total - self._tcp_seconds, 0.0) if self.tls else None,
+            )
+
+
+class MeteredHTTPSConnection(MeteredHTTPConnection, HTTPSConnection):
+    """HTTPS connection that reports its connect and TLS handshake time."""
+
+    tls = True
+
+
+class MeteredPoolMixin:
+    """Counts requests per connection pool as new or reused connections."""
+
+    metrics: Optional[ConnectionMetrics] = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.metrics = self.metrics
+        return conn
+
+    def _make_request(self, conn, *args, **kwargs):
+        if self.metrics is not None:
+            # An open socket means the connection was kept alive from an earlier request
+            self.metrics.record_request(self.host, getattr(conn, "sock", None) is not None)
+        return super()._make_request(conn, *args, **kwargs)
+
+
+class MeteredHTTPConnectionPool(MeteredPoolMixin, HTTPConnectionPool):
+    ConnectionCls = MeteredHTTPConnection
+
+
+class MeteredHTTPSConnectionPool(MeteredPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = MeteredHTTPSConnection
+
+
+class MeteredPoolManager(PoolManager):
+    """Pool manager whose pools report to a ConnectionMetrics."""
+
+    def __init__(self, *args, metrics: Optional[ConnectionMetrics] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics
+        self.pool_classes_by_scheme = {
+            "http": MeteredHTTPConnectionPool,
+            "https": MeteredHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredHTTPAdapter(HTTPAdapter):
+    """requests adapter whose connection pools report to a ConnectionMetrics."""
+
+    def __init__(self, metrics: ConnectionMetrics, **kwargs):
+        # Set before HTTPAdapter.__init__, which builds the pool manager
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=DEFAULT_POOLBLOCK, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = MeteredPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            metrics=self.metrics,
+            **pool_kwargs,
+        )
+
+
+class HttpClient:
+    """
+    Connection pools, headers and metrics shared by every download of a run.
+
+    Args:
+        pool_maxsize: Connections kept alive per host
+        host_pool_sizes: Host -> pool size, for hosts that need more (or fewer)
+            connections than pool_maxsize
+        pool_connections: Number of hosts whose pools are kept
+        headers: Headers sent with every request (built once, not per request)
+        verify: Verify TLS certificates
+        retries: urllib3 retry policy (default: 3 retries on errors and 429/5xx)
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        host_pool_sizes: Optional[Dict[str, int]] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        headers: Optional[Dict[str, str]] = None,
+        verify: bool = False,
+        retries: Optional[Retry] = None,
+    ):
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = dict(host_pool_sizes or {})
+        self.headers = dict(headers or {})
+        self.verify = verify
+        if not verify:
+            # Certificates are not checked, so don't warn on every request
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.metrics = ConnectionMetrics()
+        self._local = threading.local()
+
+        retries = retries if retries is not None else default_retry()
+        self._adapters: Dict[str, HTTPAdapter] = {}
+        default_adapter = MeteredHTTPAdapter(
+            self.metrics,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retries,
+        )
+        self._adapters["http://"] = default_adapter
+        self._adapters["https://"] = default_adapter
+        # requests picks the adapter with the longest matching URL prefix
+        for host, size in self.host_pool_sizes.items():
+            host_adapter = MeteredHTTPAdapter(
+                self.metrics,
+                pool_connections=1,
+                pool_maxsize=size,
+                max_retries=retries,
+            )
+            self._adapters[f"http://{host}/"] = host_adapter
+            self._adapters[f"https://{host}/"] = host_adapter
+
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's session (its connections come from the shared pools)."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.verify = self.verify
+            for prefix, adapter in self._adapters.items():
+                session.mount(prefix, adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET with the client's headers and TLS setting (both overridable)."""
+        kwargs.setdefault("verify", self.verify)
+        return self.session.get(url, **kwargs)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        for adapter in set(self._adapters.values()):
+            adapter.close()
+
+
+def parse_host_pool_sizes(values) -> Dict[str, int]:
+    """
+    Parse per-host pool sizes given as "host=size".
+
+    Args:
+        values: Iterable of "host=size" strings (e.g. "www.congress.gov=4")
+
+    Returns:
+        Dictionary of host -> pool size
+    """
+    sizes = {}
+    for value in values or ():
+        host, sep, size = str(value).partition("=")
+        host = host.strip()
+        if not sep or not host or not size.strip().isdigit() or int(size) < 1:
+            raise ValueError(
+                f"Invalid host pool size '{value}' (expected host=size, e.g. www.congress.gov=4)"
+            )
+        sizes[host] = int(size)
+    return sizes
@@ -0,0 +1,196 @@
+"""
+Storage for the original documents (XML, HTML, PDF) saved next to the extracted text.
+
+By default originals are stored as-is under their usual name
+(e.g. hb1_Introduced.pdf). Opt-in compression stores them gzip- or
+zstd-compressed, with a hash of the uncompressed content in the name:
+
+    hb1_Introduced.3f2a9c1b7d0e.pdf.zst
+
+so an unchanged document is never rewritten and a changed one gets a new
+name. Writing an original removes the other stored variants of the same
+document (plain or compressed).
+
+find_original() and open_original() hide the storage format from readers:
+they take the usual file name and return the plain bytes.
+"""
+
+import gzip
+import hashlib
+import io
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Union
+
+ORIGINAL_COMPRESSIONS = ("none", "gzip", "zstd")
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+HASH_LENGTH = 12
+HASH_RE = re.compile(rf"[0-9a-f]{{{HASH_LENGTH}}}")
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def zstd_available() -> bool:
+    """True if the optional zstandard package is installed."""
+    try:
+        import zstandard  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_compression(compression: str) -> str:
+    """
+    The compression that will actually be used.
+
+    zstd needs the optional zstandard package; without it gzip is used.
+    """
+    if compression not in ORIGINAL_COMPRESSIONS:
+        raise ValueError(
+            f"Unknown compression '{compression}' (expected one of {ORIGINAL_COMPRESSIONS})"
+        )
+    if compression == "zstd" and not zstd_available():
+        print("⚠️ zstandard is not installed - compressing originals with gzip")
+        return "gzip"
+    return compression
+
+
+def split_filename(filename: str):
+    """Split "name.ext" into ("name", "ext")."""
+    stem, _, extension = filename.rpartition(".")
+    return (stem, extension) if stem else (filename, "")
+
+
+def compressed_name(filename: str, digest: str, compression: str) -> str:
+    """Stored name of a compressed original, e.g. hb1.3f2a9c1b7d0e.pdf.zst."""
+    stem, extension = split_filename(filename)
+    return f"{stem}.{digest[:HASH_LENGTH]}.{extension}{COMPRESSION_SUFFIXES[compression]}"
+
+
+def stored_variants(target_dir: Path, filename: str) -> List[Path]:
+    """Every stored copy of an original: plain and compressed."""
+    stem, extension = split_filename(filename)
+    variants = []
+    plain = target_dir / filename
+    if plain.exists():
+        variants.append(plain)
+    if not target_dir.is_dir():
+        return variants
+    for suffix in COMPRESSION_SUFFIXES.values():
+        ending = f".{extension}{suffix}"
+        for path in target_dir.iterdir():
+            name = path.name
+            if not (name.startswith(stem + ".") and name.endswith(ending)):
+                continue
+            if HASH_RE.fullmatch(name[len(stem) + 1 : -len(ending)]):
+                variants.append(path)
+    return variants
+
+
+def _hash_source(source: Union[bytes, Path]) -> str:
+    digest = hashlib.sha256()
+    if isinstance(source, Path):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+    else:
+        digest.update(source)
+    return digest.hexdigest()
+
+
+def _open_source(source: Union[bytes, Path]) -> BinaryIO:
+    return open(source, "rb") if isinstance(source, Path) else io.BytesIO(source)
+
+
+def _compress(source: Union[bytes, Path], destination: Path, compression: str) -> None:
+    with _open_source(source) as src:
+        if compression == "zstd":
+            import zstandard
+
+            with open(destination, "wb") as f:
+                zstandard.ZstdCompressor(level=10).copy_stream(src, f)
+        else:
+            with gzip.open(destination, "wb", compresslevel=6) as f:
+                shutil.copyfileobj(src, f, CHUNK_SIZE)
+
+
+def write_original(
+    target_dir: Path,
+    filename: str,
+    source: Union[bytes, str, Path],
+    compression: str = "none",
+) -> Path:
+    """
+    Store an original document.
+
+    Args:
+        target_dir: The bill's files/ directory (or its documents/ subfolder)
+        filename: Usual name of the original (e.g. hb1_Introduced.pdf)
+        source: The content (text is stored UTF-8 encoded) or a file to copy
+        compression: "none", "gzip" or "zstd"
+
+    Returns:
+        Path of the stored file
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    compression = resolve_compression(compression)
+
+    if compression == "none":
+        destination = target_dir / filename
+        tmp_path = destination.with_name(destination.name + ".tmp")
+        with _open_source(source) as src, open(tmp_path, "wb") as f:
+            shutil.copyfileobj(src, f, CHUNK_SIZE)
+        os.replace(tmp_path, destination)
+    else:
+        destination = target_dir / compressed_name(
+            filename, _hash_source(source), compression
+        )
+        # Same name means same content: nothing to rewrite
+        if not destination.exists():
+            tmp_path = destination.with_name(destination.name + ".tmp")
+            _compress(source, tmp_path, compression)
+            os.replace(tmp_path, destination)
+
+    for stale in stored_variants(target_dir, filename):
+        if stale != destination:
+            stale.unlink(missing_ok=True)
+    return destination
+
+
+def find_original(target_dir: Path, filename: str) -> Optional[Path]:
+    """
+    Find the stored copy of an original by its usual name.
+
+    Returns:
+        The plain file if present, else the newest compressed copy, else None
+    """
+    variants = stored_variants(Path(target_dir), filename)
+    if not variants:
+        return None
+    if variants[0].name == filename:
+        return variants[0]
+    return max(variants, key=lambda path: path.stat().st_mtime)
+
+
+def open_original(path: Path) -> BinaryIO:
+    """Open a stored original (plain, .gz or .zst) for reading its plain bytes."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(f"zstandard is needed to read {path}")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def read_original(path: Path) -> bytes:
+    """Read the plain bytes of a stored original (plain, .gz or .zst)."""
+    with open_original(path) as f:
+        return f.read()
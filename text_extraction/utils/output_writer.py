@@ -0,0 +1,432 @@
+"""
+Writers for the _extracted.txt files saved next to each bill document.
+
+Two output formats are supported:
+
+- full (default): a header, the numbered sections, then the raw text. The
+  sections repeat the raw text, so each document is stored about twice.
+- compact: the _extracted.txt file holds only the normalized text (stripped
+  lines, blank lines dropped) and an _extracted.json sidecar holds the title,
+  media info and each section as UTF-8 byte offsets into the text.
+
+Both the in-memory path (extracted_data dicts) and the page-streaming PDF path
+produce either format. read_extracted_text() reads both (also when the text
+is stored as a delta against the previous version, see version_deltas), and
+convert_to_compact() rewrites existing full files as compact ones.
+"""
+
+import json
+import mmap
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .version_deltas import materialize_dependents, read_stored_text
+
+SEPARATOR = "\n" + "=" * 80 + "\n\n"
+RAW_TEXT_MARKER = SEPARATOR + "Raw Text:\n"
+
+OUTPUT_FORMATS = ("full", "compact")
+COMPACT_FORMAT_VERSION = 1
+
+
+def format_section(index: int, section: str) -> str:
+    """Format one numbered section block."""
+    return f"Section {index}:\n{section}\n\n"
+
+
+def write_header(
+    f,
+    title: str,
+    official_title: str,
+    section_count: int,
+    source: str,
+    media_type: str,
+    strikethrough_info: Optional[Dict] = None,
+    truncated: str = "",
+):
+    """Write the header block of an _extracted.txt file."""
+    f.write(f"Title: {title}\n")
+    f.write(f"Official Title: {official_title}\n")
+    f.write(f"Number of Sections: {section_count}\n")
+    f.write(f"Source: {source}\n")
+    f.write(f"Media Type: {media_type}\n")
+    if strikethrough_info and strikethrough_info.get("has_strikethroughs"):
+        f.write(
+            f"Strikethrough Detection: {strikethrough_info['strikethrough_count']} sections found\n"
+        )
+    if truncated:
+        f.write(f"Truncated: {truncated}\n")
+    f.write(SEPARATOR)
+
+
+def write_extracted_text(
+    text_file: Path,
+    extracted_data: Dict,
+    source: str,
+    media_type: str,
+    strikethrough_info: Optional[Dict] = None,
+):
+    """
+    Write an _extracted.txt file from an extracted_data dictionary.
+
+    Args:
+        text_file: Destination path
+        extracted_data: Dictionary with title, official_title, sections, raw_text
+        source: Source description (e.g. "versions - Introduced")
+        media_type: Media type of the original document
+        strikethrough_info: Optional strikethrough detection summary
+    """
+    sections = extracted_data.get("sections", [])
+    with open(text_file, "w", encoding="utf-8") as f:
+        write_header(
+            f,
+            extracted_data.get("title", "N/A"),
+            extracted_data.get("official_title", "N/A"),
+            len(sections),
+            source,
+            media_type,
+            strikethrough_info,
+        )
+
+        for i, section in enumerate(sections, 1):
+            f.write(format_section(i, section))
+
+        f.write(SEPARATOR)
+        f.write("Raw Text:\n")
+        f.write(extracted_data.get("raw_text", ""))
+
+
+def write_extracted_text_from_parts(
+    text_file: Path, streamed: Dict, source: str, media_type: str
+):
+    """
+    Write an _extracted.txt file from the part files of a streamed extraction.
+
+    The sections and raw text are copied from disk in chunks, so memory use
+    does not grow with the size of the document.
+
+    Args:
+        text_file: Destination path
+        streamed: Result of a streaming extraction (title, section_count,
+            sections_path, raw_path, strikethrough and truncation info)
+        source: Source description (e.g. "versions - Introduced")
+        media_type: Media type of the original document
+    """
+    with open(text_file, "w", encoding="utf-8") as f:
+        write_header(
+            f,
+            streamed.get("title") or "PDF Document",
+            streamed.get("official_title", ""),
+            streamed.get("section_count", 0),
+            source,
+            media_type,
+            streamed,
+            streamed.get("truncated", ""),
+        )
+
+        with open(streamed["sections_path"], "r", encoding="utf-8") as part:
+            shutil.copyfileobj(part, f)
+
+        f.write(SEPARATOR)
+        f.write("Raw Text:\n")
+        with open(streamed["raw_path"], "r", encoding="utf-8") as part:
+            shutil.copyfileobj(part, f)
+
+
+def get_sidecar_path(text_file: Path) -> Path:
+    """Sidecar of a compact _extracted.txt file (same name, .json suffix)."""
+    return Path(text_file).with_suffix(".json")
+
+
+def normalize_text(text: str) -> str:
+    """Strip every line and drop blank ones - the text compact files hold."""
+    return "\n".join(line.strip() for line in text.split("\n") if line.strip())
+
+
+def write_normalized_lines(f, lines: Iterable[str]) -> None:
+    """Write normalized text to f one line at a time."""
+    first = True
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if not first:
+            f.write("\n")
+        f.write(line)
+        first = False
+
+
+def locate_sections(text_file: Path, sections: Iterable[str]) -> List[Dict]:
+    """
+    Find each normalized section in a compact text file.
+
+    The file is memory-mapped, so this works for streamed documents without
+    reading them into memory. Each search starts where the previous section
+    started, which also finds sections nested inside the previous one.
+
+    Returns:
+        Per section, {"start", "end"} byte offsets, or {"text"} for a section
+        that is not in the text verbatim
+    """
+    located = []
+    with open(text_file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            position = 0
+            for section in sections:
+                section = normalize_text(section)
+                needle = section.encode("utf-8")
+                start = mm.find(needle, position) if needle else position
+                if start == -1:
+                    start = mm.find(needle)
+                if start == -1:
+                    located.append({"text": section})
+                    continue
+                located.append({"start": start, "end": start + len(needle)})
+                position = start
+        finally:
+            if size:
+                mm.close()
+    return located
+
+
+def write_sidecar(
+    text_file: Path,
+    title: str,
+    official_title: str,
+    sections: List[Dict],
+    source: str,
+    media_type: str,
+    strikethrough_info: Optional[Dict] = None,
+    truncated: str = "",
+):
+    """Write the _extracted.json sidecar of a compact text file."""
+    sidecar = {
+        "format": "compact",
+        "version": COMPACT_FORMAT_VERSION,
+        "title": title,
+        "official_title": official_title,
+        "source": source,
+        "media_type": media_type,
+        "encoding": "utf-8",
+        "sections": sections,
+    }
+    if strikethrough_info and strikethrough_info.get("has_strikethroughs"):
+        sidecar["strikethrough_count"] = strikethrough_info["strikethrough_count"]
+    if truncated:
+        sidecar["truncated"] = truncated
+
+    with open(get_sidecar_path(text_file), "w", encoding="utf-8") as f:
+        json.dump(sidecar, f, indent=1, ensure_ascii=False)
+
+
+def write_compact_text(
+    text_file: Path,
+    extracted_data: Dict,
+    source: str,
+    media_type: str,
+    strikethrough_info: Optional[Dict] = None,
+):
+    """
+    Write a compact _extracted.txt file and its sidecar from an extracted_data dictionary.
+
+    Args:
+        text_file: Destination path
+        extracted_data: Dictionary with title, official_title, sections, raw_text
+        source: Source description (e.g. "versions - Introduced")
+        media_type: Media type of the original document
+        strikethrough_info: Optional strikethrough detection summary
+    """
+    with open(text_file, "w", encoding="utf-8") as f:
+        f.write(normalize_text(extracted_data.get("raw_text", "")))
+
+    write_sidecar(
+        text_file,
+        extracted_data.get("title", "N/A"),
+        extracted_data.get("official_title", "N/A"),
+        locate_sections(text_file, extracted_data.get("sections", [])),
+        source,
+        media_type,
+        strikethrough_info,
+    )
+
+
+def iter_streamed_sections(sections_path: Path) -> Iterator[str]:
+    """
+    Read back the sections part file of a streamed extraction, one at a time.
+
+    Streamed sections are non-blank lines, so a blank line ends each block.
+    """
+    with open(sections_path, "r", encoding="utf-8") as f:
+        lines = []
+        for line in f:
+            line = line.rstrip("\n")
+            if line:
+                lines.append(line)
+            elif lines:
+                yield "\n".join(lines[1:])  # Drop the "Section N:" line
+                lines = []
+        if lines:
+            yield "\n".join(lines[1:])
+
+
+def write_compact_text_from_parts(
+    text_file: Path, streamed: Dict, source: str, media_type: str
+):
+    """
+    Write a compact _extracted.txt file and its sidecar from the part files of a streamed extraction.
+
+    The text is normalized line by line and sections are located in the
+    memory-mapped result, so memory use does not grow with the document.
+
+    Args:
+        text_file: Destination path
+        streamed: Result of a streaming extraction (title, sections_path,
+            raw_path, strikethrough and truncation info)
+        source: Source description (e.g. "versions - Introduced")
+        media_type: Media type of the original document
+    """
+    with open(text_file, "w", encoding="utf-8") as f:
+        with open(streamed["raw_path"], "r", encoding="utf-8") as part:
+            write_normalized_lines(f, part)
+
+    write_sidecar(
+        text_file,
+        streamed.get("title") or "PDF Document",
+        streamed.get("official_title", ""),
+        locate_sections(text_file, iter_streamed_sections(streamed["sections_path"])),
+        source,
+        media_type,
+        streamed,
+        streamed.get("truncated", ""),
+    )
+
+
+def parse_full_text(content: str) -> Dict:
+    """
+    Parse the contents of a full-format _extracted.txt file.
+
+    Returns:
+        Dictionary with title, official_title, source, media_type, sections,
+        raw_text, and strikethrough_count/truncated when present
+    """
+    header_end = content.find(SEPARATOR)
+    raw_marker = content.find(RAW_TEXT_MARKER, header_end)
+    if header_end == -1 or raw_marker == -1:
+        raise ValueError("Not a full-format extracted text file")
+
+    fields = {}
+    for line in content[:header_end].split("\n"):
+        key, _, value = line.partition(": ")
+        fields[key] = value
+
+    # Section blocks are "Section N:\n<text>\n\n", one after another
+    body = content[header_end + len(SEPARATOR) : raw_marker]
+    count = int(fields.get("Number of Sections", "0") or 0)
+    sections = []
+    position = 0
+    for i in range(1, count + 1):
+        marker = f"Section {i}:\n"
+        start = body.find(marker, position)
+        if start == -1:
+            break
+        start += len(marker)
+        next_start = body.find(f"\n\nSection {i + 1}:\n", start) if i < count else -1
+        end = next_start if next_start != -1 else len(body) - 2
+        sections.append(body[start:end])
+        position = end
+
+    parsed = {
+        "title": fields.get("Title", ""),
+        "official_title": fields.get("Official Title", ""),
+        "source": fields.get("Source", ""),
+        "media_type": fields.get("Media Type", ""),
+        "sections": sections,
+        "raw_text": content[raw_marker + len(RAW_TEXT_MARKER) :],
+    }
+    strikethroughs = fields.get("Strikethrough Detection", "")
+    if strikethroughs:
+        parsed["strikethrough_count"] = int(strikethroughs.split()[0])
+    if fields.get("Truncated"):
+        parsed["truncated"] = fields["Truncated"]
+    return parsed
+
+
+def read_extracted_text(text_file: Path) -> Dict:
+    """
+    Read an _extracted.txt file in either format.
+
+    Returns:
+        Dictionary with title, official_title, source, media_type, sections
+        and raw_text (the normalized text for compact files)
+    """
+    text_file = Path(text_file)
+    sidecar_path = get_sidecar_path(text_file)
+    if not sidecar_path.exists():
+        if not text_file.exists():
+            return parse_full_text(read_stored_text(text_file))
+        with open(text_file, "r", encoding="utf-8") as f:
+            return parse_full_text(f.read())
+
+    with open(sidecar_path, "r", encoding="utf-8") as f:
+        sidecar = json.load(f)
+    if text_file.exists():
+        with open(text_file, "rb") as f:
+            data = f.read()
+    else:
+        data = read_stored_text(text_file).encode("utf-8")
+
+    sections = []
+    for section in sidecar.get("sections", []):
+        if "text" in section:
+            sections.append(section["text"])
+        else:
+            sections.append(data[section["start"] : section["end"]].decode("utf-8"))
+
+    result = {key: value for key, value in sidecar.items() if key != "sections"}
+    result["sections"] = sections
+    result["raw_text"] = data.decode("utf-8")
+    return result
+
+
+def convert_to_compact(text_file: Path) -> bool:
+    """
+    Rewrite a full-format _extracted.txt file in the compact format.
+
+    Returns:
+        True if the file was converted, False if it already was compact
+    """
+    text_file = Path(text_file)
+    if get_sidecar_path(text_file).exists():
+        return False
+
+    with open(text_file, "r", encoding="utf-8") as f:
+        parsed = parse_full_text(f.read())
+
+    # Deltas against this file were made from its full-format text
+    materialize_dependents(text_file)
+
+    # Write next to the original and swap in, so a failure leaves it intact
+    tmp_file = text_file.with_name(text_file.name + ".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(normalize_text(parsed["raw_text"]))
+    sections = locate_sections(tmp_file, parsed["sections"])
+    os.replace(tmp_file, text_file)
+
+    write_sidecar(
+        text_file,
+        parsed["title"],
+        parsed["official_title"],
+        sections,
+        parsed["source"],
+        parsed["media_type"],
+        {
+            "has_strikethroughs": "strikethrough_count" in parsed,
+            "strikethrough_count": parsed.get("strikethrough_count", 0),
+        },
+        parsed.get("truncated", ""),
+    )
+    return True
@@ -0,0 +1,276 @@
+"""
+Isolated parse workers - run document parsers in a child process with limits.
+
+A handful of pathological documents make pdfplumber hang or grow without bound.
+Parsing in a worker process lets the orchestrator kill it once a document goes
+past its wall-clock timeout or resident memory ceiling, then start a fresh
+worker for the next document instead of stalling the whole run.
+"""
+
+import multiprocessing
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+# Outcome statuses returned by IsolatedParser.run
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_MEMORY = "memory"
+STATUS_CRASHED = "crashed"
+
+# Statuses that mean the document itself is the problem and should be skipped
+LIMIT_STATUSES = (STATUS_TIMEOUT, STATUS_MEMORY, STATUS_CRASHED)
+
+
+@dataclass
+class ParseOutcome:
+    """Result of running a parse function in an isolated worker."""
+
+    status: str
+    result: Any = None
+    error: str = ""
+    elapsed: float = 0.0
+    peak_rss_mb: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+    @property
+    def hit_limit(self) -> bool:
+        return self.status in LIMIT_STATUSES
+
+
+def _worker_main(conn) -> None:
+    """Worker loop: receive (func, args, kwargs), send back (status, payload)."""
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if task is None:
+            break
+
+        func, args, kwargs = task
+        try:
+            conn.send((STATUS_OK, func(*args, **kwargs)))
+        except Exception as e:
+            conn.send((STATUS_ERROR, f"{type(e).__name__}: {e}"))
+
+
+def read_rss_mb(pid: int) -> Optional[float]:
+    """
+    Read the resident set size of a process in MB.
+
+    Uses /proc (Linux, which is what the GitHub runners use). Returns None
+    where it is not available, in which case only the timeout is enforced.
+    """
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class IsolatedParser:
+    """
+    Runs parse functions in a long-lived worker process with per-call limits.
+
+    The worker is reused across documents and recycled after
+    `max_tasks_per_worker` calls, or immediately when a call exceeds its
+    timeout or memory ceiling, or the worker dies.
+
+    Functions and arguments must be picklable (module-level functions).
+    """
+
+    def __init__(
+        self,
+        timeout: float = 300.0,
+        max_memory_mb: Optional[float] = 2048.0,
+        max_tasks_per_worker: int = 50,
+        poll_interval: float = 0.25,
+    ):
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.poll_interval = poll_interval
+
+        start_methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context(
+            "fork" if "fork" in start_methods else "spawn"
+        )
+        self._process = None
+        self._conn = None
+        self._tasks_done = 0
+        self.workers_started = 0
+        self.workers_killed = 0
+
+    def _start_worker(self) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main, args=(child_conn,), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        self._process = process
+        self._conn = parent_conn
+        self._tasks_done = 0
+        self.workers_started += 1
+
+    def _ensure_worker(self) -> None:
+        if self._process is None or not self._process.is_alive():
+            self._discard_worker()
+            self._start_worker()
+        elif self._tasks_done >= self.max_tasks_per_worker:
+            self._stop_worker()
+            self._start_worker()
+
+    def _kill_worker(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            self._process.kill()
+            self._process.join(timeout=5)
+            self.workers_killed += 1
+        self._discard_worker()
+
+    def _stop_worker(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except (OSError, ValueError):
+                pass
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join(timeout=5)
+        self._discard_worker()
+
+    def _discard_worker(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+        self._process = None
+        self._conn = None
+
+    def run(self, func: Callable, *args, **kwargs) -> ParseOutcome:
+        """
+        Run func(*args, **kwargs) in the worker, enforcing timeout and memory.
+
+        Returns:
+            ParseOutcome with status ok/error/timeout/memory/crashed
+        """
+        self._ensure_worker()
+        started = time.monotonic()
+        peak_rss = 0.0
+
+        try:
+            self._conn.send((func, args, kwargs))
+        except (OSError, ValueError) as e:
+            self._kill_worker()
+            return ParseOutcome(STATUS_CRASHED, error=f"Failed to send task: {e}")
+
+        while True:
+            try:
+                if self._conn.poll(self.poll_interval):
+                    status, payload = self._conn.recv()
+                    self._tasks_done += 1
+                    elapsed = time.monotonic() - started
+                    if status == STATUS_OK:
+                        return ParseOutcome(
+                            STATUS_OK,
+                            result=payload,
+                            elapsed=elapsed,
+                            peak_rss_mb=peak_rss,
+                        )
+                    return ParseOutcome(
+                        STATUS_ERROR,
+                        error=payload,
+                        elapsed=elapsed,
+                        peak_rss_mb=peak_rss,
+                    )
+            except (EOFError, OSError):
+                self._kill_worker()
+                return ParseOutcome(
+                    STATUS_CRASHED,
+                    error="Parse worker exited unexpectedly",
+                    elapsed=time.monotonic() - started,
+                    peak_rss_mb=peak_rss,
+                )
+
+            elapsed = time.monotonic() - started
+
+            if not self._process.is_alive():
+                exitcode = self._process.exitcode
+                self._kill_worker()
+                return ParseOutcome(
+                    STATUS_CRASHED,
+                    error=f"Parse worker exited with code {exitcode}",
+                    elapsed=elapsed,
+                    peak_rss_mb=peak_rss,
+                )
+
+            if self.timeout and elapsed > self.timeout:
+                self._kill_worker()
+                return ParseOutcome(
+                    STATUS_TIMEOUT,
+                    error=f"Parsing exceeded {self.timeout:.0f}s timeout",
+                    elapsed=elapsed,
+                    peak_rss_mb=peak_rss,
+                )
+
+            rss = read_rss_mb(self._process.pid)
+            if rss is not None:
+                peak_rss = max(peak_rss, rss)
+                if self.max_memory_mb and rss > self.max_memory_mb:
+                    self._kill_worker()
+                    return ParseOutcome(
+                        STATUS_MEMORY,
+                        error=(
+                            f"Parsing exceeded {self.max_memory_mb:.0f} MB memory "
+                            f"ceiling ({rss:.0f} MB)"
+                        ),
+                        elapsed=elapsed,
+                        peak_rss_mb=peak_rss,
+                    )
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        self._stop_worker()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def run_parser(
+    parser: Optional[IsolatedParser], func: Callable, *args, **kwargs
+) -> ParseOutcome:
+    """
+    Run a parse function through the isolated parser, or in-process if None.
+
+    Lets callers keep one code path whether or not isolation is enabled.
+    """
+    if parser is not None:
+        return parser.run(func, *args, **kwargs)
+
+    started = time.monotonic()
+    try:
+        result = func(*args, **kwargs)
+        return ParseOutcome(
+            STATUS_OK, result=result, elapsed=time.monotonic() - started
+        )
+    except Exception as e:
+        return ParseOutcome(
+            STATUS_ERROR,
+            error=f"{type(e).__name__}: {e}",
+            elapsed=time.monotonic() - started,
+        )
+
@@ -0,0 +1,346 @@
+"""
+PDF engine registry and selection strategies.
+
+Each engine turns a PDF (bytes, or the path of a downloaded file) into an
+iterator of (page_text, deleted_spans) pairs, one per page, so the same
+engines serve whole-document and streaming extraction. Files are
+memory-mapped rather than read into memory. The strategy decides the order they are tried in:
+
+- quality: pdfplumber (with strikethrough detection), then PyPDF2, then PyMuPDF
+- fast: PyMuPDF only (others are used only if PyMuPDF is not installed)
+- auto: ranks engines per host and document size class using the success
+  rate and speed recorded in .windycivi/pdf_engine_stats.json
+"""
+
+import io
+import json
+import mmap
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+PageIterator = Iterator[Tuple[str, List[str]]]
+
+# PDF content in memory, or the path of a downloaded PDF file
+PdfSource = Union[bytes, str, Path]
+
+
+def get_pdf_size(pdf_source: PdfSource) -> int:
+    """Size of a PDF in bytes."""
+    if isinstance(pdf_source, (str, Path)):
+        return os.path.getsize(pdf_source)
+    return len(pdf_source)
+
+
+@contextmanager
+def open_pdf_stream(pdf_source: PdfSource) -> Iterator[BinaryIO]:
+    """
+    Open a PDF as a seekable binary stream.
+
+    Files are memory-mapped, so pages are read from the page cache on demand
+    instead of holding a copy of the whole document.
+    """
+    if not isinstance(pdf_source, (str, Path)):
+        yield io.BytesIO(pdf_source)
+        return
+
+    with open(pdf_source, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield f  # mmap cannot map an empty file
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def iter_pdfplumber_pages(pdf_source: PdfSource) -> PageIterator:
+    """pdfplumber pages with strikethrough detection (best for complex layouts)."""
+    import pdfplumber
+
+    from .pdf_extractor import detect_strikethrough_spans, release_page
+
+    with open_pdf_stream(pdf_source) as stream, pdfplumber.open(stream) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text() or ""
+            deleted_spans = detect_strikethrough_spans(
+                page.chars, page.lines, page.rects
+            )
+            release_page(page)
+            yield page_text, deleted_spans
+
+
+def iter_pypdf2_pages(pdf_source: PdfSource) -> PageIterator:
+    """PyPDF2 pages (pure Python, no strikethrough detection)."""
+    import PyPDF2
+
+    with open_pdf_stream(pdf_source) as stream:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        for page in pdf_reader.pages:
+            yield page.extract_text() or "", []
+
+
+def iter_pymupdf_pages(pdf_source: PdfSource) -> PageIterator:
+    """PyMuPDF pages (typically an order of magnitude faster than pdfplumber)."""
+    import fitz  # PyMuPDF
+
+    if isinstance(pdf_source, (str, Path)):
+        # MuPDF reads the file itself
+        doc = fitz.open(str(pdf_source), filetype="pdf")
+    else:
+        doc = fitz.open(stream=pdf_source, filetype="pdf")
+    try:
+        for page in doc:
+            yield page.get_text() or "", []
+    finally:
+        doc.close()
+
+
+# Engine name -> page iterator
+PDF_ENGINES: Dict[str, Callable[[PdfSource], PageIterator]] = {
+    "pdfplumber": iter_pdfplumber_pages,
+    "pypdf2": iter_pypdf2_pages,
+    "pymupdf": iter_pymupdf_pages,
+}
+
+ENGINE_LABELS = {
+    "pdfplumber": "pdfplumber",
+    "pypdf2": "PyPDF2",
+    "pymupdf": "PyMuPDF",
+}
+
+QUALITY_ORDER = ["pdfplumber", "pypdf2", "pymupdf"]
+FAST_ORDER = ["pymupdf"]
+STRATEGIES = ("quality", "fast", "auto")
+
+# Size classes used as the "document class" for auto selection
+SIZE_CLASSES = [
+    (256 * 1024, "small"),
+    (4 * 1024 * 1024, "medium"),
+]
+
+
+def run_engines(
+    pdf_source: PdfSource,
+    engines: List[str],
+    consume_pages: Callable[[PageIterator], int],
+    fallback_engines: Optional[List[str]] = None,
+) -> Tuple[Optional[str], List[Dict]]:
+    """
+    Try engines in order until one produces text.
+
+    Args:
+        pdf_source: Downloaded PDF content, or the path of the downloaded file
+        engines: Engine names to try, in order
+        consume_pages: Callback that resets its own state, consumes the page
+            iterator and returns the number of text characters produced
+        fallback_engines: Engines to try only if none of `engines` is installed
+
+    Returns:
+        Tuple of (engine that succeeded or None, list of per-engine attempts
+        with engine, seconds, chars, ok and error)
+    """
+    attempts = []
+    installed_any = False
+
+    for name in engines:
+        started = time.monotonic()
+        try:
+            chars = consume_pages(PDF_ENGINES[name](pdf_source))
+        except ImportError:
+            continue
+        except Exception as e:
+            installed_any = True
+            print(f"   ⚠️ {ENGINE_LABELS.get(name, name)} failed: {e}")
+            attempts.append(
+                {
+                    "engine": name,
+                    "seconds": round(time.monotonic() - started, 3),
+                    "chars": 0,
+                    "ok": False,
+                    "error": str(e),
+                }
+            )
+            continue
+
+        installed_any = True
+        attempts.append(
+            {
+                "engine": name,
+                "seconds": round(time.monotonic() - started, 3),
+                "chars": chars,
+                "ok": chars > 0,
+            }
+        )
+        if chars > 0:
+            return name, attempts
+
+    if not installed_any and fallback_engines:
+        return run_engines(pdf_source, fallback_engines, consume_pages)
+
+    return None, attempts
+
+
+def get_document_class(size: int) -> str:
+    """Bucket a document by size, as a cheap proxy for its layout complexity."""
+    for limit, name in SIZE_CLASSES:
+        if size < limit:
+            return name
+    return "large"
+
+
+def get_engine_stats_path(repo_root: Path) -> Path:
+    """Get the path to the persisted engine statistics in the calling repo."""
+    return repo_root / ".windycivi" / "pdf_engine_stats.json"
+
+
+class PdfEngineSelector:
+    """
+    Chooses the engine order for each PDF and records how each engine did.
+
+    Statistics are kept per "host|size class" key, so auto mode can learn for
+    example that one legislature's scanned PDFs need pdfplumber while another
+    host's documents come out fine (and much faster) with PyMuPDF.
+    """
+
+    def __init__(self, strategy: str = "quality"):
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown PDF engine strategy '{strategy}' (expected one of {', '.join(STRATEGIES)})"
+            )
+        self.strategy = strategy
+        self.stats: Dict[str, Dict[str, Dict]] = {}
+        self.documents: List[Dict] = []
+
+    @staticmethod
+    def stats_key(url: str, size: int) -> str:
+        return f"{urlparse(url).netloc or 'unknown'}|{get_document_class(size)}"
+
+    def engine_order(self, url: str, size: int) -> Tuple[List[str], List[str]]:
+        """
+        Get the engines to try for a document.
+
+        Returns:
+            Tuple of (engines in order, fallback engines used only if none of
+            the first list is installed)
+        """
+        if self.strategy == "fast":
+            return list(FAST_ORDER), [e for e in QUALITY_ORDER if e not in FAST_ORDER]
+        if self.strategy == "quality":
+            return list(QUALITY_ORDER), []
+
+        key_stats = self.stats.get(self.stats_key(url, size), {})
+
+        def rank(name: str):
+            engine_stats = key_stats.get(name)
+            if not engine_stats or not engine_stats.get("attempts"):
+                # Untried engines go first (in quality order) so each gets sampled
+                return (0, 0.0, 0.0, QUALITY_ORDER.index(name))
+            success_rate = engine_stats["successes"] / engine_stats["attempts"]
+            mean_seconds = engine_stats["seconds"] / engine_stats["attempts"]
+            return (1, -round(success_rate, 1), mean_seconds, QUALITY_ORDER.index(name))
+
+        return sorted(QUALITY_ORDER, key=rank), []
+
+    def record(
+        self,
+        url: str,
+        size: int,
+        engine: Optional[str],
+        attempts: List[Dict],
+        verbose: bool = True,
+    ) -> None:
+        """Record the per-engine attempts for one document."""
+        key = self.stats_key(url, size)
+        key_stats = self.stats.setdefault(key, {})
+        for attempt in attempts:
+            engine_stats = key_stats.setdefault(
+                attempt["engine"],
+                {"attempts": 0, "successes": 0, "seconds": 0.0, "chars": 0},
+            )
+            engine_stats["attempts"] += 1
+            engine_stats["successes"] += 1 if attempt.get("ok") else 0
+            engine_stats["seconds"] = round(
+                engine_stats["seconds"] + attempt.get("seconds", 0.0), 3
+            )
+            engine_stats["chars"] += attempt.get("chars", 0)
+
+        self.documents.append(
+            {
+                "url": url,
+                "bytes": size,
+                "document_class": get_document_class(size),
+                "engine": engine,
+                "attempts": attempts,
+            }
+        )
+
+        if not verbose:
+            return
+        for attempt in attempts:
+            status = "✓" if attempt.get("ok") else "✗"
+            print(
+                f"   ⏱️ {ENGINE_LABELS.get(attempt['engine'], attempt['engine'])} {status} "
+                f"{attempt.get('seconds', 0):.2f}s, {attempt.get('chars', 0)} chars"
+            )
+
+    def load(self, repo_root: Path) -> None:
+        """Load engine statistics from previous runs."""
+        stats_path = get_engine_stats_path(repo_root)
+        try:
+            with open(stats_path, "r", encoding="utf-8") as f:
+                self.stats = json.load(f)
+        except FileNotFoundError:
+            self.stats = {}
+        except Exception as e:
+            print(f"⚠️ Could not read PDF engine stats {stats_path}: {e}")
+            self.stats = {}
+
+    def save(self, repo_root: Path) -> None:
+        """Persist engine statistics for the next run."""
+        if not self.documents:
+            return
+
+        stats_path = get_engine_stats_path(repo_root)
+        try:
+            stats_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(stats_path, "w", encoding="utf-8") as f:
+                json.dump(self.stats, f, indent=2, sort_keys=True)
+        except Exception as e:
+            print(f"❌ Error saving PDF engine stats: {e}")
+
+    def save_report(self, output_folder: Path, state: str) -> None:
+        """Save the per-document engine timings for this run."""
+        if not self.documents:
+            return
+
+        summary_reports = (
+            output_folder
+            / "data_not_processed"
+            / "text_extraction_errors"
+            / "summary_reports"
+        )
+        summary_reports.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_file = summary_reports / f"pdf_engines_{state}_{timestamp}.json"
+
+        try:
+            with open(report_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "state": state,
+                        "strategy": self.strategy,
+                        "timestamp": datetime.now().isoformat(),
+                        "documents": self.documents,
+                    },
+                    f,
+                    indent=2,
+                )
+            print(f"⏱️ PDF engine report saved: {report_file}")
+        except Exception as e:
+            print(f"❌ Error saving PDF engine report: {e}")
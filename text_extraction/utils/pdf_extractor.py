@@ -1,88 +1,98 @@
 import re
-from typing import Optional
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
 
+import numpy as np
 
-def download_pdf_content(url: str, download_with_retry_func) -> Optional[str]:
-    """Download PDF content from URL and convert to text."""
-    try:
-        response = download_with_retry_func(url, max_retries=3, delay=1.0)
-        if not response:
-            return None
+from .output_writer import format_section
+from .pdf_engines import ENGINE_LABELS, QUALITY_ORDER, PdfSource, run_engines
 
-        # Try multiple PDF parsing libraries in order of preference
-        pdf_content = None
+# Section header pattern shared by the in-memory and streaming splitters
+SECTION_HEADER_RE = re.compile(r"^(Section|§|\d+\.)", re.IGNORECASE)
 
-        # Try pdfplumber first (best for complex layouts)
-        try:
-            import pdfplumber
-            import io
-
-            pdf_file = io.BytesIO(response.content)
-            with pdfplumber.open(pdf_file) as pdf:
-                text_parts = []
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-                pdf_content = "\n\n".join(text_parts)
-                if pdf_content:
-                    print(f"   ✅ Successfully extracted PDF text using pdfplumber")
-                    return pdf_content
-        except ImportError:
-            pass
-        except Exception as e:
-            print(f"   ⚠️ pdfplumber failed: {e}")
 
-        # Try PyPDF2 as fallback
-        try:
-            import PyPDF2
-            import io
-
-            pdf_file = io.BytesIO(response.content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text_parts = []
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-            pdf_content = "\n\n".join(text_parts)
-            if pdf_content:
-                print(f"   ✅ Successfully extracted PDF text using PyPDF2")
-                return pdf_content
-        except ImportError:
-            pass
-        except Exception as e:
-            print(f"   ⚠️ PyPDF2 failed: {e}")
+@dataclass
+class PdfStreamPolicy:
+    """Limits for page-streaming PDF extraction (None means unlimited)."""
 
-        # Try pymupdf (fitz) as another fallback
-        try:
-            import fitz  # PyMuPDF
-            import io
-
-            pdf_file = io.BytesIO(response.content)
-            doc = fitz.open(stream=pdf_file, filetype="pdf")
-            text_parts = []
-            for page in doc:
-                page_text = page.get_text()
-                if page_text:
-                    text_parts.append(page_text)
-            doc.close()
-            pdf_content = "\n\n".join(text_parts)
-            if pdf_content:
-                print(f"   ✅ Successfully extracted PDF text using PyMuPDF")
-                return pdf_content
-        except ImportError:
-            pass
-        except Exception as e:
-            print(f"   ⚠️ PyMuPDF failed: {e}")
+    max_pages: Optional[int] = None
+    max_bytes: Optional[int] = None
 
-        # If all libraries fail, return a placeholder
-        print(f"   ⚠️ No PDF parsing libraries available")
-        return f"[PDF content from {url} - requires PDF parsing library (pdfplumber, PyPDF2, or PyMuPDF)]"
 
-    except Exception as e:
-        print(f"   ❌ Failed to download PDF: {e}")
-        return None
+def download_pdf_file(url: str, destination: Path, max_bytes: Optional[int]) -> Optional[int]:
+    """Extractor plugin download: stream a PDF to a file (returns its size, None on failure)."""
+    from .common import download_to_file
+
+    return download_to_file(url, destination, max_bytes)
+
+
+def parse_pdf_document(
+    pdf_source: PdfSource,
+    url: str = "",
+    engines: Optional[List[str]] = None,
+    fallback_engines: Optional[List[str]] = None,
+) -> dict:
+    """
+    Turn a downloaded PDF into text, with strikethrough detection if possible.
+
+    Tries the engines in order (pdfplumber with strikethrough detection first
+    by default). Module-level so it can run inside an isolated parse worker;
+    pass the path of the downloaded file so the worker gets a path, not a
+    copy of the document.
+
+    Returns:
+        Dictionary with raw_text, has_strikethroughs, strikethrough_count,
+        pages, engine and engine_attempts
+    """
+    text_parts = []
+    deleted_parts = []
+    page_count = 0
+
+    def collect(pages) -> int:
+        nonlocal page_count
+        text_parts.clear()
+        deleted_parts.clear()
+        page_count = 0
+        for page_text, deleted_spans in pages:
+            page_count += 1
+            if page_text:
+                text_parts.append(page_text)
+            for span in deleted_spans:
+                deleted_parts.append(f"[DELETED: {span}]")
+        return sum(len(part) for part in text_parts)
+
+    engine, attempts = run_engines(
+        pdf_source, engines or QUALITY_ORDER, collect, fallback_engines
+    )
+    if not engine:
+        print(f"   ⚠️ No PDF parsing libraries available")
+        return {
+            "raw_text": f"[PDF content from {url} - requires PDF parsing library (pdfplumber, PyPDF2, or PyMuPDF)]",
+            "has_strikethroughs": False,
+            "strikethrough_count": 0,
+            "pages": 0,
+            "engine": None,
+            "engine_attempts": attempts,
+        }
+
+    # Combine regular and strikethrough text
+    full_text = "\n\n".join(text_parts)
+    if deleted_parts:
+        full_text += "\n\n" + "\n".join(deleted_parts)
+
+    detection = " with strikethrough detection" if engine == "pdfplumber" else ""
+    print(
+        f"   ✅ Successfully extracted PDF text{detection} using {ENGINE_LABELS[engine]}"
+    )
+    return {
+        "raw_text": full_text,
+        "has_strikethroughs": len(deleted_parts) > 0,
+        "strikethrough_count": len(deleted_parts),
+        "pages": page_count,
+        "engine": engine,
+        "engine_attempts": attempts,
+    }
 
 
 def extract_text_from_pdf(pdf_content: str) -> dict:
@@ -104,7 +114,7 @@ def extract_text_from_pdf(pdf_content: str) -> dict:
         ):
             title = line
         # Look for section headers (numbers, "SECTION", etc.)
-        elif re.match(r"^(Section|§|\d+\.)", line, re.IGNORECASE):
+        elif SECTION_HEADER_RE.match(line):
             if current_section:
                 sections.append("\n".join(current_section))
                 current_section = []
@@ -128,103 +138,314 @@ def extract_text_from_pdf(pdf_content: str) -> dict:
     }
 
 
-def extract_text_with_strikethroughs(url: str, download_with_retry_func) -> dict:
+class StreamingSectionWriter:
     """
-    Extract PDF text including strikethrough content using visual analysis.
+    Applies the extract_text_from_pdf title/section rules line by line.
 
-    This function attempts to detect strikethrough text by analyzing
-    the visual layout and character positioning in the PDF.
+    Each section is written to the sections file as soon as the next section
+    header closes it, so only the current section is held in memory.
     """
-    try:
-        response = download_with_retry_func(url, max_retries=3, delay=1.0)
-        if not response:
-            return None
 
-        # Try pdfplumber with enhanced strikethrough detection
+    def __init__(self, sections_file):
+        self.sections_file = sections_file
+        self.title = ""
+        self.section_count = 0
+        self.current_section = []
+
+    def feed(self, text: str):
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            if not self.title and (
+                "AN ACT" in line.upper() or "BILL" in line.upper() or len(line) > 50
+            ):
+                self.title = line
+            elif SECTION_HEADER_RE.match(line):
+                self._flush()
+                self.current_section.append(line)
+            else:
+                self.current_section.append(line)
+
+    def _flush(self):
+        if self.current_section:
+            self.section_count += 1
+            self.sections_file.write(
+                format_section(self.section_count, "\n".join(self.current_section))
+            )
+            self.current_section = []
+
+    def close(self):
+        self._flush()
+
+
+def release_page(page):
+    """Drop pdfplumber's cached layout objects for a page we are done with."""
+    release = getattr(page, "close", None) or getattr(page, "flush_cache", None)
+    if release:
         try:
-            import pdfplumber
-            import io
-
-            pdf_file = io.BytesIO(response.content)
-            with pdfplumber.open(pdf_file) as pdf:
-                text_parts = []
-                strikethrough_parts = []
-
-                for page in pdf.pages:
-                    # Extract regular text
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-
-                    # Try to detect strikethrough text using character analysis
-                    chars = page.chars
-                    if chars:
-                        strikethrough_text = detect_strikethrough_chars(chars)
-                        if strikethrough_text:
-                            strikethrough_parts.append(
-                                f"[DELETED: {strikethrough_text}]"
-                            )
-
-                # Combine regular and strikethrough text
-                full_text = "\n\n".join(text_parts)
-                if strikethrough_parts:
-                    full_text += "\n\n" + "\n".join(strikethrough_parts)
-
-                if full_text:
-                    print(
-                        f"   ✅ Successfully extracted PDF text with strikethrough detection using pdfplumber"
-                    )
-                    return {
-                        "raw_text": full_text,
-                        "has_strikethroughs": len(strikethrough_parts) > 0,
-                        "strikethrough_count": len(strikethrough_parts),
-                    }
-
-        except ImportError:
+            release()
+        except Exception:
             pass
-        except Exception as e:
-            print(f"   ⚠️ pdfplumber strikethrough detection failed: {e}")
 
-        # Fallback to regular extraction
-        return None
 
-    except Exception as e:
-        print(f"   ❌ Failed to download PDF for strikethrough analysis: {e}")
-        return None
+class StreamingPageWriter:
+    """Writes pages from an engine to raw/sections part files under a policy."""
+
+    def __init__(self, raw_file, sections_file, deleted_path: Path, policy):
+        self.raw_file = raw_file
+        self.sections_file = sections_file
+        self.deleted_path = deleted_path
+        self.policy = policy
+        self.reset()
+
+    def reset(self):
+        for part in (self.raw_file, self.sections_file):
+            part.seek(0)
+            part.truncate()
+        self.splitter = StreamingSectionWriter(self.sections_file)
+        self.pages = 0
+        self.raw_bytes = 0
+        self.text_chars = 0
+        self.strikethrough_count = 0
+        self.truncated = ""
+
+    def consume(self, pages) -> int:
+        """Consume a page iterator, returning the characters of page text written."""
+        self.reset()
+        with open(self.deleted_path, "w", encoding="utf-8") as deleted_file:
+            for page_text, deleted_spans in pages:
+                if self.policy.max_pages and self.pages >= self.policy.max_pages:
+                    self.truncated = f"stopped after {self.pages} pages (max pages)"
+                    break
+                if self.policy.max_bytes and self.raw_bytes >= self.policy.max_bytes:
+                    self.truncated = f"stopped after {self.pages} pages (max bytes)"
+                    break
+
+                if page_text:
+                    if self.text_chars:
+                        self.raw_file.write("\n\n")
+                    self.raw_file.write(page_text)
+                    self.raw_bytes += len(page_text.encode("utf-8"))
+                    self.text_chars += len(page_text)
+                    self.splitter.feed(page_text)
+
+                for span in deleted_spans:
+                    if self.strikethrough_count:
+                        deleted_file.write("\n")
+                    deleted_file.write(f"[DELETED: {span}]")
+                    self.strikethrough_count += 1
+
+                self.pages += 1
+
+        if self.text_chars and self.strikethrough_count:
+            self.raw_file.write("\n\n")
+            with open(self.deleted_path, "r", encoding="utf-8") as deleted_file:
+                for line in deleted_file:
+                    self.raw_file.write(line)
+                    self.splitter.feed(line)
+
+        return self.text_chars
+
+
+def stream_pdf_document(
+    pdf_source: PdfSource,
+    work_dir: str,
+    policy: Optional[PdfStreamPolicy] = None,
+    url: str = "",
+    engines: Optional[List[str]] = None,
+    fallback_engines: Optional[List[str]] = None,
+) -> Optional[dict]:
+    """
+    Extract PDF text page by page, writing to part files as it goes.
+
+    Page text, section blocks and strikethrough notes are flushed to files in
+    work_dir after every page and the page's cached objects are released, so
+    peak memory stays around one page instead of the whole document.
+
+    Args:
+        pdf_source: Downloaded PDF content, or the path of the downloaded file
+        work_dir: Directory for the raw/sections part files
+        policy: Optional max-pages / max-bytes limits
+        url: Source URL (for the placeholder text if no library can parse it)
+        engines: PDF engines to try, in order (quality order by default)
+        fallback_engines: Engines to try only if none of `engines` is installed
+
+    Returns:
+        Dictionary with title, section_count, pages, raw_bytes, truncated,
+        has_strikethroughs, strikethrough_count, engine, engine_attempts,
+        raw_path and sections_path
+    """
+    work_path = Path(work_dir)
+    raw_path = work_path / "raw.txt"
+    sections_path = work_path / "sections.txt"
+
+    with open(raw_path, "w", encoding="utf-8") as raw_file, open(
+        sections_path, "w", encoding="utf-8"
+    ) as sections_file:
+        writer = StreamingPageWriter(
+            raw_file,
+            sections_file,
+            work_path / "deleted.txt",
+            policy or PdfStreamPolicy(),
+        )
+        engine, attempts = run_engines(
+            pdf_source, engines or QUALITY_ORDER, writer.consume, fallback_engines
+        )
+
+        if engine:
+            print(
+                f"   ✅ Streamed {writer.pages} PDF pages using {ENGINE_LABELS[engine]}"
+            )
+        else:
+            print(f"   ⚠️ No PDF parsing libraries available")
+            writer.reset()
+            placeholder = f"[PDF content from {url} - requires PDF parsing library (pdfplumber, PyPDF2, or PyMuPDF)]"
+            raw_file.write(placeholder)
+            writer.raw_bytes = len(placeholder.encode("utf-8"))
+            writer.splitter.feed(placeholder)
+
+        writer.splitter.close()
+
+    return {
+        "title": writer.splitter.title or "PDF Document",
+        "official_title": writer.splitter.title or "",
+        "section_count": writer.splitter.section_count,
+        "pages": writer.pages,
+        "raw_bytes": writer.raw_bytes,
+        "truncated": writer.truncated,
+        "has_strikethroughs": writer.strikethrough_count > 0,
+        "strikethrough_count": writer.strikethrough_count,
+        "engine": engine,
+        "engine_attempts": attempts,
+        "raw_path": str(raw_path),
+        "sections_path": str(sections_path),
+    }
+
 
+# Strike lines are thin horizontal lines/rects; anything thicker is a box or shading
+STRIKE_MAX_THICKNESS = 2.0
+# A strike crosses the glyph body: below the top 20% and above the bottom 30%
+# of the char box (underlines sit lower, near the baseline)
+STRIKE_BAND_TOP = 0.2
+STRIKE_BAND_BOTTOM = 0.3
+# Max segments compared per vectorized step, bounding the chars x segments matrix
+STRIKE_SEGMENT_CHUNK = 256
+STRIKE_FONT_MARKERS = ("strike", "delete", "removed")
 
-def detect_strikethrough_chars(chars: list) -> str:
+
+def get_strike_segments(lines: list, rects: list) -> List[tuple]:
     """
-    Detect strikethrough text by analyzing character positioning and formatting.
+    Collect candidate strike segments (x0, x1, y) from a page's lines and rects.
 
     Args:
-        chars: List of character objects from pdfplumber
+        lines: pdfplumber page.lines
+        rects: pdfplumber page.rects
 
     Returns:
-        String containing detected strikethrough text
+        List of (x0, x1, y) tuples for thin horizontal segments
     """
-    strikethrough_text = []
+    segments = []
+    for obj in list(lines) + list(rects):
+        thickness = obj["bottom"] - obj["top"]
+        length = obj["x1"] - obj["x0"]
+        if thickness <= STRIKE_MAX_THICKNESS and length > thickness:
+            segments.append((obj["x0"], obj["x1"], (obj["top"] + obj["bottom"]) / 2))
+    return segments
 
-    # Group characters by line
-    lines = {}
-    for char in chars:
-        y_pos = round(char["top"], 2)  # Round to handle floating point precision
-        if y_pos not in lines:
-            lines[y_pos] = []
-        lines[y_pos].append(char)
 
-    # Analyze each line for strikethrough patterns
-    for y_pos, line_chars in lines.items():
-        # Sort characters by x position
-        line_chars.sort(key=lambda x: x["x0"])
+def find_struck_chars(chars: list, segments: List[tuple]) -> List[bool]:
+    """
+    Flag chars whose horizontal center is crossed by a strike segment.
 
-        # Look for patterns that might indicate strikethrough
-        for i, char in enumerate(line_chars):
-            # Check if character has strikethrough-like properties
-            if is_likely_strikethrough(char, line_chars, i):
-                strikethrough_text.append(char["text"])
+    Uses NumPy interval tests over all chars at once. Chars in a font whose
+    name marks deleted text are flagged as well.
+    """
+    font_marked = [
+        any(marker in char.get("fontname", "").lower() for marker in STRIKE_FONT_MARKERS)
+        for char in chars
+    ]
+    if not segments:
+        return font_marked
+
+    boxes = np.array(
+        [(c["x0"], c["x1"], c["top"], c["bottom"]) for c in chars], dtype=float
+    ).reshape(-1, 4)
+    centers = ((boxes[:, 0] + boxes[:, 1]) / 2)[:, None]
+    heights = boxes[:, 3] - boxes[:, 2]
+    lows = (boxes[:, 2] + STRIKE_BAND_TOP * heights)[:, None]
+    highs = (boxes[:, 3] - STRIKE_BAND_BOTTOM * heights)[:, None]
+
+    struck = np.array(font_marked, dtype=bool)
+    segs = np.array(segments, dtype=float)
+    for start in range(0, len(segs), STRIKE_SEGMENT_CHUNK):
+        chunk = segs[start : start + STRIKE_SEGMENT_CHUNK]
+        hits = (
+            (chunk[:, 0] <= centers)
+            & (chunk[:, 1] >= centers)
+            & (chunk[:, 2] >= lows)
+            & (chunk[:, 2] <= highs)
+        )
+        struck |= hits.any(axis=1)
+    return struck.tolist()
+
+
+def group_struck_spans(chars: list, struck: List[bool]) -> List[str]:
+    """
+    Join consecutive struck chars into deleted spans.
+
+    Unstruck whitespace between struck chars stays inside the span; any other
+    unstruck char ends it. A span continuing onto the next line gets a space.
+    """
+    spans = []
+    current = []
+    prev = None
+
+    def flush():
+        span = "".join(current).strip()
+        if span:
+            spans.append(span)
+        current.clear()
+
+    for i, is_struck in enumerate(struck):
+        if not is_struck:
+            continue
+        if prev is not None and i != prev + 1:
+            gap = "".join(chars[j].get("text", "") for j in range(prev + 1, i))
+            if gap.strip():
+                flush()
+            else:
+                current.append(" ")
+        if (
+            prev is not None
+            and current
+            and abs(chars[i]["top"] - chars[prev]["top"])
+            > (chars[prev]["bottom"] - chars[prev]["top"]) / 2
+        ):
+            current.append(" ")
+        current.append(chars[i].get("text", ""))
+        prev = i
+
+    flush()
+    return spans
 
-    return "".join(strikethrough_text)
+
+def detect_strikethrough_spans(chars: list, lines=(), rects=()) -> List[str]:
+    """
+    Detect deleted (struck-through) text spans from a page's geometry.
+
+    Args:
+        chars: pdfplumber page.chars
+        lines: pdfplumber page.lines
+        rects: pdfplumber page.rects
+
+    Returns:
+        List of deleted text spans in page order
+    """
+    if not chars:
+        return []
+    segments = get_strike_segments(lines, rects)
+    return group_struck_spans(chars, find_struck_chars(chars, segments))
 
 
 def is_likely_strikethrough(char: dict, line_chars: list, index: int) -> bool:
@@ -289,13 +510,19 @@ def debug_pdf_structure(url: str, download_with_retry_func) -> dict:
                 "colors": set(),
                 "character_count": 0,
                 "potential_strikethroughs": [],
+                "strikethrough_spans": [],
             }
 
             for page_num, page in enumerate(pdf.pages):
                 chars = page.chars
                 debug_info["character_count"] += len(chars)
 
-                for char in chars:
+                for span in detect_strikethrough_spans(chars, page.lines, page.rects):
+                    debug_info["strikethrough_spans"].append(
+                        {"page": page_num + 1, "text": span}
+                    )
+
+                for index, char in enumerate(chars):
                     # Collect font information
                     font_name = char.get("fontname", "")
                     debug_info["fonts"].add(font_name)
@@ -306,7 +533,7 @@ def debug_pdf_structure(url: str, download_with_retry_func) -> dict:
                         debug_info["colors"].add(str(color))
 
                     # Check for potential strikethrough indicators
-                    if is_likely_strikethrough(char, chars, chars.index(char)):
+                    if is_likely_strikethrough(char, chars, index):
                         debug_info["potential_strikethroughs"].append(
                             {
                                 "page": page_num + 1,
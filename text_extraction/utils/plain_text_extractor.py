@@ -0,0 +1,21 @@
+from typing import Dict, Optional
+
+
+def download_plain_text(url: str) -> Optional[str]:
+    """Extractor plugin download: a plain text document."""
+    from .common import download_with_retry
+
+    response = download_with_retry(url, max_retries=3, delay=1.0)
+    if not response:
+        return None
+    return response.text
+
+
+def extract_text_from_plain(text: str) -> Dict[str, str]:
+    """Plain text has no structure to find: the whole document is the raw text."""
+    return {
+        "raw_text": text,
+        "title": "",
+        "official_title": "",
+        "sections": [],
+    }
@@ -0,0 +1,232 @@
+"""
+Extraction scheduler - decides the order bills are extracted in, and when to stop.
+
+Bills are ordered so that the work that matters most gets done before the
+runner's time limit:
+
+1. Bills in the current session before older sessions
+2. Within a session: never-extracted bills, then updated bills, then retries
+   of bills that failed in an earlier run (or wait on documents in backoff)
+3. Within each group: most recent activity first
+
+With a time budget, the run stops before starting a bill that might not
+finish in time; the bills not reached are reported and stay queued.
+"""
+
+import json
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .extraction_manifest import ExtractionManifest
+from .extraction_queue import ExtractionQueue
+
+# Extraction status tiers, lowest runs first
+TIER_NEW = 0
+TIER_UPDATED = 1
+TIER_RETRY = 2
+TIER_LABELS = {TIER_NEW: "new", TIER_UPDATED: "updated", TIER_RETRY: "retry"}
+
+# Minimum time kept in reserve for the last bill and the end-of-run saves
+DEFAULT_RESERVE_SECONDS = 60.0
+
+
+@dataclass
+class ScheduledBill:
+    """A bill waiting for extraction, with what its priority is based on."""
+
+    metadata_file: Path
+    bill_key: str
+    bill_id: str
+    session: str
+    latest_activity: str
+    tier: int
+
+    def to_report(self, current_session: Optional[str]) -> Dict:
+        return {
+            "bill": self.bill_key,
+            "bill_id": self.bill_id,
+            "session": self.session,
+            "current_session": self.session == current_session,
+            "latest_activity": self.latest_activity,
+            "status": TIER_LABELS[self.tier],
+        }
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a duration like "19800", "330m" or "5.5h" into seconds.
+
+    Returns:
+        Seconds, or None for an empty value
+    """
+    if value is None or str(value).strip() == "":
+        return None
+    match = re.fullmatch(r"\s*([\d.]+)\s*([smh]?)\s*", str(value).lower())
+    if not match:
+        raise ValueError(f"Invalid duration '{value}' (expected e.g. 19800, 330m, 5.5h)")
+    amount = float(match.group(1))
+    return amount * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def get_latest_activity(metadata: Dict) -> str:
+    """Most recent action date of a bill (ISO string, empty if unknown)."""
+    dates = [a.get("date") or "" for a in metadata.get("actions", [])]
+    latest = max(dates, default="")
+    return latest or metadata.get("_processing", {}).get("logs_latest_update", "")
+
+
+def get_session_start_year(session: Dict) -> int:
+    """Start year of a session from sessions.json (0 if unknown)."""
+    match = re.match(r"\d{4}", str(session.get("date_folder", "")))
+    return int(match.group(0)) if match else 0
+
+
+class ExtractionScheduler:
+    """Collects bills that need extraction and orders them by priority."""
+
+    def __init__(
+        self, repo_root: Path, manifest: ExtractionManifest, queue: ExtractionQueue
+    ):
+        self.repo_root = repo_root
+        self.manifest = manifest
+        self.queue = queue
+        self.bills: List[ScheduledBill] = []
+        self.current_session: Optional[str] = None
+
+    def add(self, metadata_file: Path, metadata: Dict) -> None:
+        """Add a bill that needs extraction."""
+        bill_key = self.manifest.bill_key(metadata_file.parent)
+        queued = self.queue.bills.get(bill_key, {})
+
+        if queued.get("reason") in ("retry", "backoff"):
+            tier = TIER_RETRY
+        elif self.manifest.get_bill(bill_key) is not None:
+            tier = TIER_UPDATED
+        else:
+            tier = TIER_NEW
+
+        self.bills.append(
+            ScheduledBill(
+                metadata_file=metadata_file,
+                bill_key=bill_key,
+                bill_id=metadata.get("identifier", metadata_file.parent.name),
+                session=str(
+                    metadata.get("legislative_session")
+                    or metadata_file.parent.parent.parent.name
+                ),
+                latest_activity=get_latest_activity(metadata),
+                tier=tier,
+            )
+        )
+
+    def find_current_session(self) -> Optional[str]:
+        """
+        The current session: the latest one in .windycivi/sessions.json, or
+        failing that, the session of the most recently active bill.
+        """
+        sessions_file = self.repo_root / ".windycivi" / "sessions.json"
+        try:
+            with open(sessions_file, "r", encoding="utf-8") as f:
+                sessions = json.load(f)
+            if isinstance(sessions, dict) and sessions:
+                return max(
+                    sessions,
+                    key=lambda s: (get_session_start_year(sessions[s]), s),
+                )
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Could not read {sessions_file}: {e}")
+
+        if not self.bills:
+            return None
+        return max(self.bills, key=lambda b: b.latest_activity).session
+
+    def ordered(self) -> List[ScheduledBill]:
+        """Bills in the order they should be extracted."""
+        self.current_session = self.find_current_session()
+        bills = sorted(self.bills, key=lambda b: b.latest_activity, reverse=True)
+        bills.sort(key=lambda b: (b.session != self.current_session, b.tier))
+        return bills
+
+
+class TimeBudget:
+    """
+    Wall-clock budget for a run.
+
+    Before each bill, the run should stop if what is left of the budget is
+    less than the reserve: the longest bill seen so far, but at least
+    `min_reserve` seconds (time for the end-of-run saves).
+    """
+
+    def __init__(
+        self, seconds: Optional[float], min_reserve: float = DEFAULT_RESERVE_SECONDS
+    ):
+        self.seconds = seconds
+        self.min_reserve = min_reserve
+        self.started = time.monotonic()
+        self.longest_bill = 0.0
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def record(self, seconds: float) -> None:
+        """Record how long one bill took."""
+        self.longest_bill = max(self.longest_bill, seconds)
+
+    def should_stop(self) -> bool:
+        if not self.seconds:
+            return False
+        reserve = max(self.longest_bill, self.min_reserve)
+        return self.seconds - self.elapsed() < reserve
+
+
+def save_deferred_report(
+    output_folder: Path,
+    state: str,
+    deferred: List[ScheduledBill],
+    current_session: Optional[str],
+    budget: TimeBudget,
+) -> None:
+    """Save the list of bills deferred because the time budget ran out."""
+    if not deferred:
+        return
+
+    summary_reports = (
+        output_folder
+        / "data_not_processed"
+        / "text_extraction_errors"
+        / "summary_reports"
+    )
+    summary_reports.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file = summary_reports / f"deferred_bills_{state}_{timestamp}.json"
+
+    by_status = {}
+    for bill in deferred:
+        label = TIER_LABELS[bill.tier]
+        by_status[label] = by_status.get(label, 0) + 1
+
+    try:
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "state": state,
+                    "timestamp": datetime.now().isoformat(),
+                    "time_budget_seconds": budget.seconds,
+                    "elapsed_seconds": round(budget.elapsed(), 1),
+                    "current_session": current_session,
+                    "deferred_count": len(deferred),
+                    "deferred_by_status": by_status,
+                    "deferred": [b.to_report(current_session) for b in deferred],
+                },
+                f,
+                indent=2,
+            )
+        print(f"⏳ Deferred bills report saved: {report_file}")
+    except Exception as e:
+        print(f"❌ Error saving deferred bills report: {e}")
@@ -0,0 +1,339 @@
+"""
+Full-text search index over extracted bill text.
+
+An SQLite database with an FTS5 table, kept in
+.windycivi/text_search.sqlite of the calling repo:
+
+    documents       one row per extracted version document: text file (relative
+                    to the repo root), bill path, bill identifier, state,
+                    session, version note, media type, extracted_at
+    document_text   FTS5 table (title, body) whose rowid is the documents id
+
+The index follows the extraction manifest. After a run, only the bills the
+run touched are looked at, and within them only versions whose manifest
+extracted_at differs from the indexed one are read and indexed again;
+versions no longer in the manifest are dropped. Sharded runs leave the
+index to the merge step, like the rest of .windycivi/.
+
+Bills without version records (extracted before the manifest tracked
+versions, or not in the manifest at all) are indexed from the
+files/**/*_extracted.txt files on disk, with the file's modification time
+standing in for extracted_at. The first update of a new index, and
+search.py --rebuild, go through every bill in the repo this way.
+
+Needs an SQLite build with FTS5 (the standard CPython builds have it);
+without it the index is skipped with a warning.
+"""
+
+import re
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .extraction_manifest import get_utc_timestamp
+from .output_writer import read_extracted_text
+from .version_deltas import DELTA_SUFFIX
+
+BILL_KEY_RE = re.compile(r"state:([^/]+)/sessions/([^/]+)/bills/([^/]+)")
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY,
+        text_file TEXT UNIQUE NOT NULL,
+        bill_key TEXT NOT NULL,
+        bill_id TEXT,
+        state TEXT,
+        session TEXT,
+        note TEXT,
+        media_type TEXT,
+        extracted_at TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS documents_bill_key ON documents (bill_key)",
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS document_text
+    USING fts5(title, body, tokenize = 'porter unicode61')
+    """,
+    "CREATE TABLE IF NOT EXISTS index_state (key TEXT PRIMARY KEY, value TEXT)",
+]
+
+
+def get_search_index_path(repo_root: Path) -> Path:
+    """Get the path to the search index in the calling repo."""
+    return repo_root / ".windycivi" / "text_search.sqlite"
+
+
+def parse_bill_key(bill_key: str) -> Dict[str, Optional[str]]:
+    """State, session and bill folder name from a bill path."""
+    match = BILL_KEY_RE.search(bill_key)
+    if not match:
+        return {"state": None, "session": None, "bill": Path(bill_key).name}
+    return {"state": match.group(1), "session": match.group(2), "bill": match.group(3)}
+
+
+def find_bill_keys(repo_root: Path) -> List[str]:
+    """Bill paths (relative to the repo root) of every bill with a files/ folder."""
+    repo_root = Path(repo_root)
+    return sorted(
+        files_dir.parent.relative_to(repo_root).as_posix()
+        for files_dir in repo_root.glob("country:us/state:*/sessions/*/bills/*/files")
+    )
+
+
+def scan_text_files(repo_root: Path, bill_key: str) -> Dict[str, Dict]:
+    """
+    Version records for a bill's extracted text files, taken from disk.
+
+    Returns:
+        Text file (relative to the bill) -> record with text_file and
+        extracted_at (the file's modification time)
+    """
+    bill_dir = Path(repo_root) / bill_key
+    records = {}
+    for path in sorted((bill_dir / "files").glob("**/*_extracted.txt*")):
+        name = path.name
+        if name.endswith(DELTA_SUFFIX):
+            name = name[: -len(DELTA_SUFFIX)]
+        if not name.endswith("_extracted.txt"):
+            continue  # e.g. a leftover .tmp file
+        text_file = path.with_name(name).relative_to(bill_dir).as_posix()
+        records[text_file] = {
+            "text_file": text_file,
+            "extracted_at": datetime.fromtimestamp(
+                path.stat().st_mtime, timezone.utc
+            ).isoformat(),
+        }
+    return records
+
+
+class SearchIndex:
+    """SQLite FTS5 index of extracted version documents."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.connection: Optional[sqlite3.Connection] = None
+
+    def open(self) -> bool:
+        """
+        Open (or create) the index.
+
+        Returns:
+            False if this SQLite build has no FTS5
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        try:
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+            self.connection.commit()
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Search index unavailable (SQLite without FTS5?): {e}")
+            self.close()
+            return False
+        return True
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _remove(self, document_id: int) -> None:
+        self.connection.execute("DELETE FROM document_text WHERE rowid = ?", (document_id,))
+        self.connection.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+
+    def update_bill(self, repo_root: Path, bill_key: str, entry: Dict) -> Dict[str, int]:
+        """
+        Bring one bill's documents in line with its manifest entry.
+
+        Args:
+            repo_root: Root of the calling repo
+            bill_key: Bill path relative to the repo root
+            entry: The bill's manifest entry (bill_id, versions); without
+                version records, the bill's text files on disk are indexed
+
+        Returns:
+            Counts of documents indexed, removed and unchanged
+        """
+        counts = {"indexed": 0, "removed": 0, "unchanged": 0}
+        location = parse_bill_key(bill_key)
+        bill_id = entry.get("bill_id") or location["bill"]
+
+        indexed = {
+            text_file: (document_id, extracted_at)
+            for document_id, text_file, extracted_at in self.connection.execute(
+                "SELECT id, text_file, extracted_at FROM documents WHERE bill_key = ?",
+                (bill_key,),
+            )
+        }
+
+        versions = entry.get("versions") or scan_text_files(repo_root, bill_key)
+        current = set()
+        for version in versions.values():
+            text_file = f"{bill_key}/{version['text_file']}"
+            current.add(text_file)
+            known = indexed.get(text_file)
+            if known and known[1] == version.get("extracted_at"):
+                counts["unchanged"] += 1
+                continue
+
+            try:
+                extracted = read_extracted_text(Path(repo_root) / text_file)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Not indexing {text_file}: {e}")
+                continue
+
+            if known:
+                self._remove(known[0])
+            cursor = self.connection.execute(
+                "INSERT INTO documents (text_file, bill_key, bill_id, state, session, note, "
+                "media_type, extracted_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    text_file,
+                    bill_key,
+                    bill_id,
+                    location["state"],
+                    location["session"],
+                    # Files found on disk: from the text's header
+                    version.get("note")
+                    or extracted.get("source", "").partition(" - ")[2],
+                    version.get("media_type") or extracted.get("media_type", ""),
+                    version.get("extracted_at"),
+                ),
+            )
+            self.connection.execute(
+                "INSERT INTO document_text (rowid, title, body) VALUES (?, ?, ?)",
+                (
+                    cursor.lastrowid,
+                    " ".join(
+                        part
+                        for part in (extracted.get("title"), extracted.get("official_title"))
+                        if part and part != "N/A"
+                    ),
+                    extracted.get("raw_text", ""),
+                ),
+            )
+            counts["indexed"] += 1
+
+        # Versions dropped from the bill's metadata (or re-extracted under a new name)
+        for text_file, (document_id, _) in indexed.items():
+            if text_file not in current:
+                self._remove(document_id)
+                counts["removed"] += 1
+        return counts
+
+    def update(self, repo_root: Path, bills: Dict[str, Dict]) -> Dict[str, int]:
+        """Update the documents of the given bills (bill key -> manifest entry)."""
+        totals = {"indexed": 0, "removed": 0, "unchanged": 0}
+        for bill_key, entry in bills.items():
+            for key, count in self.update_bill(repo_root, bill_key, entry).items():
+                totals[key] += count
+        self.connection.commit()
+        return totals
+
+    def update_all(self, repo_root: Path, manifest_bills: Dict[str, Dict]) -> Dict[str, int]:
+        """
+        Update every bill: those in the manifest and those only on disk.
+
+        Records the full pass, so update_search_index() does it only once.
+        """
+        bills = dict(manifest_bills)
+        for bill_key in find_bill_keys(repo_root):
+            bills.setdefault(bill_key, {})
+        totals = self.update(repo_root, bills)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO index_state (key, value) VALUES ('full_scan', ?)",
+            (get_utc_timestamp(),),
+        )
+        self.connection.commit()
+        return totals
+
+    def has_full_scan(self) -> bool:
+        """True once update_all() has been through every bill."""
+        row = self.connection.execute(
+            "SELECT value FROM index_state WHERE key = 'full_scan'"
+        ).fetchone()
+        return row is not None
+
+    def search(
+        self,
+        query: str,
+        state: Optional[str] = None,
+        session: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict]:
+        """
+        Find documents matching an FTS5 query, best matches first.
+
+        Args:
+            query: FTS5 query (words, "exact phrases", AND/OR/NOT, prefix*)
+            state: Only documents of this state (optional)
+            session: Only documents of this session (optional)
+            limit: Maximum number of results
+
+        Returns:
+            Per match: bill_id, state, session, note, media_type, text_file
+            and a snippet with the matched words in [brackets]
+        """
+        sql = (
+            "SELECT d.bill_id, d.state, d.session, d.note, d.media_type, d.text_file, "
+            "snippet(document_text, 1, '[', ']', '…', 16) "
+            "FROM document_text JOIN documents d ON d.id = document_text.rowid "
+            "WHERE document_text MATCH ?"
+        )
+        parameters: list = [query]
+        if state:
+            sql += " AND d.state = ?"
+            parameters.append(state)
+        if session:
+            sql += " AND d.session = ?"
+            parameters.append(session)
+        sql += " ORDER BY rank LIMIT ?"
+        parameters.append(limit)
+
+        fields = ("bill_id", "state", "session", "note", "media_type", "text_file", "snippet")
+        return [dict(zip(fields, row)) for row in self.connection.execute(sql, parameters)]
+
+    def document_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+
+def update_search_index(
+    repo_root: Path,
+    bills: Dict[str, Dict],
+    manifest_bills: Optional[Dict[str, Dict]] = None,
+) -> Optional[Path]:
+    """
+    Update the search index for the given bills.
+
+    Args:
+        repo_root: Root of the calling repo
+        bills: Bill key -> manifest entry, for the bills changed by the run
+        manifest_bills: Every manifest entry; if given and the index has not
+            been through every bill yet, all bills in the repo are indexed
+
+    Returns:
+        Path of the index, or None if it could not be updated
+    """
+    index_path = get_search_index_path(repo_root)
+    index = SearchIndex(index_path)
+    if not index.open():
+        return None
+    try:
+        if manifest_bills is not None and not index.has_full_scan():
+            print("🔎 Indexing every extracted bill (first search index update)...")
+            totals = index.update_all(repo_root, manifest_bills)
+        else:
+            totals = index.update(repo_root, bills)
+        if totals["indexed"] or totals["removed"]:
+            print(
+                f"🔎 Search index: {totals['indexed']} documents indexed, "
+                f"{totals['removed']} removed ({index.document_count()} total)"
+            )
+    except sqlite3.Error as e:
+        print(f"❌ Error updating search index: {e}")
+        return None
+    finally:
+        index.close()
+    return index_path
@@ -0,0 +1,278 @@
+"""
+Sharding - split one state's extraction across parallel jobs.
+
+With --shard i/N, a run only extracts the bills whose stable hash (of the
+bill path relative to the repo root) falls in shard i of N, so N matrix jobs
+cover every bill exactly once. The assignment only depends on the bill path,
+so a bill stays in the same shard from run to run.
+
+Shards never write the shared state in .windycivi/ (manifest, failure
+ledger, engine stats, queue), which would conflict between parallel
+jobs. Each shard writes one fragment instead:
+
+    .windycivi/extraction_shards/shard-<i>-of-<N>.json
+
+including its failed bills (each matrix job runs on its own runner, so only
+what is committed under .windycivi/ reaches the merge). Once every shard has
+finished, merge_shard_fragments() (main.py --merge-shards) folds the
+fragments into the shared state and combines the failures into one report.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .common import (
+    failed_urls,
+    failed_urls_changed,
+    get_failed_bills,
+    load_failure_ledger,
+    merge_failed_bills_reports,
+    save_failure_ledger,
+)
+from .extraction_manifest import ExtractionManifest, get_utc_timestamp
+from .extraction_queue import ExtractionQueue
+from .pdf_engines import PdfEngineSelector
+from .search_index import update_search_index
+
+Shard = Tuple[int, int]
+
+
+def parse_shard(value: Optional[str]) -> Optional[Shard]:
+    """
+    Parse a shard spec like "0/4" (shard index from 0, shard count).
+
+    Returns:
+        (index, count), or None for an empty value
+    """
+    if value is None or str(value).strip() == "":
+        return None
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", str(value))
+    if not match:
+        raise ValueError(f"Invalid shard '{value}' (expected i/N, e.g. 0/4)")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or index >= count:
+        raise ValueError(f"Invalid shard '{value}' (index must be 0 to N-1)")
+    return index, count
+
+
+def shard_label(shard: Shard) -> str:
+    """File name label for a shard, e.g. "shard-0-of-4"."""
+    return f"shard-{shard[0]}-of-{shard[1]}"
+
+
+def shard_of(bill_key: str, count: int) -> int:
+    """
+    Shard a bill belongs to.
+
+    Uses SHA-1 of the bill key rather than hash(), which is randomized per
+    process and would move bills between shards.
+    """
+    digest = hashlib.sha1(bill_key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def get_shards_dir(repo_root: Path) -> Path:
+    """Get the shard fragment folder in the calling repo."""
+    return repo_root / ".windycivi" / "extraction_shards"
+
+
+def get_fragment_path(repo_root: Path, shard: Shard) -> Path:
+    return get_shards_dir(repo_root) / f"{shard_label(shard)}.json"
+
+
+def save_shard_fragment(
+    repo_root: Path,
+    shard: Shard,
+    manifest: ExtractionManifest,
+    pdf_engine_selector: PdfEngineSelector,
+    queue: ExtractionQueue,
+    remaining: Dict[str, str],
+    full_scan: bool,
+) -> Path:
+    """
+    Write what this shard changed in the shared state.
+
+    Args:
+        repo_root: Root of the calling repo
+        shard: (index, count) of this shard
+        manifest: Manifest; only the bills this run changed are written
+        pdf_engine_selector: Engine selector; its per-document records are written
+        queue: Extraction queue this shard read (its files are not consumed)
+        remaining: Bill key -> reason for this shard's bills that stay queued
+        full_scan: True if this shard scanned all its bills (deferred ones stay queued)
+
+    Returns:
+        Path of the fragment
+    """
+    fragment_path = get_fragment_path(repo_root, shard)
+    fragment = {
+        "shard": shard[0],
+        "count": shard[1],
+        "finished_at": get_utc_timestamp(),
+        "full_scan": full_scan,
+        "queue_files": sorted(f.name for f in queue.files),
+        "remaining": remaining,
+        "manifest": manifest.touched_bills(),
+        # URL -> ledger entry, or None if this shard cleared it
+        "failure_ledger": {url: failed_urls.get(url) for url in failed_urls_changed},
+        "pdf_engine_documents": pdf_engine_selector.documents,
+        "failed_bills": get_failed_bills(),
+    }
+
+    try:
+        fragment_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = fragment_path.with_name(fragment_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fragment, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, fragment_path)
+    except Exception as e:
+        print(f"❌ Error saving shard fragment {fragment_path}: {e}")
+    return fragment_path
+
+
+def load_shard_fragments(repo_root: Path) -> List[Tuple[Path, Dict]]:
+    """Read every shard fragment in the calling repo."""
+    fragments = []
+    for fragment_path in sorted(get_shards_dir(repo_root).glob("shard-*.json")):
+        try:
+            with open(fragment_path, "r", encoding="utf-8") as f:
+                fragments.append((fragment_path, json.load(f)))
+        except Exception as e:
+            print(f"⚠️ Could not read shard fragment {fragment_path}: {e}")
+    return fragments
+
+
+def merge_shard_fragments(
+    repo_root: Path,
+    output_folder: Optional[Path] = None,
+    state: str = "unknown",
+    search_index: bool = False,
+) -> Dict[str, int]:
+    """
+    Fold every shard fragment into the shared state in .windycivi/.
+
+    - Manifest entries and failure ledger changes are merged in
+    - PDF engine records are added to the engine stats
+    - Queue files are deleted once every shard of the run has consumed them;
+      each shard's remaining bills are re-queued
+    - The full scan is recorded if every shard completed one
+    - The shards' failed bills are combined into one report (if output_folder
+      is given)
+    - The search index is updated for the merged bills (if search_index is set)
+
+    Fragments are deleted once every shard's fragment has been merged. While
+    shards are missing they are kept, marked merged_at, so a later merge
+    (after the late shards finish) still sees their queue files, remaining
+    bills and full scan, without merging their state a second time.
+
+    Returns:
+        Dictionary with merge statistics
+    """
+    fragments = load_shard_fragments(repo_root)
+    if not fragments:
+        print("📭 No shard fragments to merge")
+        return {"shards": 0, "bills": 0, "remaining": 0}
+
+    counts = {fragment.get("count") for _, fragment in fragments}
+    if len(counts) > 1:
+        print(f"⚠️ Shard fragments from different shard counts: {sorted(counts)}")
+    count = max(counts)
+    shards_present = {f.get("shard") for _, f in fragments if f.get("count") == count}
+    complete = len(shards_present) == count
+    if not complete:
+        missing = sorted(set(range(count)) - shards_present)
+        print(f"⚠️ Missing fragments for shards {missing} of {count}")
+
+    manifest = ExtractionManifest()
+    manifest.load(repo_root)
+    load_failure_ledger(repo_root)
+    pdf_engine_selector = PdfEngineSelector()
+    pdf_engine_selector.load(repo_root)
+    queue = ExtractionQueue()
+    queue.load(repo_root)
+
+    remaining: Dict[str, str] = {}
+    shard_failures: Dict[str, Dict] = {}
+    merged_bills = 0
+    merged_keys = set()
+    for _, fragment in fragments:
+        if fragment.get("merged_at"):
+            # Merged by an earlier, incomplete merge; its bills are queued already
+            continue
+        manifest.merge(fragment.get("manifest", {}))
+        merged_keys.update(fragment.get("manifest", {}))
+        merged_bills += len(fragment.get("manifest", {}))
+        for url, entry in fragment.get("failure_ledger", {}).items():
+            if entry is None:
+                failed_urls.pop(url, None)
+            else:
+                failed_urls[url] = entry
+            failed_urls_changed.add(url)
+        for document in fragment.get("pdf_engine_documents", []):
+            pdf_engine_selector.record(
+                document["url"],
+                document["bytes"],
+                document.get("engine"),
+                document.get("attempts", []),
+                verbose=False,
+            )
+        remaining.update(fragment.get("remaining", {}))
+        if "failed_bills" in fragment:
+            shard_failures[shard_label((fragment["shard"], fragment["count"]))] = fragment[
+                "failed_bills"
+            ]
+
+    # A queue file can only go once no shard still has to read it
+    if complete:
+        consumed = set.intersection(
+            *(set(f.get("queue_files", [])) for _, f in fragments if f.get("count") == count)
+        )
+    else:
+        consumed = set()
+    queue.files = [f for f in queue.files if f.name in consumed]
+
+    manifest.save(repo_root)
+    save_failure_ledger(repo_root)
+    pdf_engine_selector.save(repo_root)
+    queue.complete(repo_root, remaining)
+    if complete and all(f.get("full_scan") for _, f in fragments):
+        queue.mark_full_scan(repo_root)
+    if search_index:
+        update_search_index(
+            repo_root,
+            {key: manifest.bills[key] for key in merged_keys if key in manifest.bills},
+            manifest.bills,
+        )
+
+    if output_folder:
+        merge_failed_bills_reports(output_folder, state, shard_failures)
+
+    if complete:
+        for fragment_path, _ in fragments:
+            fragment_path.unlink(missing_ok=True)
+    else:
+        merged_at = get_utc_timestamp()
+        for fragment_path, fragment in fragments:
+            if fragment.get("merged_at"):
+                continue
+            fragment["merged_at"] = merged_at
+            try:
+                with open(fragment_path, "w", encoding="utf-8") as f:
+                    json.dump(fragment, f, indent=1, sort_keys=True)
+            except Exception as e:
+                print(f"⚠️ Could not mark shard fragment {fragment_path} as merged: {e}")
+        print("📌 Keeping the merged fragments until the missing shards finish")
+
+    print(
+        f"🧩 Merged {len(fragments)} shard fragments: {merged_bills} bills, "
+        f"{len(remaining)} still queued"
+    )
+    return {
+        "shards": len(fragments),
+        "bills": merged_bills,
+        "remaining": len(remaining),
+    }
@@ -6,33 +6,67 @@ This module imports specialized extractors and provides high-level orchestration
 
 import re
 import time
-import random
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Dict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
 import json
-from datetime import datetime
 
 # Import all common functions from common.py
 from .common import (
-    download_with_retry,
-    download_bill_text,
+    DEFAULT_MAX_DOWNLOAD_BYTES,
     record_failed_bill,
     save_failed_bills_report,
     reset_error_tracking,
-    rotate_session,
-    get_congress_gov_headers,
-    fetch_working_proxies,
+    configure_error_log,
+    get_total_failed,
+    load_failure_ledger,
+    save_failure_ledger,
+    get_failure_ledger_path,
+    get_url_backoff,
+    record_backoff_skip,
+    clear_url_failure,
+    backoff_skips,
+    get_http_client,
+    configure_http_client,
+    save_http_metrics_report,
 )
 
-# Import specialized extractors
-from .xml_extractor import extract_text_from_xml
-from .html_extractor import download_html_content, extract_text_from_html
-from .pdf_extractor import (
-    download_pdf_content,
-    extract_text_from_pdf,
-    extract_text_with_strikethroughs,
-    debug_pdf_structure,
+# Extractors are plugins per media type, imported on first use
+from .extractors import get_extractor, select_best_link
+from .pdf_engines import PdfEngineSelector, get_engine_stats_path
+from .document_metrics import DocumentMetrics
+from .coalescing import DocumentCoalescer
+from .download_strategies import reset_strategy_memory
+from .output_writer import (
+    get_sidecar_path,
+    write_compact_text,
+    write_compact_text_from_parts,
+    write_extracted_text,
+    write_extracted_text_from_parts,
 )
+from .originals import resolve_compression, stored_variants, write_original
+from .version_deltas import (
+    get_delta_path,
+    materialize_dependents,
+    store_as_delta,
+    stored_text_exists,
+)
+from .parse_worker import IsolatedParser, ParseOutcome, run_parser
+from .extraction_manifest import (
+    ExtractionManifest,
+    get_manifest_path,
+    get_utc_timestamp,
+    version_key,
+)
+from .extraction_queue import ExtractionQueue, get_extraction_queue_dir
+from .checkpoint import Checkpointer, record_written_path, reset_written_paths
+from .scheduler import ExtractionScheduler, TimeBudget, save_deferred_report
+from .sharding import Shard, save_shard_fragment, shard_label, shard_of
+from .search_index import update_search_index
+
+if TYPE_CHECKING:
+    from .pdf_extractor import PdfStreamPolicy
 
 
 def create_safe_filename(
@@ -65,112 +99,92 @@ def create_safe_filename(
     return filename
 
 
-def download_congress_gov_content(url: str) -> str:
-    """Download content from congress.gov with specialized anti-blocking techniques."""
-    try:
-        # Fetch working proxies for aggressive mode
-        fetch_working_proxies()
-
-        # For amendment URLs, try the /text endpoint first
-        if "/amendment/" in url and not url.endswith("/text"):
-            text_url = url + "/text"
-            print(f"   🔄 Trying /text endpoint: {text_url}")
-
-            # Try the /text endpoint first with aggressive mode
-            response = download_with_retry(
-                text_url, max_retries=5, delay=2.0, use_aggressive_mode=True
-            )
-            if response:
-                return response.text
-
-            print(f"   ⚠️ /text endpoint failed, trying original URL: {url}")
-
-        # Try the enhanced retry function on original URL with aggressive mode
-        response = download_with_retry(
-            url, max_retries=5, delay=2.0, use_aggressive_mode=True
-        )
-        if response:
-            return response.text
-
-        # If that fails, try a different approach with session warming
-        print(f"   🔄 Trying session warming approach for {url}")
-
-        # Warm up the session by visiting the main page first
-        session = rotate_session()
-        warmup_headers = get_congress_gov_headers()
-
-        try:
-            # Visit main page to establish session
-            session.get(
-                "https://www.congress.gov/",
-                headers=warmup_headers,
-                timeout=30,
-                verify=False,
-            )
-            time.sleep(random.uniform(2, 4))
-
-            # For amendment URLs, try /text endpoint first
-            target_url = url
-            if "/amendment/" in url and not url.endswith("/text"):
-                target_url = url + "/text"
-                print(f"   🔄 Session warming: trying /text endpoint: {target_url}")
-
-            # Now try the target URL
-            response = session.get(
-                target_url, headers=warmup_headers, timeout=45, verify=False
-            )
-            if response.status_code == 200:
-                return response.text
-
-            # If /text failed, try original URL
-            if target_url != url:
-                print(f"   🔄 Session warming: trying original URL: {url}")
-                response = session.get(
-                    url, headers=warmup_headers, timeout=45, verify=False
-                )
-                if response.status_code == 200:
-                    return response.text
-        except:
-            pass
-
-        # Final fallback: try with curl-like headers
-        print(f"   🔄 Trying curl-like approach for {url}")
-        curl_headers = {
-            "User-Agent": "curl/7.68.0",
-            "Accept": "*/*",
-            "Connection": "keep-alive",
-        }
-
-        session = rotate_session()
-
-        # For amendment URLs, try /text endpoint first
-        target_url = url
-        if "/amendment/" in url and not url.endswith("/text"):
-            target_url = url + "/text"
-            print(f"   🔄 Curl fallback: trying /text endpoint: {target_url}")
-
-        response = session.get(
-            target_url, headers=curl_headers, timeout=45, verify=False
-        )
-        if response.status_code == 200:
-            return response.text
-
-        # If /text failed, try original URL
-        if target_url != url:
-            print(f"   🔄 Curl fallback: trying original URL: {url}")
-            response = session.get(url, headers=curl_headers, timeout=45, verify=False)
-            if response.status_code == 200:
-                return response.text
-
-        return None
-
-    except Exception as e:
-        print(f"   ❌ Failed to download congress.gov content: {e}")
-        return None
+def get_text_filename(filename: str, file_extension: str) -> str:
+    """_extracted.txt file name for a document's original file name."""
+    # Handle both lowercase and uppercase extensions (e.g., .html vs .HTM)
+    if filename.endswith(f".{file_extension}"):
+        return filename.replace(f".{file_extension}", "_extracted.txt")
+    if filename.endswith(f".{file_extension.upper()}"):
+        return filename.replace(f".{file_extension.upper()}", "_extracted.txt")
+    # Fallback: just append _extracted.txt
+    return filename.rsplit(".", 1)[0] + "_extracted.txt"
+
+
+def record_parse_limit_failure(
+    outcome: ParseOutcome,
+    bill_id: str,
+    url: str,
+    metadata_file: Path,
+    media_type: str,
+    item_note: str,
+    output_folder: Path = None,
+) -> None:
+    """Record a document that exceeded the parse timeout or memory ceiling."""
+    print(f"   🚧 Parse limit hit ({outcome.status}): {outcome.error}")
+    record_failed_bill(
+        bill_id=bill_id,
+        error_type="parse_limit",
+        error_message=outcome.error,
+        url=url,
+        metadata_file=str(metadata_file),
+        additional_info={
+            "media_type": media_type,
+            "item_note": item_note,
+            "limit": outcome.status,
+            "elapsed_seconds": round(outcome.elapsed, 1),
+            "peak_rss_mb": round(outcome.peak_rss_mb, 1),
+        },
+        output_folder=output_folder,
+    )
+
+
+def get_document_references(metadata: Dict) -> List[tuple]:
+    """(url, extension) of every document extraction will visit for a bill."""
+    references = []
+    for item in metadata.get("versions", []):
+        best_link = select_best_link(item.get("links", []))
+        if best_link:
+            plugin = get_extractor(best_link.get("media_type", ""))
+            references.append((best_link.get("url"), plugin.extension))
+    return references
+
+
+def record_download_metrics(
+    metric: Dict, started: float, requests_before: int, size: Optional[int]
+) -> None:
+    """Fill in the download part of a document metrics record."""
+    metric["download_seconds"] = round(time.monotonic() - started, 3)
+    metric["bytes"] = size
+    # Requests beyond the first were retries (or redirects)
+    requests = get_http_client().metrics.thread_requests() - requests_before
+    metric["retries"] = max(requests - 1, 0)
+    if size is not None:
+        metric["status"] = "parse_failed"
+
+
+def record_parse_metrics(metric: Dict, outcome: ParseOutcome, parser_name: str = None) -> None:
+    """Add a parse step's time (and the parser, if not known yet) to a metrics record."""
+    metric["parse_seconds"] = round((metric.get("parse_seconds") or 0.0) + outcome.elapsed, 3)
+    if parser_name and not metric.get("parser"):
+        metric["parser"] = parser_name
 
 
 def extract_bill_text_from_metadata(
-    metadata_file: Path, files_dir: Path, output_folder: Path = None
+    metadata_file: Path,
+    files_dir: Path,
+    output_folder: Path = None,
+    parser: IsolatedParser = None,
+    pdf_stream_policy: "PdfStreamPolicy" = None,
+    pdf_engine_selector: PdfEngineSelector = None,
+    metadata: Dict = None,
+    manifest: ExtractionManifest = None,
+    skip_extracted_versions: bool = False,
+    output_format: str = "full",
+    compress_originals: str = "none",
+    max_download_bytes: int = DEFAULT_MAX_DOWNLOAD_BYTES,
+    document_metrics: DocumentMetrics = None,
+    coalescer: DocumentCoalescer = None,
+    version_deltas: bool = False,
 ) -> bool:
     """
     Extract bill text for a single bill from its metadata.json file.
@@ -179,14 +193,33 @@ def extract_bill_text_from_metadata(
         metadata_file: Path to metadata.json file
         files_dir: Path to files/ directory for this bill
         output_folder: Path to calling repo root for error reporting (optional)
+        parser: Isolated parse worker (optional, parses in-process if None)
+        pdf_stream_policy: Stream PDFs page by page with these limits (optional)
+        pdf_engine_selector: Chooses and records PDF engines (quality order if None)
+        metadata: Already-loaded contents of metadata_file (read from disk if None)
+        manifest: Extraction manifest to record extracted versions in (optional)
+        skip_extracted_versions: Skip versions the manifest already has (same
+            note, URL and media type, text file still present)
+        output_format: "full" (sections plus raw text) or "compact" (normalized
+            text plus an _extracted.json sidecar with section offsets)
+        compress_originals: Store originals as-is ("none") or compressed with
+            a content hash in the name ("gzip", "zstd")
+        max_download_bytes: PDFs larger than this are not downloaded (None for no cap)
+        document_metrics: Collects download/parse metrics per document (optional)
+        coalescer: Run-wide map that fetches and parses each shared URL once (optional)
+        version_deltas: Store each version's text as a line delta against the
+            version before it when that is much smaller (see version_deltas)
 
     Returns:
         True if successful, False otherwise
     """
+    # Temp folder for downloaded PDFs and streaming part files, removed at the end
+    work_root = None
     try:
-        # Load metadata
-        with open(metadata_file, "r", encoding="utf-8") as f:
-            metadata = json.load(f)
+        # Load metadata unless the caller already has it
+        if metadata is None:
+            with open(metadata_file, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
 
         # Extract bill ID for error tracking
         bill_id = metadata.get("identifier", "unknown")
@@ -194,14 +227,6 @@ def extract_bill_text_from_metadata(
             # Try to extract from file path as fallback
             bill_id = metadata_file.parent.name
 
-        # Define media type preference order (best to worst)
-        MEDIA_TYPE_PREFERENCE = [
-            "text/xml",  # Best: Structured XML data
-            "text/html",  # Good: HTML content
-            "application/pdf",  # Acceptable: PDF files
-            "text/plain",  # Basic: Plain text
-        ]
-
         # Process only versions array (primary bill text)
         # Skip documents array (contains amendments/supporting materials that often fail to download)
         arrays_to_process = []
@@ -216,84 +241,243 @@ def extract_bill_text_from_metadata(
             return True  # Don't count as error
 
         success_count = 0
+        attempted_count = 0
+        backoff_count = 0
+        unchanged_count = 0
+        current_versions = []
+        bill_key = manifest.bill_key(metadata_file.parent) if manifest else None
 
         for array_name, items in arrays_to_process:
             priority = "🟢 PRIMARY" if array_name == "versions" else "🟡 SUPPORTING"
             print(f"   📋 Processing {array_name} array... ({priority})")
 
+            # Items with a usable link (the best one by preference order) and
+            # their file names, up front: delta mode stores every version
+            # against the one listed before it
+            linked = []
             for item in items:
+                best_link = select_best_link(item.get("links", []))
+                if not best_link:
+                    continue  # Skip items without a suitable link
+                plugin = get_extractor(best_link.get("media_type", ""))
+                filename = create_safe_filename(
+                    best_link.get("url"), item.get("note", ""), plugin.extension
+                )
+                linked.append((item, best_link, plugin, filename))
+            text_dir = files_dir / "documents" if array_name == "documents" else files_dir
+            text_files = [
+                text_dir / get_text_filename(filename, plugin.extension)
+                for _, _, plugin, filename in linked
+            ]
+
+            for position, (item, best_link, plugin, filename) in enumerate(linked):
                 item_note = item.get("note", "")
-                links = item.get("links", [])
-
-                if not links:
-                    continue  # Skip items without links
-
-                # Find best available link based on preference order
-                best_link = None
-                best_media_type = None
-
-                for link in links:
-                    media_type = link.get("media_type", "")
-                    url = link.get("url")
+                url = best_link.get("url")
+                media_type = best_link.get("media_type", "")
+                file_extension = plugin.extension
 
-                    if not url:
+                # Result kept by an earlier bill's visit to the same URL in this run
+                cached = (
+                    coalescer.claim(url, file_extension) if coalescer is not None else None
+                )
+                text_file = text_files[position]
+                text_filename = text_file.name
+
+                # Delta mode stores this version against the one listed before
+                # it, so only the next version's delta can be based on it
+                base_text_file = text_files[position - 1] if position else None
+                next_text_files = text_files[position + 1 : position + 2]
+
+                current_versions.append(version_key(url, item_note, media_type))
+                if skip_extracted_versions and manifest is not None:
+                    extracted = manifest.get_version(
+                        bill_key, url, item_note, media_type
+                    )
+                    if extracted is not None:
+                        unchanged = stored_text_exists(
+                            metadata_file.parent / extracted["text_file"]
+                        )
+                    else:
+                        # Extracted before the manifest tracked versions
+                        unchanged = stored_text_exists(text_file)
+                        if unchanged:
+                            manifest.record_version(
+                                bill_key,
+                                url,
+                                item_note,
+                                media_type,
+                                text_file.relative_to(metadata_file.parent).as_posix(),
+                            )
+                    if unchanged:
+                        print(f"   ⏭️  Version already extracted: {item_note}")
+                        unchanged_count += 1
                         continue
 
-                    # Check if this media type is better than current best
-                    for preferred_type in MEDIA_TYPE_PREFERENCE:
-                        if preferred_type in media_type.lower():
-                            if best_link is None or MEDIA_TYPE_PREFERENCE.index(
-                                preferred_type
-                            ) < MEDIA_TYPE_PREFERENCE.index(best_media_type):
-                                best_link = link
-                                best_media_type = preferred_type
-                            break
-
-                if not best_link:
-                    continue  # Skip if no suitable link found
-
-                url = best_link.get("url")
-                media_type = best_link.get("media_type", "")
+                backoff = get_url_backoff(url)
+                if backoff:
+                    print(
+                        f"   ⏳ Skipping document in backoff after {backoff['attempts']} failed attempts "
+                        f"({backoff['error_type']}, next try {backoff['next_attempt'][:16]}): {url}"
+                    )
+                    record_backoff_skip(url)
+                    backoff_count += 1
+                    continue
 
+                attempted_count += 1
                 print(f"   📥 Downloading: {url} (type: {media_type})")
 
+                # Filled in as the document goes through download, parse and save
+                metric = (
+                    document_metrics.start(url, media_type, bill_id)
+                    if document_metrics is not None
+                    else {}
+                )
+                requests_before = get_http_client().metrics.thread_requests()
+                download_started = time.monotonic()
+
                 # Download content based on media type
                 content = None
+                streamed = None
                 strikethrough_info = None
-
-                if "xml" in media_type.lower():
-                    content = download_bill_text(url)
-                elif "html" in media_type.lower():
-                    content = download_html_content(
-                        url, download_with_retry, download_congress_gov_content
+                pdf_path = None
+
+                if cached is not None:
+                    # Fetched and parsed by an earlier bill in this run
+                    print(f"   ♻️ Reusing document fetched for {cached.bill_id} in this run")
+                    coalescer.record_reuse(cached)
+                    content = cached.content
+                    pdf_path = cached.pdf_path
+                    streamed = cached.streamed
+                    strikethrough_info = cached.strikethrough_info
+                    metric.update(
+                        {
+                            "status": "parse_failed",
+                            "reused": True,
+                            "download_seconds": 0.0,
+                            "bytes": cached.size,
+                            "parser": cached.parser,
+                            "parse_seconds": 0.0,
+                        }
                     )
-                elif "pdf" in media_type.lower():
-                    # Try enhanced strikethrough detection first
-                    strikethrough_result = extract_text_with_strikethroughs(
-                        url, download_with_retry
+                elif plugin.downloads_to_file:
+                    # Download once straight to a temp file, then parse it
+                    # (strikethrough detection first, plain extraction as
+                    # fallback) inside the parse worker, which gets the path
+                    pdf_module = plugin.load()
+                    if work_root is None:
+                        work_root = tempfile.mkdtemp(prefix="bill_text_")
+                    work_dir = tempfile.mkdtemp(dir=work_root)
+                    pdf_path = Path(work_dir) / f"original.{file_extension}"
+                    pdf_size = plugin.download_function()(
+                        url, pdf_path, max_download_bytes
                     )
-                    if strikethrough_result and strikethrough_result.get("raw_text"):
-                        content = strikethrough_result["raw_text"]
-                        strikethrough_info = {
-                            "has_strikethroughs": strikethrough_result.get(
-                                "has_strikethroughs", False
-                            ),
-                            "strikethrough_count": strikethrough_result.get(
-                                "strikethrough_count", 0
-                            ),
-                        }
-                        if strikethrough_info["has_strikethroughs"]:
-                            print(
-                                f"   🔍 Detected {strikethrough_info['strikethrough_count']} strikethrough sections"
+                    record_download_metrics(
+                        metric, download_started, requests_before, pdf_size
+                    )
+                    if pdf_size is not None:
+                        if pdf_engine_selector is None:
+                            pdf_engine_selector = PdfEngineSelector()
+                        engines, fallback_engines = pdf_engine_selector.engine_order(
+                            url, pdf_size
+                        )
+                        if pdf_stream_policy is not None:
+                            # Stream pages to part files instead of holding the text
+                            outcome = run_parser(
+                                parser,
+                                pdf_module.stream_pdf_document,
+                                str(pdf_path),
+                                work_dir,
+                                pdf_stream_policy,
+                                url,
+                                engines,
+                                fallback_engines,
                             )
-                    else:
-                        # Fallback to regular PDF extraction
-                        content = download_pdf_content(url, download_with_retry)
+                        else:
+                            outcome = run_parser(
+                                parser,
+                                pdf_module.parse_pdf_document,
+                                str(pdf_path),
+                                url,
+                                engines,
+                                fallback_engines,
+                            )
+
+                        record_parse_metrics(metric, outcome)
+                        if outcome.ok and outcome.result:
+                            metric["parser"] = outcome.result.get("engine")
+                            metric["pages"] = outcome.result.get("pages")
+                            metric["chars"] = next(
+                                (
+                                    attempt.get("chars")
+                                    for attempt in outcome.result.get("engine_attempts", [])
+                                    if attempt.get("ok")
+                                ),
+                                None,
+                            )
+                            pdf_engine_selector.record(
+                                url,
+                                pdf_size,
+                                outcome.result.get("engine"),
+                                outcome.result.get("engine_attempts", []),
+                            )
+                        elif outcome.hit_limit:
+                            # Charge the limit to the engine that was running first
+                            pdf_engine_selector.record(
+                                url,
+                                pdf_size,
+                                None,
+                                [
+                                    {
+                                        "engine": engines[0],
+                                        "seconds": round(outcome.elapsed, 3),
+                                        "chars": 0,
+                                        "ok": False,
+                                        "error": outcome.status,
+                                    }
+                                ],
+                            )
+
+                        if outcome.hit_limit:
+                            metric["status"] = "parse_limit"
+                            record_parse_limit_failure(
+                                outcome,
+                                bill_id,
+                                url,
+                                metadata_file,
+                                media_type,
+                                item_note,
+                                output_folder,
+                            )
+                            continue
+                        if outcome.ok and outcome.result:
+                            if pdf_stream_policy is not None:
+                                streamed = outcome.result
+                            else:
+                                content = outcome.result.get("raw_text")
+                            strikethrough_info = {
+                                "has_strikethroughs": outcome.result.get(
+                                    "has_strikethroughs", False
+                                ),
+                                "strikethrough_count": outcome.result.get(
+                                    "strikethrough_count", 0
+                                ),
+                            }
+                            if strikethrough_info["has_strikethroughs"]:
+                                print(
+                                    f"   🔍 Detected {strikethrough_info['strikethrough_count']} strikethrough sections"
+                                )
+                        else:
+                            print(f"   ⚠️ PDF parsing failed: {outcome.error}")
                 else:
-                    print(f"   ⚠️ Unsupported media type: {media_type}")
-                    continue
+                    content = plugin.download_function()(url)
+                    record_download_metrics(
+                        metric,
+                        download_started,
+                        requests_before,
+                        len(content.encode("utf-8")) if content else None,
+                    )
 
-                if not content:
+                if not content and not streamed:
                     print(f"   ❌ Failed to download: {url}")
                     record_failed_bill(
                         bill_id=bill_id,
@@ -309,59 +493,77 @@ def extract_bill_text_from_metadata(
                     )
                     continue
 
-                print(f"   📄 Downloaded {len(content)} characters")
-
-                # Extract text based on content type
-                extracted_data = None
-                if "xml" in media_type.lower():
-                    extracted_data = extract_text_from_xml(content)
-                elif "html" in media_type.lower():
-                    extracted_data = extract_text_from_html(content)
-                elif "pdf" in media_type.lower():
-                    extracted_data = extract_text_from_pdf(content)
-                else:
-                    extracted_data = {
-                        "raw_text": content,
-                        "title": "",
-                        "official_title": "",
-                        "sections": [],
-                    }
-
-                if "error" in extracted_data:
-                    print(f"   ❌ Failed to parse content: {extracted_data['error']}")
-                    record_failed_bill(
-                        bill_id=bill_id,
-                        error_type="parsing",
-                        error_message=extracted_data["error"],
-                        url=url,
-                        metadata_file=str(metadata_file),
-                        additional_info={
-                            "media_type": media_type,
-                            "item_note": item_note,
-                        },
-                        output_folder=output_folder,
+                if streamed:
+                    print(
+                        f"   📄 Streamed {streamed['pages']} pages ({streamed['raw_bytes']} bytes of text)"
                     )
-                    continue
+                    if streamed.get("truncated"):
+                        print(f"   ✂️ Truncated: {streamed['truncated']}")
+                else:
+                    print(f"   📄 Downloaded {len(content)} characters")
 
-                # Create filenames
-                file_extension = (
-                    "xml"
-                    if "xml" in media_type.lower()
-                    else "html" if "html" in media_type.lower() else "pdf"
-                )
-                filename = create_safe_filename(url, item_note, file_extension)
-                # Handle both lowercase and uppercase extensions (e.g., .html vs .HTM)
-                if filename.endswith(f".{file_extension}"):
-                    text_filename = filename.replace(
-                        f".{file_extension}", "_extracted.txt"
+                    # Extract text with the media type's parser
+                    extracted_data = None
+                    if cached is not None:
+                        extracted_data = cached.extracted_data
+                    else:
+                        outcome = run_parser(parser, plugin.parse_function(), content)
+                        record_parse_metrics(
+                            metric,
+                            outcome,
+                            (outcome.result or {}).get("backend") or plugin.name,
+                        )
+                        if outcome.hit_limit:
+                            metric["status"] = "parse_limit"
+                            record_parse_limit_failure(
+                                outcome,
+                                bill_id,
+                                url,
+                                metadata_file,
+                                media_type,
+                                item_note,
+                                output_folder,
+                            )
+                            continue
+                        extracted_data = (
+                            outcome.result if outcome.ok else {"error": outcome.error}
+                        )
+
+                    if "error" in extracted_data:
+                        print(f"   ❌ Failed to parse content: {extracted_data['error']}")
+                        record_failed_bill(
+                            bill_id=bill_id,
+                            error_type="parsing",
+                            error_message=extracted_data["error"],
+                            url=url,
+                            metadata_file=str(metadata_file),
+                            additional_info={
+                                "media_type": media_type,
+                                "item_note": item_note,
+                            },
+                            output_folder=output_folder,
+                        )
+                        continue
+                    metric["chars"] = metric.get("chars") or len(
+                        extracted_data.get("raw_text", "")
                     )
-                elif filename.endswith(f".{file_extension.upper()}"):
-                    text_filename = filename.replace(
-                        f".{file_extension.upper()}", "_extracted.txt"
+
+                if coalescer is not None and cached is None:
+                    coalescer.store(
+                        url,
+                        file_extension,
+                        bill_id,
+                        size=metric.get("bytes"),
+                        parser=metric.get("parser"),
+                        content=content,
+                        pdf_path=pdf_path,
+                        extracted_data=None if streamed else extracted_data,
+                        streamed=streamed,
+                        strikethrough_info=strikethrough_info,
                     )
-                else:
-                    # Fallback: just append _extracted.txt
-                    text_filename = filename.rsplit(".", 1)[0] + "_extracted.txt"
+
+                # Parsed; what is left is saving
+                metric["status"] = "save_failed"
 
                 # Create appropriate directory structure
                 if array_name == "documents":
@@ -376,12 +578,20 @@ def extract_bill_text_from_metadata(
                     print(f"   📁 Created directory: {target_dir}")
 
                 # Save original content
-                content_file = target_dir / filename
-                print(f"   💾 Saving {file_extension.upper()} to: {content_file}")
+                print(f"   💾 Saving {file_extension.upper()} to: {target_dir / filename}")
                 try:
-                    with open(content_file, "w", encoding="utf-8") as f:
-                        f.write(content)
-                    print(f"   ✅ {file_extension.upper()} saved successfully")
+                    # Other stored variants are replaced by the new copy
+                    for variant in stored_variants(target_dir, filename):
+                        record_written_path(variant)
+                    # PDFs are stored as downloaded; XML/HTML as the decoded text
+                    content_file = write_original(
+                        target_dir,
+                        filename,
+                        pdf_path if pdf_path is not None else content,
+                        compress_originals,
+                    )
+                    record_written_path(content_file)
+                    print(f"   ✅ {file_extension.upper()} saved successfully: {content_file.name}")
                 except Exception as e:
                     print(f"   ❌ Error saving {file_extension.upper()}: {e}")
                     continue
@@ -390,32 +600,46 @@ def extract_bill_text_from_metadata(
                 text_file = target_dir / text_filename
                 print(f"   💾 Saving extracted text to: {text_file}")
                 try:
-                    with open(text_file, "w", encoding="utf-8") as f:
-                        f.write(f"Title: {extracted_data.get('title', 'N/A')}\n")
-                        f.write(
-                            f"Official Title: {extracted_data.get('official_title', 'N/A')}\n"
+                    source = f"{array_name} - {item_note}"
+                    compact = output_format == "compact"
+                    # Deltas against the old text must not see it change
+                    for dependent in materialize_dependents(text_file, next_text_files):
+                        record_written_path(dependent)
+                        record_written_path(get_delta_path(dependent))
+                    if streamed:
+                        write_parts = (
+                            write_compact_text_from_parts
+                            if compact
+                            else write_extracted_text_from_parts
                         )
-                        f.write(
-                            f"Number of Sections: {len(extracted_data.get('sections', []))}\n"
+                        write_parts(text_file, streamed, source, media_type)
+                    else:
+                        write_text = (
+                            write_compact_text if compact else write_extracted_text
                         )
-                        f.write(f"Source: {array_name} - {item_note}\n")
-                        f.write(f"Media Type: {media_type}\n")
-                        if strikethrough_info and strikethrough_info.get(
-                            "has_strikethroughs"
-                        ):
-                            f.write(
-                                f"Strikethrough Detection: {strikethrough_info['strikethrough_count']} sections found\n"
-                            )
-                        f.write("\n" + "=" * 80 + "\n\n")
-
-                        for i, section in enumerate(
-                            extracted_data.get("sections", []), 1
-                        ):
-                            f.write(f"Section {i}:\n{section}\n\n")
-
-                        f.write("\n" + "=" * 80 + "\n\n")
-                        f.write("Raw Text:\n")
-                        f.write(extracted_data.get("raw_text", ""))
+                        write_text(
+                            text_file,
+                            extracted_data,
+                            source,
+                            media_type,
+                            strikethrough_info,
+                        )
+                    record_written_path(text_file)
+                    if compact:
+                        record_written_path(get_sidecar_path(text_file))
+                    else:
+                        # Don't leave a sidecar from an earlier compact run
+                        get_sidecar_path(text_file).unlink(missing_ok=True)
+                        record_written_path(get_sidecar_path(text_file))
+                    delta_file = None
+                    if version_deltas and base_text_file is not None:
+                        delta_file = store_as_delta(text_file, base_text_file)
+                    if delta_file is not None:
+                        record_written_path(delta_file)
+                    else:
+                        # Don't leave a delta from an earlier run next to the full text
+                        get_delta_path(text_file).unlink(missing_ok=True)
+                        record_written_path(get_delta_path(text_file))
                     print(f"   ✅ Text saved successfully")
                 except Exception as e:
                     print(f"   ❌ Error saving text: {e}")
@@ -434,15 +658,46 @@ def extract_bill_text_from_metadata(
                     )
                     continue
 
+                if manifest is not None:
+                    manifest.record_version(
+                        bill_key,
+                        url,
+                        item_note,
+                        media_type,
+                        text_file.relative_to(metadata_file.parent).as_posix(),
+                    )
+
+                clear_url_failure(url)
+                metric["status"] = "ok"
                 success_count += 1
                 print(f"   ✅ Extracted text for {array_name}: {item_note}")
 
+        if manifest is not None:
+            manifest.prune_versions(bill_key, current_versions)
+
+        # Bills whose remaining documents are all unchanged are not counted as errors
+        if attempted_count == 0 and backoff_count == 0 and unchanged_count > 0:
+            return True
+
+        # Nothing new to try yet; the caller keeps the bill queued
+        if attempted_count == 0 and backoff_count > 0:
+            return False
+
+        if unchanged_count:
+            print(
+                f"   📋 {success_count} of {attempted_count} new versions extracted, {unchanged_count} unchanged"
+            )
+
         return success_count > 0
 
     except Exception as e:
         print(f"   ❌ Error processing {metadata_file}: {e}")
         return False
 
+    finally:
+        if work_root:
+            shutil.rmtree(work_root, ignore_errors=True)
+
 
 def process_bills_in_batch(
     processed_folder: Path,
@@ -450,6 +705,27 @@ def process_bills_in_batch(
     output_folder: Path = None,
     state: str = "unknown",
     incremental: bool = False,
+    parse_timeout: float = 300.0,
+    parse_max_memory_mb: float = 2048.0,
+    stream_pdf: bool = False,
+    pdf_max_pages: int = None,
+    pdf_max_bytes: int = None,
+    pdf_engine: str = "quality",
+    full_scan: bool = False,
+    time_budget: float = None,
+    checkpoint_interval: float = None,
+    checkpoint_command: str = None,
+    checkpoint_callback: Callable[[List[str]], bool] = None,
+    shard: Optional[Shard] = None,
+    error_log_mode: str = "ndjson",
+    output_format: str = "full",
+    compress_originals: str = "none",
+    max_download_bytes: int = DEFAULT_MAX_DOWNLOAD_BYTES,
+    http_pool_size: Optional[int] = None,
+    http_host_pool_sizes: Optional[Dict[str, int]] = None,
+    document_metrics_format: str = "ndjson",
+    version_deltas: bool = False,
+    search_index: bool = False,
 ) -> Dict[str, int]:
     """
     Process bills in batches for text extraction.
@@ -459,42 +735,246 @@ def process_bills_in_batch(
         batch_size: Number of bills to process in each batch
         output_folder: Path to save error reports (optional)
         state: State identifier for error reports (optional)
+        parse_timeout: Seconds a single document may spend parsing (0 disables isolation)
+        parse_max_memory_mb: Resident memory ceiling for the parse worker in MB
+        stream_pdf: Extract PDFs page by page, flushing text to disk as it goes
+        pdf_max_pages: Stop streaming a PDF after this many pages (optional)
+        pdf_max_bytes: Stop streaming a PDF after this many bytes of text (optional)
+        pdf_engine: PDF engine strategy - quality, fast or auto
+        full_scan: Scan every metadata.json instead of the extraction queue
+        time_budget: Seconds the run may take; bills not started in time are
+            deferred to the next run (optional)
+        checkpoint_interval: Seconds between checkpoints taken between bills (optional)
+        checkpoint_command: Shell command that commits a checkpoint; run in
+            processed_folder with CHECKPOINT_PATHS_FILE set (optional)
+        checkpoint_callback: In-process alternative to checkpoint_command,
+            called with the changed paths (optional)
+        shard: (index, count) - only extract this shard's bills, and write a
+            shard fragment instead of the shared .windycivi/ state (optional)
+        error_log_mode: "ndjson" appends failures to one log per run, "files"
+            writes one JSON file per failure
+        output_format: "full" or "compact" _extracted.txt files (see output_writer)
+        compress_originals: "none", "gzip" or "zstd" storage for original
+            documents (see originals)
+        max_download_bytes: Size cap for downloaded PDFs (None for no cap)
+        http_pool_size: Connections kept alive per host (optional; the shared
+            HTTP client is left as it is when neither pool option is given)
+        http_host_pool_sizes: Host -> pool size for hosts that need their own
+            size (optional)
+        document_metrics_format: "ndjson" or "csv" for the per-document
+            metrics report (see document_metrics)
+        version_deltas: Store later versions of a bill as line deltas against
+            the version before them (see version_deltas)
+        search_index: Keep the full-text search index in .windycivi/ up to
+            date with the documents this run extracted (see search_index)
 
     Returns:
         Dictionary with processing statistics
     """
+    # The time budget covers the whole run, including the scan
+    budget = TimeBudget(time_budget)
+    if time_budget:
+        print(f"⏳ Time budget: {time_budget:.0f}s")
+
     # Reset error tracking for this run
     reset_error_tracking()
+    reset_written_paths()
+    # What each host's fallback strategies did is only trusted within a run
+    strategy_memory = reset_strategy_memory()
 
-    # Find all metadata.json files
-    metadata_files = list(processed_folder.rglob("metadata.json"))
+    if http_pool_size or http_host_pool_sizes:
+        client = configure_http_client(http_pool_size, http_host_pool_sizes)
+        print(
+            f"🔌 HTTP pool: {client.pool_maxsize} connections per host"
+            + "".join(
+                f", {host}: {size}" for host, size in client.host_pool_sizes.items()
+            )
+        )
+
+    # Skip documents that failed or blew through the parse limits recently
+    # (retried on a growing schedule)
+    load_failure_ledger(processed_folder)
+
+    # Parse documents in an isolated worker that is killed and recycled on
+    # timeout or when it passes the memory ceiling
+    parser = None
+    if parse_timeout:
+        parser = IsolatedParser(
+            timeout=parse_timeout, max_memory_mb=parse_max_memory_mb
+        )
+
+    pdf_stream_policy = None
+    if stream_pdf:
+        from .pdf_extractor import PdfStreamPolicy
+
+        pdf_stream_policy = PdfStreamPolicy(
+            max_pages=pdf_max_pages, max_bytes=pdf_max_bytes
+        )
+        print("📄 Streaming PDF extraction enabled")
+
+    # Engine order per PDF; auto mode learns from stats kept in .windycivi/,
+    # which every strategy keeps adding to
+    pdf_engine_selector = PdfEngineSelector(pdf_engine)
+    pdf_engine_selector.load(processed_folder)
+    print(f"📄 PDF engine strategy: {pdf_engine}")
+
+    # Download/parse metrics per document, reported at the end of the run
+    document_metrics = DocumentMetrics(document_metrics_format)
+
+    # Documents shared by several bills or versions are fetched and parsed once
+    coalescer = DocumentCoalescer()
+
+    # What earlier runs extracted, so incremental skips need no file scans
+    manifest = ExtractionManifest()
+    manifest.load(processed_folder)
+
+    # Incremental runs work from the queue the format stage writes; full
+    # runs (and the first run after queueing starts) scan every bill
+    queue = ExtractionQueue()
+    queue.load(processed_folder)
+    use_queue = incremental and not full_scan and queue.ready
+    if use_queue:
+        metadata_files = queue.metadata_files(processed_folder)
+        print(
+            f"📬 Extraction queue: {len(queue.bills)} bills from {len(queue.files)} queue files"
+        )
+    else:
+        if incremental and not queue.ready:
+            print("📬 No completed full scan recorded - scanning all bills")
+        metadata_files = list(processed_folder.rglob("metadata.json"))
+
+    # Parallel jobs each take the bills whose path hashes to their shard
+    report_label = state
+    if shard:
+        metadata_files = [
+            f
+            for f in metadata_files
+            if shard_of(manifest.bill_key(f.parent), shard[1]) == shard[0]
+        ]
+        report_label = f"{state}_{shard_label(shard)}"
+        print(f"🧩 Shard {shard[0]}/{shard[1]}: {len(metadata_files)} bills")
+    configure_error_log(report_label, error_log_mode)
+
+    compress_originals = resolve_compression(compress_originals)
+    if compress_originals != "none":
+        print(f"🗜️ Storing original documents {compress_originals}-compressed")
+    if version_deltas:
+        print("🧬 Storing later bill versions as deltas against the previous version")
+
+    # Bill key -> reason for bills that stay queued after this run
+    remaining_bills: Dict[str, str] = {}
+    deferred = []
+
+    def flush_state() -> List[Path]:
+        """Save everything later runs build on; returns the files written."""
+        if shard:
+            # Shared state is only written when the shards are merged
+            return [
+                save_shard_fragment(
+                    processed_folder,
+                    shard,
+                    manifest,
+                    pdf_engine_selector,
+                    queue,
+                    remaining_bills,
+                    full_scan=not use_queue,
+                )
+            ]
+        save_failure_ledger(processed_folder)
+        pdf_engine_selector.save(processed_folder)
+        manifest.save(processed_folder)
+        written = [
+            get_failure_ledger_path(processed_folder),
+            get_engine_stats_path(processed_folder),
+            get_manifest_path(processed_folder),
+            get_extraction_queue_dir(processed_folder),
+        ]
+        if search_index:
+            # Only the bills this run touched; unchanged versions are not re-read
+            index_path = update_search_index(
+                processed_folder, manifest.touched_bills(), manifest.bills
+            )
+            if index_path:
+                written.append(index_path)
+        return written
+
+    # Checkpoints run between bills, so they never see half-written files
+    checkpointer = None
+    if checkpoint_interval or checkpoint_command or checkpoint_callback:
+        checkpointer = Checkpointer(
+            processed_folder,
+            interval=checkpoint_interval,
+            flush=flush_state,
+            commit_callback=checkpoint_callback,
+            commit_command=checkpoint_command,
+        )
 
     total_bills = len(metadata_files)
     processed_count = 0
     success_count = 0
     error_count = 0
     skipped_count = 0
+    backoff_count = 0
 
     print(f"📊 Found {total_bills} bills to process for text extraction")
 
     if incremental:
         print("🔄 Incremental mode enabled - checking for already processed bills")
 
-    # Process in batches
-    for i in range(0, total_bills, batch_size):
-        batch = metadata_files[i : i + batch_size]
+    # Scan: decide which bills need work and how urgent they are
+    scheduler = ExtractionScheduler(processed_folder, manifest, queue)
+    for metadata_file in metadata_files:
+        try:
+            with open(metadata_file, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+
+            # Check if we should skip this bill in incremental mode
+            if incremental and should_skip_bill_for_text_extraction(
+                metadata_file, metadata, manifest
+            ):
+                skipped_count += 1
+                processed_count += 1
+                continue
+
+            scheduler.add(metadata_file, metadata)
+            coalescer.add_references(get_document_references(metadata))
+
+        except Exception as e:
+            print(f"❌ Error processing {metadata_file}: {e}")
+            error_count += 1
+            processed_count += 1
+            remaining_bills[manifest.bill_key(metadata_file.parent)] = "retry"
+
+    scheduled = scheduler.ordered()
+    print(
+        f"🗓️ {len(scheduled)} bills need extraction (current session: {scheduler.current_session or 'unknown'})"
+    )
+    if coalescer.shared_urls:
+        print(f"♻️ {coalescer.shared_urls} documents are shared by several bills or versions")
+
+    # Process in batches, highest priority first
+    total_scheduled = len(scheduled)
+    for i in range(0, total_scheduled, batch_size):
+        batch = scheduled[i : i + batch_size]
         batch_num = (i // batch_size) + 1
-        total_batches = (total_bills + batch_size - 1) // batch_size
+        total_batches = (total_scheduled + batch_size - 1) // batch_size
 
         print(f"\n🔄 Processing batch {batch_num}/{total_batches} ({len(batch)} bills)")
 
-        for metadata_file in batch:
+        for position, bill in enumerate(batch):
+            if budget.should_stop():
+                deferred.extend(scheduled[i + position :])
+                break
+
+            metadata_file = bill.metadata_file
+            bill_started = time.monotonic()
+            failures_before = get_total_failed()
+            backoff_skips_before = len(backoff_skips)
             try:
-                # Check if we should skip this bill in incremental mode
-                if incremental and should_skip_bill_for_text_extraction(metadata_file):
-                    skipped_count += 1
-                    processed_count += 1
-                    continue
+                # Re-read the metadata rather than holding every scheduled bill's
+                # in memory; it can also change (e.g. merges) during long runs
+                with open(metadata_file, "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
 
                 # Get the files directory for this bill
                 files_dir = metadata_file.parent / "files"
@@ -502,15 +982,45 @@ def process_bills_in_batch(
 
                 # Extract text for this bill
                 success = extract_bill_text_from_metadata(
-                    metadata_file, files_dir, output_folder
+                    metadata_file,
+                    files_dir,
+                    output_folder,
+                    parser,
+                    pdf_stream_policy,
+                    pdf_engine_selector,
+                    metadata,
+                    manifest,
+                    skip_extracted_versions=incremental,
+                    output_format=output_format,
+                    compress_originals=compress_originals,
+                    max_download_bytes=max_download_bytes,
+                    document_metrics=document_metrics,
+                    coalescer=coalescer,
+                    version_deltas=version_deltas,
                 )
 
                 if success:
                     success_count += 1
                     # Update processing timestamp
-                    update_text_extraction_timestamp(metadata_file)
+                    extracted_at = update_text_extraction_timestamp(
+                        metadata_file, metadata
+                    )
+                    manifest.mark_extracted(
+                        bill.bill_key,
+                        metadata.get("identifier", metadata_file.parent.name),
+                        metadata.get("_processing", {}).get("logs_latest_update"),
+                        extracted_at,
+                    )
+                elif (
+                    len(backoff_skips) > backoff_skips_before
+                    and get_total_failed() == failures_before
+                ):
+                    # Only documents still in backoff were left: not a new error
+                    backoff_count += 1
+                    remaining_bills[bill.bill_key] = "backoff"
                 else:
                     error_count += 1
+                    remaining_bills[bill.bill_key] = "retry"
 
                 processed_count += 1
 
@@ -522,14 +1032,87 @@ def process_bills_in_batch(
                 print(f"❌ Error processing {metadata_file}: {e}")
                 error_count += 1
                 processed_count += 1
+                remaining_bills[bill.bill_key] = "retry"
+
+            budget.record(time.monotonic() - bill_started)
+            if checkpointer is not None:
+                checkpointer.maybe_checkpoint()
 
         print(
             f"✅ Batch {batch_num} complete. Success: {success_count}, Errors: {error_count}, Skipped: {skipped_count}"
         )
+        if deferred:
+            break
+
+    if deferred:
+        print(
+            f"⏳ Time budget reached after {budget.elapsed():.0f}s - deferring {len(deferred)} bills to the next run"
+        )
+        for bill in deferred:
+            remaining_bills[bill.bill_key] = "deferred"
+
+    if parser is not None:
+        if parser.workers_killed:
+            print(f"🚧 Recycled {parser.workers_killed} parse workers over limits")
+        parser.close()
+
+    coalescer.close()
+    if coalescer.duplicates_avoided:
+        print(
+            f"♻️ {coalescer.duplicates_avoided} duplicate fetches avoided "
+            f"({coalescer.bytes_avoided / 1_000_000:.1f} MB not downloaded again)"
+        )
+
+    # Save everything the next run builds on
+    flush_state()
+
+    # Consume the queue; failed and deferred bills stay queued for the next run,
+    # so a full scan still counts when some bills were deferred.
+    # Shards leave the queue to the merge step, since the other shards read it too.
+    if not shard:
+        queue.complete(processed_folder, remaining_bills)
+        if not use_queue:
+            queue.mark_full_scan(processed_folder)
+
+    if checkpointer is not None:
+        checkpointer.checkpoint("final")
+
+    document_metrics.print_summary()
+
+    for pattern, summary in strategy_memory.to_report().items():
+        print(
+            f"🧭 {pattern}: last worked with {summary['last_success'] or 'nothing'}"
+            + (
+                f", skipped {', '.join(summary['skipped'])}"
+                if summary["skipped"]
+                else ""
+            )
+        )
+
+    connections = get_http_client().metrics.totals()
+    if connections["requests"]:
+        print(
+            f"🔌 HTTP: {connections['requests']} requests, {connections['reused']} on "
+            f"kept-alive connections, {connections['new_connections']} new connections"
+            + (
+                f" ({connections['tls_seconds'] / connections['tls_handshakes']:.3f}s "
+                f"mean TLS handshake)"
+                if connections["tls_handshakes"]
+                else ""
+            )
+        )
 
     # Save error report if output folder is provided
     if output_folder:
-        save_failed_bills_report(output_folder, state)
+        save_failed_bills_report(
+            output_folder, state, shard_label(shard) if shard else None
+        )
+        pdf_engine_selector.save_report(output_folder, report_label)
+        save_http_metrics_report(output_folder, report_label)
+        document_metrics.save_report(output_folder, report_label)
+        save_deferred_report(
+            output_folder, report_label, deferred, scheduler.current_session, budget
+        )
 
     return {
         "total_bills": total_bills,
@@ -537,6 +1120,9 @@ def process_bills_in_batch(
         "successful": success_count,
         "errors": error_count,
         "skipped": skipped_count,
+        "deferred": len(deferred),
+        "backoff": backoff_count,
+        "duplicates_avoided": coalescer.duplicates_avoided,
     }
 
 
@@ -564,19 +1150,26 @@ if __name__ == "__main__":
         print(f"Skipped (already processed): {stats['skipped']}")
 
 
-def should_skip_bill_for_text_extraction(metadata_file: Path) -> bool:
+def should_skip_bill_for_text_extraction(
+    metadata_file: Path,
+    metadata: Dict = None,
+    manifest: ExtractionManifest = None,
+) -> bool:
     """
     Check if a bill should be skipped for text extraction in incremental mode.
 
     Args:
         metadata_file: Path to the metadata.json file
+        metadata: Already-loaded contents of metadata_file (read from disk if None)
+        manifest: Extraction manifest; replaces the scan for _extracted.txt files
 
     Returns:
         True if the bill should be skipped, False otherwise
     """
     try:
-        with open(metadata_file, "r", encoding="utf-8") as f:
-            metadata = json.load(f)
+        if metadata is None:
+            with open(metadata_file, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
 
         bill_id = metadata.get("identifier", metadata_file.parent.name)
 
@@ -596,7 +1189,13 @@ def should_skip_bill_for_text_extraction(metadata_file: Path) -> bool:
             print(f"   🔍 {bill_id}: Bill updated since last extraction - processing")
             return False
 
-        # Check if any extracted text files exist
+        if manifest is not None:
+            bill_key = manifest.bill_key(metadata_file.parent)
+            if manifest.get_bill(bill_key) is not None:
+                print(f"   ⏭️  {bill_id}: Already extracted - skipping")
+                return True
+
+        # Not in the manifest (extracted before it existed): check the files
         files_dir = metadata_file.parent / "files"
         if not files_dir.exists():
             # No files directory - needs processing
@@ -611,6 +1210,15 @@ def should_skip_bill_for_text_extraction(metadata_file: Path) -> bool:
             print(f"   🔍 {bill_id}: No extracted text files found - processing")
             return False
 
+        # Adopt the bill into the manifest so later runs skip the scan
+        if manifest is not None:
+            manifest.mark_extracted(
+                manifest.bill_key(metadata_file.parent),
+                bill_id,
+                logs_timestamp,
+                text_extraction_timestamp,
+            )
+
         # All checks passed - can skip this bill
         print(f"   ⏭️  {bill_id}: Already extracted - skipping")
         return True
@@ -621,28 +1229,34 @@ def should_skip_bill_for_text_extraction(metadata_file: Path) -> bool:
         return False
 
 
-def update_text_extraction_timestamp(metadata_file: Path) -> None:
+def update_text_extraction_timestamp(metadata_file: Path, metadata: Dict = None) -> str:
     """
     Update the text extraction timestamp in the metadata file.
 
     Args:
         metadata_file: Path to the metadata.json file
+        metadata: Already-loaded contents of metadata_file (read from disk if None)
+
+    Returns:
+        The timestamp written
     """
+    timestamp = get_utc_timestamp()
     try:
-        with open(metadata_file, "r", encoding="utf-8") as f:
-            metadata = json.load(f)
+        if metadata is None:
+            with open(metadata_file, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
 
         # Add or update the text extraction timestamp
         if "_processing" not in metadata:
             metadata["_processing"] = {}
 
-        metadata["_processing"]["text_extraction_latest_update"] = (
-            datetime.utcnow().isoformat() + "Z"
-        )
+        metadata["_processing"]["text_extraction_latest_update"] = timestamp
 
         # Write back to file
         with open(metadata_file, "w", encoding="utf-8") as f:
             json.dump(metadata, f, indent=2)
+        record_written_path(metadata_file)
 
     except Exception as e:
         print(f"   ⚠️ Error updating text extraction timestamp for {metadata_file}: {e}")
+    return timestamp
@@ -0,0 +1,255 @@
+"""
+Inter-version delta storage for _extracted.txt files.
+
+Consecutive versions of a bill (Introduced, Engrossed, Enrolled, ...) are
+usually nearly identical. In delta mode the first version of a bill is kept
+in full and each later version is stored as a line-level delta against the
+version before it:
+
+    files/hb1_Introduced_extracted.txt          full text
+    files/hb1_Engrossed_extracted.txt.delta     delta against Introduced
+    files/hb1_Enrolled_extracted.txt.delta      delta against Engrossed
+
+A delta file is JSON:
+
+    {"format": "line_delta", "version": 1,
+     "base": "hb1_Introduced_extracted.txt", "base_sha256": "...",
+     "sha256": "...", "ops": [["=", 120], ["-", 2], ["+", ["new line", ...]]]}
+
+ops are applied to the base's lines in order: "=" copies n lines, "-" skips
+n lines and "+" inserts the given lines. A version is only stored as a delta
+when that is at most DELTA_MAX_RATIO of its full size.
+
+Everything else keeps using the usual _extracted.txt path: read_stored_text()
+rebuilds a version (following the chain of bases), stored_text_exists()
+finds either form, and materialize_dependents() turns deltas back into full
+files before their base is rewritten, so a delta never points at changed text.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DELTA_SUFFIX = ".delta"
+DELTA_FORMAT = "line_delta"
+DELTA_FORMAT_VERSION = 1
+
+# Store a delta only if it is at most this fraction of the full text's size
+DELTA_MAX_RATIO = 0.5
+
+
+def get_delta_path(text_file: Path) -> Path:
+    """Delta file of an _extracted.txt path (same name plus .delta)."""
+    text_file = Path(text_file)
+    return text_file.with_name(text_file.name + DELTA_SUFFIX)
+
+
+def stored_text_exists(text_file: Path) -> bool:
+    """True if a version's text is stored, in full or as a delta."""
+    return Path(text_file).exists() or get_delta_path(text_file).exists()
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compute_line_delta(base: str, text: str) -> List[list]:
+    """Line-level ops that turn base into text."""
+    base_lines = base.split("\n")
+    lines = text.split("\n")
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["=", i2 - i1])
+            continue
+        if tag in ("delete", "replace"):
+            ops.append(["-", i2 - i1])
+        if tag in ("insert", "replace"):
+            ops.append(["+", lines[j1:j2]])
+    return ops
+
+
+def apply_line_delta(base: str, ops: List[list]) -> str:
+    """Rebuild a text from its base and ops."""
+    base_lines = base.split("\n")
+    lines = []
+    position = 0
+    for op, value in ops:
+        if op == "=":
+            lines.extend(base_lines[position : position + value])
+            position += value
+        elif op == "-":
+            position += value
+        elif op == "+":
+            lines.extend(value)
+        else:
+            raise ValueError(f"Unknown delta op '{op}'")
+    return "\n".join(lines)
+
+
+def read_delta(delta_file: Path) -> Dict:
+    """Load and check a delta file."""
+    with open(delta_file, "r", encoding="utf-8") as f:
+        delta = json.load(f)
+    if delta.get("format") != DELTA_FORMAT:
+        raise ValueError(f"Not a line delta file: {delta_file}")
+    return delta
+
+
+def read_stored_text(text_file: Path) -> str:
+    """
+    Read a version's text, rebuilding it if it is stored as a delta.
+
+    Args:
+        text_file: The usual _extracted.txt path (or its .delta file)
+
+    Returns:
+        The full contents of the _extracted.txt file
+    """
+    text_file = Path(text_file)
+    if text_file.name.endswith(DELTA_SUFFIX):
+        text_file = text_file.with_name(text_file.name[: -len(DELTA_SUFFIX)])
+    if text_file.exists():
+        with open(text_file, "r", encoding="utf-8", newline="") as f:
+            return f.read()
+
+    delta_file = get_delta_path(text_file)
+    if not delta_file.exists():
+        raise FileNotFoundError(f"No stored text for {text_file}")
+
+    # Walk back to the full version, then apply the deltas forwards
+    chain = []
+    current = text_file
+    while not current.exists():
+        delta_path = get_delta_path(current)
+        if not delta_path.exists():
+            raise FileNotFoundError(f"Missing base {current.name} for {text_file}")
+        delta = read_delta(delta_path)
+        chain.append(delta)
+        current = current.with_name(delta["base"])
+        if len(chain) > 1000:
+            raise ValueError(f"Delta chain of {text_file} does not end")
+
+    with open(current, "r", encoding="utf-8", newline="") as f:
+        text = f.read()
+    for delta in reversed(chain):
+        if text_digest(text) != delta["base_sha256"]:
+            raise ValueError(f"Base {delta['base']} changed since the delta was written")
+        text = apply_line_delta(text, delta["ops"])
+    if text_digest(text) != chain[0]["sha256"]:
+        raise ValueError(f"Rebuilt text of {text_file} does not match its checksum")
+    return text
+
+
+def write_delta(delta_file: Path, delta: Dict) -> None:
+    tmp_file = delta_file.with_name(delta_file.name + ".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(delta, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_file, delta_file)
+
+
+def store_as_delta(text_file: Path, base_file: Path) -> Optional[Path]:
+    """
+    Replace a freshly written _extracted.txt file with a delta against its predecessor.
+
+    The full file is kept when the base is missing or the delta would not be
+    small enough.
+
+    Args:
+        text_file: The version just written in full
+        base_file: The _extracted.txt path of the version before it (same folder)
+
+    Returns:
+        Path of the delta file, or None if the text stays in full
+    """
+    text_file = Path(text_file)
+    base_file = Path(base_file)
+    delta_file = get_delta_path(text_file)
+    if base_file.parent != text_file.parent or base_file.name == text_file.name:
+        return None
+    if not stored_text_exists(base_file):
+        return None
+
+    with open(text_file, "r", encoding="utf-8", newline="") as f:
+        text = f.read()
+    try:
+        base = read_stored_text(base_file)
+    except (OSError, ValueError) as e:
+        print(f"   ⚠️ Keeping full text, base {base_file.name} unreadable: {e}")
+        return None
+
+    delta = {
+        "format": DELTA_FORMAT,
+        "version": DELTA_FORMAT_VERSION,
+        "base": base_file.name,
+        "base_sha256": text_digest(base),
+        "sha256": text_digest(text),
+        "ops": compute_line_delta(base, text),
+    }
+    encoded_size = len(json.dumps(delta, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    full_size = text_file.stat().st_size
+    if encoded_size > full_size * DELTA_MAX_RATIO:
+        delta_file.unlink(missing_ok=True)
+        return None
+
+    write_delta(delta_file, delta)
+    text_file.unlink()
+    print(
+        f"   🧬 Stored as delta against {base_file.name}: {encoded_size} of {full_size} bytes"
+    )
+    return delta_file
+
+
+def materialize_dependents(
+    text_file: Path, candidates: Optional[Iterable[Path]] = None
+) -> List[Path]:
+    """
+    Turn deltas based on a version back into full files.
+
+    Called before a version's text is rewritten, so deltas that point at it
+    keep rebuilding the text they were made from. Deltas further down the
+    chain stay valid: their base keeps its contents, only in full.
+
+    Args:
+        text_file: The version about to be rewritten
+        candidates: _extracted.txt paths that may be stored against it. During
+            extraction that is just the next version, since each version's
+            delta is against the one listed before it. None checks every
+            delta in the folder.
+
+    Returns:
+        The full files written (their delta files are removed)
+    """
+    text_file = Path(text_file)
+    folder = text_file.parent
+    if not folder.is_dir():
+        return []
+
+    if candidates is None:
+        delta_files = folder.glob(f"*{DELTA_SUFFIX}")
+    else:
+        delta_files = [get_delta_path(candidate) for candidate in candidates]
+
+    written = []
+    for delta_file in delta_files:
+        if not delta_file.exists():
+            continue
+        try:
+            delta = read_delta(delta_file)
+        except (OSError, ValueError):
+            continue
+        if delta.get("base") != text_file.name:
+            continue
+        dependent = delta_file.with_name(delta_file.name[: -len(DELTA_SUFFIX)])
+        text = read_stored_text(dependent)
+        tmp_file = dependent.with_name(dependent.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.replace(tmp_file, dependent)
+        delta_file.unlink()
+        written.append(dependent)
+    return written
@@ -1,5 +1,129 @@
 import xml.etree.ElementTree as ET
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
+
+# Characters fed to the parser per step
+FEED_CHUNK_SIZE = 64 * 1024
+
+
+class BillTextCollector:
+    """
+    Parser target that collects bill text in a single streaming pass.
+
+    Receives start/data/end callbacks in document order, so no element tree is
+    built. Each text chunk is stored once in the buffer of the innermost open
+    section; an outer section's buffer holds its nested sections' buffers by
+    reference and is joined when the section is emitted. Memory is bounded by
+    the document (raw_text and the section texts the result needs), not by a
+    single section. Produces the same result as walking a full ElementTree:
+
+    - title / official_title: text of the first <title> / <official-title>
+      below the root, up to its first child element
+    - sections: full text of every <section> (nested ones included), in
+      document order; like ET.tostring(method="text"), this includes the
+      text that follows the section's closing tag up to the next tag
+    - raw_text: all text content of the document
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.raw_chunks: List[str] = []
+        self.title: Optional[str] = None
+        self.official_title: Optional[str] = None
+        self.capturing: Optional[str] = None
+        self.captured: List[str] = []
+        self.open_sections: List[tuple] = []
+        self.tail_section: Optional[tuple] = None
+        self.tail: Optional[list] = None
+        self.sections: List[Optional[str]] = []
+
+    @staticmethod
+    def _join(buffer: list) -> str:
+        """Text of a section buffer (str chunks and nested buffers)."""
+        parts = []
+        stack = [iter(buffer)]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, list):
+                    stack.append(iter(item))
+                    break
+                parts.append(item)
+            else:
+                stack.pop()
+        return "".join(parts)
+
+    def _stop_capture(self):
+        if self.capturing == "title":
+            self.title = "".join(self.captured)
+        elif self.capturing == "official-title":
+            self.official_title = "".join(self.captured)
+        self.capturing = None
+        self.captured = []
+
+        # A closed section keeps collecting its tail until the next tag
+        if self.tail_section is not None:
+            index, buffer = self.tail_section
+            self.sections[index] = self._join(buffer).strip()
+            self.tail_section = None
+            self.tail = None
+
+    def start(self, tag, attrib):
+        self._stop_capture()
+        if self.depth > 0:
+            if tag == "title" and self.title is None:
+                self.capturing = "title"
+            elif tag == "official-title" and self.official_title is None:
+                self.capturing = "official-title"
+        if tag == "section" and self.depth > 0:
+            # Reserve the slot now so outer sections stay ahead of nested ones
+            self.sections.append(None)
+            buffer = []
+            if self.open_sections:
+                self.open_sections[-1][1].append(buffer)
+            self.open_sections.append((len(self.sections) - 1, buffer))
+        self.depth += 1
+
+    def data(self, text):
+        self.raw_chunks.append(text)
+        if self.capturing:
+            self.captured.append(text)
+        if self.tail is not None:
+            # Part of the closed section and, through it, of its parents
+            self.tail.append(text)
+        elif self.open_sections:
+            self.open_sections[-1][1].append(text)
+
+    def end(self, tag):
+        self._stop_capture()
+        self.depth -= 1
+        if tag == "section" and self.depth > 0:
+            self.tail_section = self.open_sections.pop()
+            self.tail = []
+            self.tail_section[1].append(self.tail)
+
+    def close(self):
+        self._stop_capture()
+        return {
+            "title": (self.title or "").strip(),
+            "official_title": (self.official_title or "").strip(),
+            "sections": [section for section in self.sections if section],
+            "raw_text": "".join(self.raw_chunks).strip(),
+        }
+
+
+def extract_text_from_xml_chunks(chunks: Iterable) -> Dict[str, str]:
+    """
+    Extract clean text from XML bill content supplied in chunks.
+
+    Args:
+        chunks: Iterable of str or bytes pieces of the XML document
+
+    Returns:
+        Dictionary with extracted text components
+    """
+    parser = ET.XMLParser(target=BillTextCollector())
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
 
 
 def extract_text_from_xml(xml_content: str) -> Dict[str, str]:
@@ -13,38 +137,18 @@ def extract_text_from_xml(xml_content: str) -> Dict[str, str]:
         Dictionary with extracted text components
     """
     try:
-        root = ET.fromstring(xml_content)
-
-        # Extract title
-        title = ""
-        title_elem = root.find(".//title")
-        if title_elem is not None:
-            title = title_elem.text or ""
-
-        # Extract official title
-        official_title = ""
-        official_title_elem = root.find(".//official-title")
-        if official_title_elem is not None:
-            official_title = official_title_elem.text or ""
-
-        # Extract sections
-        sections = []
-        for section in root.findall(".//section"):
-            section_text = ET.tostring(section, encoding="unicode", method="text")
-            if section_text.strip():
-                sections.append(section_text.strip())
-
-        # Extract raw text (all text content)
-        raw_text = ET.tostring(root, encoding="unicode", method="text")
-
-        return {
-            "title": title.strip(),
-            "official_title": official_title.strip(),
-            "sections": sections,
-            "raw_text": raw_text.strip(),
-        }
+        return extract_text_from_xml_chunks(
+            xml_content[i : i + FEED_CHUNK_SIZE]
+            for i in range(0, len(xml_content), FEED_CHUNK_SIZE)
+        )
 
     except Exception as e:
         print(f"❌ Error parsing XML: {e}")
         return {"error": f"Failed to parse XML: {e}"}
 
+
+def download_xml_document(url: str) -> Optional[str]:
+    """Extractor plugin download: XML bill text."""
+    from .common import download_bill_text
+
+    return download_bill_text(url)